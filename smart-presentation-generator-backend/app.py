@@ -1,23 +1,55 @@
 # app.py (enhanced version)
-from flask import Flask, request, jsonify, send_file, make_response
+from flask import Blueprint, Flask, Response, g, request, jsonify, send_file, make_response, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
+import re
 import json
+import time
 import traceback
+import zipfile
+from io import BytesIO
 from datetime import datetime
-from services.prompt_service import generate_slide_prompts
-from services.slide_service import create_presentation
-from services.theme_service import get_all_themes, get_theme_settings
+from services.document_service import save_upload, generate_deck_from_document
+from services.edit_service import edit_presentation, SlideEditError
+from services.generation_service import generate_deck, generate_batch, render_themes, materialize_presentation
+from services.job_service import job_queue, QueueFullError
+from services.preview_service import preview_spec, render_preview_html
+from services.prompt_service import stream_slide_prompts, stream_slide_prompts_and_theme
+from services.slide_service import create_presentation_streaming, load_presentation_bytes
+from services.theme_service import (THEMES, get_all_themes, suggest_theme_name, resolve_theme_name,
+                                   remember_topic_theme)
 from utils.gemini_client import get_gemini_response
+from utils.response_parser import validate_slides
 from utils.cors_helper import setup_response_headers, handle_preflight
+from utils.artifact_store import artifact_store
+from utils.document_text import DocumentError
+from utils.presentation_store import presentation_store
+from utils.single_flight import CoalesceTimeoutError
+from utils.metrics import registry, http_request_duration, http_requests_in_flight
+from utils.tracing import start_request, end_request, current_request_id, current_trace, log_event, log
+from config import (BATCH_MAX_ITEMS, APP_PRELOAD, REQUEST_LOG_ENABLED, MAX_CONTENT_LENGTH, GENERATION_LAZY,
+                    PRESENTATION_LIST_ALL, MAX_SLIDES)
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for your React frontend
+api = Blueprint('api', __name__)
 
-# Create necessary directories
-os.makedirs('static/presentations', exist_ok=True)
+# Client-supplied request ids are only reused if they look like ids
+_REQUEST_ID = re.compile(r'^[\w.-]{1,64}$')
 
-@app.route('/api/generate', methods=['POST', 'OPTIONS'])
+def _parse_num_slides(value):
+    """Return a requested slide count as an int from 1 to MAX_SLIDES, or None if none was given.
+    
+    Accepts ints and digit strings (form fields); raises ValueError for anything else.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= MAX_SLIDES:
+        raise ValueError(f"num_slides must be a whole number from 1 to {MAX_SLIDES}")
+    return value
+
+@api.route('/api/generate', methods=['POST', 'OPTIONS'])
 def generate_presentation():
     """Generate a presentation based on the provided topic and description."""
     # Handle CORS preflight
@@ -30,6 +62,11 @@ def generate_presentation():
     topic = data.get('topic', '')
     description = data.get('description', '')
     theme_preference = data.get('theme', '')
+    mode = data.get('mode')
+    # Earlier decks are only returned when asked for; 'fresh' also skips the response cache
+    fresh = bool(data.get('fresh'))
+    reuse = bool(data.get('reuse'))
+    lazy = bool(data.get('lazy', GENERATION_LAZY))
     
     # Validate input
     if not topic:
@@ -38,39 +75,393 @@ def generate_presentation():
             'error': 'Topic is required'
         }), 400
     
+    if mode not in (None, '', 'single', 'parallel'):
+        return jsonify({
+            'success': False,
+            'error': "Mode must be 'single' or 'parallel'"
+        }), 400
+    
     try:
-        # Log request
-        print(f"[{datetime.now()}] Generating presentation for topic: {topic}")
+        num_slides = _parse_num_slides(data.get('num_slides'))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    # Job mode: queue the work and return a job id straight away
+    if data.get('async') or request.args.get('async'):
+        try:
+            job = job_queue.submit(generate_deck, topic, description, theme_preference,
+                                   mode=mode, num_slides=num_slides, reuse=reuse, fresh=fresh, lazy=lazy)
+        except QueueFullError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 429
         
-        # Generate slide-by-slide content using Gemini
-        slide_contents = generate_slide_prompts(topic, description)
+        log(f"Queued presentation job {job['id']} for topic: {topic}")
+        return jsonify({
+            'success': True,
+            'job_id': job['id'],
+            'status': job['status'],
+            'status_url': f"/api/jobs/{job['id']}",
+            'result_url': f"/api/jobs/{job['id']}/result"
+        }), 202
+    
+    try:
+        # Log request
+        log(f"Generating presentation for topic: {topic}")
         
-        # Create the PowerPoint file
-        ppt_path = create_presentation(
-            topic=topic,
-            slide_contents=slide_contents,
-            theme=theme_preference
-        )
+        # Generate the slide content and build the PowerPoint file (on first download if lazy)
+        result = generate_deck(topic, description, theme_preference, mode=mode, num_slides=num_slides,
+                               reuse=reuse, fresh=fresh, lazy=lazy)
         
         # Return the file path or content
         return jsonify({
             'success': True,
-            'file_path': ppt_path,
-            'download_url': f"/api/download/{ppt_path}"
+            **result
         })
+    except CoalesceTimeoutError as e:
+        log(str(e))
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 504
     except Exception as e:
         # Log error
-        print(f"[{datetime.now()}] Error generating presentation: {str(e)}")
-        print(traceback.format_exc())
+        log(f"Error generating presentation: {str(e)}")
+        log(traceback.format_exc())
+        
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api.route('/api/generate/batch', methods=['POST', 'OPTIONS'])
+def generate_presentation_batch():
+    """Generate several presentations in one request.
+    
+    Takes ``items`` (a list of topic/description/theme/num_slides specs) and an optional
+    ``format``: 'manifest' (default) returns per-item status and download URLs,
+    'zip' returns the decks and a manifest.json in one archive.
+    """
+    # Handle CORS preflight
+    preflight_response = handle_preflight()
+    if preflight_response:
+        return preflight_response
+    
+    data = request.json or {}
+    items = data.get('items')
+    output_format = data.get('format', 'manifest')
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({
+            'success': False,
+            'error': 'Items must be a non-empty list'
+        }), 400
+    
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({
+            'success': False,
+            'error': f'A batch can contain at most {BATCH_MAX_ITEMS} items'
+        }), 400
+    
+    if output_format not in ('manifest', 'zip'):
+        return jsonify({
+            'success': False,
+            'error': "Format must be 'manifest' or 'zip'"
+        }), 400
+    
+    if not all(isinstance(item, dict) for item in items):
+        return jsonify({
+            'success': False,
+            'error': 'Each item must be an object with a topic'
+        }), 400
+    
+    try:
+        items = [{**item, 'num_slides': _parse_num_slides(item.get('num_slides'))} for item in items]
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    log(f"Generating batch of {len(items)} presentations")
+    results = generate_batch(items, mode=data.get('mode'))
+    summary = {
+        'total': len(results),
+        'completed': sum(1 for result in results if result['status'] == 'completed'),
+        'failed': sum(1 for result in results if result['status'] == 'failed')
+    }
+    
+    if output_format == 'manifest':
+        return jsonify({
+            'success': True,
+            'summary': summary,
+            'items': results
+        })
+    
+    # Bundle the finished decks; .pptx files are already compressed, so store them as-is
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        written = set()
+        for result in results:
+            file_name = result.get('file_path')
+            if result['status'] != 'completed' or file_name in written:
+                continue
+            deck = load_presentation_bytes(file_name)
+            if deck is None:
+                result['status'] = 'failed'
+                result['error'] = 'Generated file is no longer available'
+                continue
+            archive.writestr(file_name, deck)
+            written.add(file_name)
+        archive.writestr('manifest.json', json.dumps({'summary': summary, 'items': results}, indent=2))
+    
+    buffer.seek(0)
+    return send_file(
+        buffer,
+        mimetype='application/zip',
+        as_attachment=True,
+        download_name=f"presentations_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    )
+
+@api.route('/api/generate/upload', methods=['POST', 'OPTIONS'])
+def generate_presentation_from_upload():
+    """Generate a presentation based on an uploaded .txt, .docx or .pdf document.
+    
+    Takes a multipart form with the ``file`` and optional ``topic`` (defaults
+    to the file name), ``description``, ``theme``, ``mode``, ``num_slides``
+    and ``async``. The document is summarized chunk by chunk and the summary
+    is used as the source for the slides.
+    """
+    # Handle CORS preflight
+    preflight_response = handle_preflight()
+    if preflight_response:
+        return preflight_response
+    
+    try:
+        upload = request.files.get('file')
+    except RequestEntityTooLarge:
+        return jsonify({
+            'success': False,
+            'error': f'Uploads can be at most {MAX_CONTENT_LENGTH // (1024 * 1024)}MB'
+        }), 413
+    
+    if upload is None or not upload.filename:
+        return jsonify({
+            'success': False,
+            'error': 'A file is required'
+        }), 400
+    
+    form = request.form
+    topic = form.get('topic') or os.path.splitext(os.path.basename(upload.filename))[0].replace('_', ' ')
+    description = form.get('description', '')
+    theme_preference = form.get('theme', '')
+    mode = form.get('mode') or None
+    
+    if mode not in (None, 'single', 'parallel'):
+        return jsonify({
+            'success': False,
+            'error': "Mode must be 'single' or 'parallel'"
+        }), 400
+    
+    try:
+        num_slides = _parse_num_slides(form.get('num_slides'))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    try:
+        path, extension, digest = save_upload(upload)
+    except DocumentError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    args = (path, extension, digest, topic, description, theme_preference)
+    if form.get('async') or request.args.get('async'):
+        try:
+            job = job_queue.submit(generate_deck_from_document, *args, mode=mode, num_slides=num_slides)
+        except QueueFullError as e:
+            os.remove(path)
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 429
         
+        log(f"Queued document presentation job {job['id']} for topic: {topic}")
+        return jsonify({
+            'success': True,
+            'job_id': job['id'],
+            'status': job['status'],
+            'status_url': f"/api/jobs/{job['id']}",
+            'result_url': f"/api/jobs/{job['id']}/result"
+        }), 202
+    
+    try:
+        log(f"Generating presentation from {upload.filename} for topic: {topic}")
+        result = generate_deck_from_document(*args, mode=mode, num_slides=num_slides)
+        return jsonify({
+            'success': True,
+            **result
+        })
+    except DocumentError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        log(f"Error generating presentation from document: {str(e)}")
+        log(traceback.format_exc())
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
-@app.route('/api/download/<filename>', methods=['GET'])
+@api.route('/api/generate/stream', methods=['GET', 'POST', 'OPTIONS'])
+def generate_presentation_stream():
+    """Generate a presentation, pushing per-slide progress as server-sent events.
+    
+    Accepts the same fields as /api/generate, as a JSON body or (for
+    EventSource clients) as query parameters.
+    """
+    # Handle CORS preflight
+    preflight_response = handle_preflight()
+    if preflight_response:
+        return preflight_response
+    
+    data = request.get_json(silent=True) or request.args
+    topic = data.get('topic', '')
+    description = data.get('description', '')
+    theme_preference = data.get('theme', '')
+    
+    if not topic:
+        return jsonify({
+            'success': False,
+            'error': 'Topic is required'
+        }), 400
+    
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    
+    def events():
+        started = time.perf_counter()
+        log(f"Streaming presentation for topic: {topic}")
+        yield sse('start', {'topic': topic})
+        try:
+            # Without a preference or a confident local pick, the model chooses the theme in the same call
+            theme = theme_preference or suggest_theme_name(topic, use_model=False)
+            if theme:
+                slides = stream_slide_prompts(topic, description)
+            else:
+                theme, slides = stream_slide_prompts_and_theme(topic, description)
+                remember_topic_theme(topic, theme)
+            theme = resolve_theme_name(theme or 'professional')
+            received = []
+            for event in create_presentation_streaming(topic, slides, theme):
+                if event[0] == 'slide':
+                    _, index, slide_data = event
+                    received.append(slide_data)
+                    yield sse('slide', {
+                        'index': index,
+                        'title': slide_data.get('title', ''),
+                        'content': slide_data.get('content', []),
+                        'elapsed': time.perf_counter() - started
+                    })
+                else:
+                    _, file_name, slide_count = event
+                    done = {
+                        'success': True,
+                        'file_path': file_name,
+                        'download_url': f"/api/download/{file_name}",
+                        'slide_count': slide_count,
+                        'theme': theme,
+                        'elapsed': time.perf_counter() - started
+                    }
+                    if presentation_store is not None:
+                        done['presentation_id'] = presentation_store.save(
+                            topic, description, theme, received, file_name
+                        ).id
+                    yield sse('done', done)
+        except Exception as e:
+            log(f"Error streaming presentation: {str(e)}")
+            log(traceback.format_exc())
+            yield sse('error', {'success': False, 'error': str(e)})
+    
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@api.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Get the status, current stage and per-stage timings of a generation job."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    job.pop('result')
+    return jsonify({
+        'success': True,
+        'job': job,
+        'queue': job_queue.stats()
+    })
+
+@api.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Get the result of a finished generation job."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    if job['status'] == 'failed':
+        return jsonify({
+            'success': False,
+            'status': job['status'],
+            'error': job['error']
+        }), 500
+    
+    if job['status'] != 'completed':
+        # Still queued or running
+        return jsonify({
+            'success': False,
+            'status': job['status'],
+            'stage': job['stage']
+        }), 202
+    
+    return jsonify({
+        'success': True,
+        'status': job['status'],
+        'timings': job['timings'],
+        **job['result']
+    })
+
+@api.route('/api/download/<filename>', methods=['GET'])
 def download_file(filename):
     """Download a generated presentation file."""
+    # Decks rendered in memory are served from the artifact store
+    artifact = artifact_store.get(filename)
+    if artifact is not None:
+        data, etag = artifact
+        response = Response(
+            data,
+            mimetype='application/vnd.openxmlformats-officedocument.presentationml.presentation'
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response.set_etag(etag)
+        return response.make_conditional(request, accept_ranges=True, complete_length=len(data))
+    
     # Path where presentations are stored
     file_path = os.path.join('static', 'presentations', filename)
     
@@ -84,10 +475,249 @@ def download_file(filename):
     return send_file(
         file_path, 
         as_attachment=True,
-        download_name=filename
+        download_name=filename,
+        conditional=True
     )
 
-@app.route('/api/themes', methods=['GET'])
+@api.route('/api/presentations', methods=['GET'])
+def list_presentations():
+    """List stored presentations, newest first.
+    
+    Takes a ``topic`` (required unless PRESENTATION_LIST_ALL is set, since
+    decks aren't tied to users), an optional ``theme`` filter, ``limit`` (at
+    most 100) and ``offset``. Slide content is left out; get a single
+    presentation for it.
+    """
+    if presentation_store is None:
+        return jsonify({
+            'success': False,
+            'error': 'Presentation store is disabled'
+        }), 404
+    
+    topic = request.args.get('topic') or None
+    if topic is None and not PRESENTATION_LIST_ALL:
+        return jsonify({
+            'success': False,
+            'error': 'Topic is required'
+        }), 400
+    
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Limit and offset must be integers'
+        }), 400
+    
+    presentations = presentation_store.list(
+        limit=limit,
+        offset=offset,
+        theme=request.args.get('theme', '').lower() or None,
+        topic=topic
+    )
+    items = []
+    for presentation in presentations:
+        item = presentation.to_dict()
+        item['slide_count'] = len(item.pop('slides'))
+        item['download_url'] = f"/api/presentations/{presentation.id}/download"
+        items.append(item)
+    
+    return jsonify({
+        'success': True,
+        'presentations': items,
+        'limit': limit,
+        'offset': offset
+    })
+
+@api.route('/api/presentations/<presentation_id>', methods=['GET'])
+def get_presentation(presentation_id):
+    """Get a stored presentation, including its slide content."""
+    presentation = presentation_store.get(presentation_id) if presentation_store is not None else None
+    if presentation is None:
+        return jsonify({
+            'success': False,
+            'error': 'Presentation not found'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'presentation': presentation.to_dict(),
+        'download_url': f"/api/presentations/{presentation.id}/download"
+    })
+
+@api.route('/api/presentations/<presentation_id>/download', methods=['GET'])
+def download_stored_presentation(presentation_id):
+    """Download a stored presentation, building it from its slides if it was generated lazily or has expired."""
+    presentation = presentation_store.get(presentation_id) if presentation_store is not None else None
+    if presentation is None:
+        return jsonify({
+            'success': False,
+            'error': 'Presentation not found'
+        }), 404
+    
+    try:
+        file_name = materialize_presentation(presentation)
+    except CoalesceTimeoutError as e:
+        log(str(e))
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 504
+    except Exception as e:
+        log(f"Error rendering stored presentation {presentation_id}: {str(e)}")
+        log(traceback.format_exc())
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    
+    return download_file(file_name)
+
+@api.route('/api/presentations/<presentation_id>/preview', methods=['GET'])
+def preview_stored_presentation(presentation_id):
+    """Preview a stored presentation as an HTML page, or as JSON with ``?format=json``, without building it."""
+    presentation = presentation_store.get(presentation_id) if presentation_store is not None else None
+    if presentation is None:
+        return jsonify({
+            'success': False,
+            'error': 'Presentation not found'
+        }), 404
+    
+    if request.args.get('format') == 'json':
+        return jsonify({
+            'success': True,
+            'preview': preview_spec(presentation.title, presentation.slides, presentation.theme),
+            'download_url': f"/api/presentations/{presentation.id}/download"
+        })
+    return Response(render_preview_html(presentation.title, presentation.slides, presentation.theme),
+                    mimetype='text/html')
+
+@api.route('/api/presentations/<presentation_id>/edit', methods=['POST', 'OPTIONS'])
+def edit_stored_presentation(presentation_id):
+    """Regenerate, update, insert, delete or reorder single slides of a stored presentation.
+    
+    Takes ``operations``, a list of edits applied in order (or one edit as the
+    body itself); see services.edit_service.edit_presentation for the format.
+    Only the changed slides are sent to the model and rendered.
+    """
+    # Handle CORS preflight
+    preflight_response = handle_preflight()
+    if preflight_response:
+        return preflight_response
+    
+    data = request.get_json(silent=True) or {}
+    operations = data.get('operations', [data] if 'op' in data else None)
+    if not isinstance(operations, list) or not operations:
+        return jsonify({
+            'success': False,
+            'error': 'Operations must be a non-empty list'
+        }), 400
+    
+    try:
+        result = edit_presentation(presentation_id, operations)
+    except SlideEditError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        log(f"Error editing presentation {presentation_id}: {str(e)}")
+        log(traceback.format_exc())
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    
+    if result is None:
+        return jsonify({
+            'success': False,
+            'error': 'Presentation not found'
+        }), 404
+    
+    log(f"Edited presentation {presentation_id}: {len(operations)} operation(s), "
+          f"{result['slides_rendered']} slide(s) rendered")
+    return jsonify({
+        'success': True,
+        **result
+    })
+
+@api.route('/api/render', methods=['POST', 'OPTIONS'])
+@api.route('/api/presentations/<presentation_id>/render', methods=['POST', 'OPTIONS'])
+def render_presentation_themes(presentation_id=None):
+    """Render an existing deck in another theme, or in several at once, without generating new content.
+    
+    The deck is a stored presentation (``presentation_id`` in the URL or body)
+    or ``topic`` plus ``slides`` in the slide JSON format. ``theme`` names one
+    theme; ``themes`` is a list of names or 'all' for a preview in every theme.
+    """
+    # Handle CORS preflight
+    preflight_response = handle_preflight()
+    if preflight_response:
+        return preflight_response
+    
+    data = request.get_json(silent=True) or {}
+    presentation_id = presentation_id or data.get('presentation_id')
+    
+    if presentation_id:
+        presentation = presentation_store.get(presentation_id) if presentation_store is not None else None
+        if presentation is None:
+            return jsonify({
+                'success': False,
+                'error': 'Presentation not found'
+            }), 404
+        topic, description, slides = presentation.title, presentation.description, presentation.slides
+    else:
+        topic = str(data.get('topic') or '').strip()
+        description = str(data.get('description') or '')
+        slides = validate_slides(data.get('slides'))
+        if not topic or not slides:
+            return jsonify({
+                'success': False,
+                'error': 'A presentation_id, or a topic and a non-empty list of slides, is required'
+            }), 400
+    
+    themes = data.get('themes') or ([data['theme']] if data.get('theme') else [])
+    if themes == 'all':
+        themes = list(THEMES)
+    if not isinstance(themes, list) or not themes:
+        return jsonify({
+            'success': False,
+            'error': "Give a theme, or themes as a list of names or 'all'"
+        }), 400
+    themes = [str(theme).lower() for theme in themes]
+    unknown = [theme for theme in themes if theme not in THEMES]
+    if unknown:
+        return jsonify({
+            'success': False,
+            'error': f"Unknown theme(s): {', '.join(unknown)}"
+        }), 400
+    
+    try:
+        started = time.perf_counter()
+        results = render_themes(topic, slides, themes, description=description)
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        log(f"Error rendering presentation: {str(e)}")
+        log(traceback.format_exc())
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    
+    log(f"Rendered '{topic}' in {len(results)} theme(s) in {elapsed:.3f}s")
+    response = {
+        'success': True,
+        'topic': topic,
+        'slide_count': len(slides),
+        'elapsed': elapsed,
+        'themes': results
+    }
+    if len(results) == 1:
+        response.update(next(iter(results.values())))
+    return jsonify(response)
+
+@api.route('/api/themes', methods=['GET'])
 def get_themes():
     """Get a list of available presentation themes."""
     themes = get_all_themes()
@@ -96,7 +726,7 @@ def get_themes():
         'themes': themes
     })
 
-@app.route('/api/suggest-theme', methods=['POST', 'OPTIONS'])
+@api.route('/api/suggest-theme', methods=['POST', 'OPTIONS'])
 def suggest_theme():
     """Suggest a theme based on presentation topic."""
     # Handle CORS preflight
@@ -114,15 +744,13 @@ def suggest_theme():
         }), 400
     
     try:
-        # Get theme settings based on topic
-        theme_settings = get_theme_settings(None, topic)
-        theme_name = next((name for name, settings in get_all_themes().items() 
-                           if settings["description"] == theme_settings["description"]), "professional")
+        # Get theme name based on topic
+        theme_name = suggest_theme_name(topic) or "professional"
         
         return jsonify({
             'success': True,
             'suggested_theme': theme_name,
-            'theme_description': theme_settings["description"]
+            'theme_description': THEMES[theme_name]["description"]
         })
     except Exception as e:
         return jsonify({
@@ -130,7 +758,12 @@ def suggest_theme():
             'error': str(e)
         }), 500
 
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Expose latency histograms, in-flight counts, cache and error counters in the Prometheus text format."""
+    return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@api.route('/api/health', methods=['GET'])
 def health_check():
     """API health check endpoint."""
     return jsonify({
@@ -138,5 +771,60 @@ def health_check():
         'version': '1.0.0'
     })
 
+def _register_request_hooks(app):
+    """Give each request an id, time it, and write one structured log line for it."""
+    @app.before_request
+    def start_request_trace():
+        request_id = request.headers.get('X-Request-ID', '')
+        g.trace_token = start_request(request_id if _REQUEST_ID.match(request_id) else None)
+        g.started = time.perf_counter()
+        http_requests_in_flight.inc()
+    
+    @app.after_request
+    def tag_request_response(response):
+        response.headers['X-Request-ID'] = current_request_id()
+        g.status = response.status_code
+        return response
+    
+    @app.teardown_request
+    def end_request_trace(error=None):
+        # Runs once the response is done, which for event streams is after the last event
+        token = g.pop('trace_token', None)
+        if token is None:
+            return
+        elapsed = time.perf_counter() - g.started
+        status = g.get('status', 500)
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        http_request_duration.observe(elapsed, method=request.method, endpoint=endpoint, status=status)
+        http_requests_in_flight.dec()
+        if REQUEST_LOG_ENABLED and endpoint != '/api/metrics':
+            log_event('request', method=request.method, path=request.path, status=status,
+                      duration=round(elapsed, 6), stages=current_trace().summary())
+        end_request(token)
+
+def create_app(preload=None):
+    """Create the Flask app.
+    
+    This is the entry point for WSGI servers (``gunicorn "app:create_app()"``).
+    python-pptx and google.generativeai are only imported on first use, so
+    creating the app stays fast. With ``preload`` (default: APP_PRELOAD) the
+    template and theme caches are primed before the app is returned.
+    """
+    app = Flask(__name__)
+    app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+    CORS(app)  # Enable CORS for your React frontend
+    app.register_blueprint(api)
+    _register_request_hooks(app)
+    
+    # Create necessary directories
+    os.makedirs('static/presentations', exist_ok=True)
+    
+    if APP_PRELOAD if preload is None else preload:
+        from services.warmup_service import preload as preload_caches
+        preload_caches()
+    
+    return app
+
 if __name__ == '__main__':
+    app = create_app()
     app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
\ No newline at end of file
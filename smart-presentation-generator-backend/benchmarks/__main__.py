@@ -0,0 +1,37 @@
+# benchmarks/__main__.py
+"""Run the benchmark suite and write one JSON result file per benchmark.
+
+Run from the backend directory:  python -m benchmarks [--output-dir benchmark-results] [--skip load startup]
+Compare two result directories' files with  python -m benchmarks.compare
+"""
+import argparse
+import os
+from benchmarks import (bench_bullets, bench_load, bench_parser, bench_pipeline, bench_startup, bench_templates,
+                        bench_text_fit, bench_theme_classifier)
+from benchmarks.harness import report
+
+SUITE = {
+    'startup': bench_startup.run,
+    'parser': bench_parser.run,
+    'pipeline': bench_pipeline.run,
+    'templates': bench_templates.run,
+    'bullets': bench_bullets.run,
+    'text_fit': bench_text_fit.run,
+    'theme_classifier': bench_theme_classifier.run,
+    'load': bench_load.run,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output-dir', default='benchmark-results', help='Directory for the JSON result files')
+    parser.add_argument('--skip', nargs='*', default=[], choices=sorted(SUITE), help='Benchmarks to leave out')
+    args = parser.parse_args()
+
+    for name, run in SUITE.items():
+        if name not in args.skip:
+            report(name, run(), os.path.join(args.output_dir, f"{name}.json"))
+
+
+if __name__ == '__main__':
+    main()
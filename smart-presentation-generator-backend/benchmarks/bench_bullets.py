@@ -0,0 +1,68 @@
+# benchmarks/bench_bullets.py
+"""Slides per second when writing bullets through python-pptx proxies vs. the bulk XML path.
+
+Builds text-heavy decks of 100+ slides (content and two-column slides) with
+the theme baked into the master and with per-shape theming, once per path,
+and checks that both paths produce byte-identical slide parts.
+
+Run from the backend directory:  python -m benchmarks.bench_bullets [--output results.json]
+"""
+import argparse
+import time
+from benchmarks.fake_gemini import FakeGemini
+from benchmarks.harness import report
+from services.theme_service import THEMES
+from utils import ppt_generator
+from utils.response_parser import parse_slide_response
+
+
+def _build(slides, bulk, themed_master):
+    ppt_generator.PPT_BULK_TEXT = bulk
+    ppt_generator.PPT_THEMED_MASTER = themed_master
+    theme_settings = THEMES['academic']
+    generator = ppt_generator.PPTGenerator(theme_settings=theme_settings)
+    started = time.perf_counter()
+    for index, slide in enumerate(slides):
+        if index % 4 == 3:
+            half = len(slide['content']) // 2
+            generator.add_two_column_slide(slide['title'], slide['content'][:half], slide['content'][half:],
+                                           theme_settings)
+        else:
+            generator.add_content_slide(slide['title'], slide['content'], 1, theme_settings)
+    elapsed = time.perf_counter() - started
+    parts = {str(part.partname): part.blob for part in generator.prs.part.package.iter_parts()
+             if str(part.partname).startswith('/ppt/slides/slide')}
+    return elapsed, parts
+
+
+def run(deck_sizes=(100, 250), bullets=8, repeat=3):
+    original = (ppt_generator.PPT_BULK_TEXT, ppt_generator.PPT_THEMED_MASTER)
+    results = {}
+    try:
+        for themed_master in (True, False):
+            for size in deck_sizes:
+                slides = parse_slide_response(FakeGemini(slides=size, bullets=bullets).deck_text())
+                _build(slides[:5], True, themed_master)  # Warm-up
+                proxy = min((_build(slides, False, themed_master) for _ in range(repeat)), key=lambda run: run[0])
+                bulk = min((_build(slides, True, themed_master) for _ in range(repeat)), key=lambda run: run[0])
+                results[f"{'themed_master' if themed_master else 'per_shape_theme'}_{size}_slides"] = {
+                    'proxy_slides_per_second': size / proxy[0],
+                    'bulk_slides_per_second': size / bulk[0],
+                    'speedup': proxy[0] / bulk[0],
+                    'identical_output': proxy[1] == bulk[1]
+                }
+    finally:
+        ppt_generator.PPT_BULK_TEXT, ppt_generator.PPT_THEMED_MASTER = original
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--bullets', type=int, default=8, help='Bullets per slide')
+    args = parser.parse_args()
+    report('bullets', run(bullets=args.bullets), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+# benchmarks/bench_load.py
+"""Load test of POST /api/generate at increasing concurrency, with Gemini faked.
+
+By default the app is served in-process on a local threaded server with a
+FakeGemini backend (``--latency`` seconds per model call, ``--slides`` per
+deck, ``--malformed-rate`` share of damaged responses). Every request uses a
+new topic so the response cache can't hide the model latency. Pass ``--url``
+to load an already running server instead (its Gemini setup is its own).
+
+Run from the backend directory:  python -m benchmarks.bench_load [--concurrency 1 4 16] [--output results.json]
+"""
+import argparse
+import http.client
+import itertools
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+from werkzeug.serving import make_server
+from benchmarks.fake_gemini import install_fake_gemini
+from benchmarks.harness import report, summarize
+
+_topics = itertools.count()
+_topics_lock = threading.Lock()
+
+
+def _next_topic():
+    with _topics_lock:
+        return f"Load test deck {next(_topics)}"
+
+
+def _post(host, port, body):
+    connection = http.client.HTTPConnection(host, port, timeout=300)
+    try:
+        connection.request('POST', '/api/generate', body=json.dumps(body),
+                           headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+def run_level(host, port, concurrency, requests_per_client, body):
+    """Run ``concurrency`` clients sending requests back to back; return latency and throughput."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def client():
+        for _ in range(requests_per_client):
+            started = time.perf_counter()
+            try:
+                status = _post(host, port, {**body, 'topic': _next_topic()})
+            except OSError as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - started
+            with lock:
+                if status == 200:
+                    latencies.append(elapsed)
+                else:
+                    errors.append(status)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    return {
+        'requests': concurrency * requests_per_client,
+        'errors': len(errors),
+        'error_statuses': sorted({str(status) for status in errors}),
+        'throughput_rps': len(latencies) / wall,
+        'latency_seconds': summarize(latencies) if latencies else None
+    }
+
+
+def _start_local_server():
+    from app import create_app
+    server = make_server('127.0.0.1', 0, create_app(preload=True), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(concurrency_levels=(1, 2, 4, 8, 16), requests_per_client=5, latency=0.2, slides=8,
+        malformed_rate=0.0, mode='single', url=None):
+    body = {'description': 'Benchmark presentation', 'theme': 'professional', 'mode': mode, 'num_slides': slides}
+    server = None
+    if url:
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        install_fake_gemini(latency=latency, slides=slides, malformed_rate=malformed_rate)
+        server = _start_local_server()
+        host, port = '127.0.0.1', server.server_port
+
+    try:
+        _post(host, port, {**body, 'topic': _next_topic()})  # Warm-up
+        levels = {str(level): run_level(host, port, level, requests_per_client, body)
+                  for level in concurrency_levels}
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    return {
+        'target': url or 'in-process',
+        'fake_gemini': None if url else {'latency': latency, 'slides': slides, 'malformed_rate': malformed_rate},
+        'mode': mode,
+        'requests_per_client': requests_per_client,
+        'concurrency': levels
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help='Concurrent clients per level')
+    parser.add_argument('--requests', type=int, default=5, help='Requests per client at each level')
+    parser.add_argument('--latency', type=float, default=0.2, help='Simulated seconds per model call')
+    parser.add_argument('--slides', type=int, default=8, help='Slides per generated deck')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='Share of damaged model responses')
+    parser.add_argument('--mode', choices=['single', 'parallel'], default='single', help='Generation mode')
+    parser.add_argument('--url', help='Base URL of a running server to load instead of an in-process one')
+    args = parser.parse_args()
+    report('load', run(concurrency_levels=args.concurrency, requests_per_client=args.requests,
+                       latency=args.latency, slides=args.slides, malformed_rate=args.malformed_rate,
+                       mode=args.mode, url=args.url), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_parser.py
+"""Micro-benchmark of the model-response parser over the fixture corpus.
+
+Run from the backend directory:  python -m benchmarks.bench_parser [--output results.json]
+"""
+import argparse
+import json
+import os
+from benchmarks.harness import FIXTURES_DIR, measure, report
+from utils.response_parser import parse_slide_response
+
+MODEL_OUTPUTS_DIR = os.path.join(FIXTURES_DIR, 'model_outputs')
+
+
+def load_corpus():
+    """Return (file name, text, expected slide count) for each fixture."""
+    with open(os.path.join(MODEL_OUTPUTS_DIR, 'expected.json')) as f:
+        expected = json.load(f)
+    corpus = []
+    for name in sorted(expected):
+        with open(os.path.join(MODEL_OUTPUTS_DIR, name), encoding='utf-8') as f:
+            corpus.append((name, f.read(), expected[name]))
+    return corpus
+
+
+def run(repeat=5, number=200):
+    results = {}
+    for name, text, expected_count in load_corpus():
+        slides = parse_slide_response(text)
+        timing = measure(lambda: parse_slide_response(text), repeat=repeat, number=number)
+        size_kb = len(text.encode('utf-8')) / 1024
+        results[name] = {
+            'size_kb': round(size_kb, 2),
+            'slides': len(slides),
+            'expected_slides': expected_count,
+            'correct': len(slides) == expected_count,
+            'seconds_per_parse': timing['best'],
+            'microseconds_per_kb': timing['best'] / size_kb * 1e6
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--number', type=int, default=200, help='Parses per timing round')
+    args = parser.parse_args()
+    report('parser', run(number=args.number), args.output)
+
+
+if __name__ == '__main__':
+    main()
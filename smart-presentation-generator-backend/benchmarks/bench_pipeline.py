@@ -0,0 +1,120 @@
+# benchmarks/bench_pipeline.py
+"""Micro-benchmarks of each stage of the generate pipeline, with Gemini faked.
+
+  parser        - parse time and slides recovered per deck size and kind of malformed output
+  theme_lookup  - explicit theme, confident classification, recalled topic, and a model fallback
+  render        - PPTGenerator cost per slide and save time/size as the deck grows
+  retheme       - re-rendering an existing deck in one theme and in every theme at once
+
+Run from the backend directory:  python -m benchmarks.bench_pipeline [--output results.json]
+"""
+import argparse
+import itertools
+import time
+from benchmarks.fake_gemini import FakeGemini, MALFORMATIONS, install_fake_gemini
+from benchmarks.harness import measure, report
+from services.generation_service import render_themes
+from services.theme_service import THEMES, get_theme_settings, suggest_theme_name
+from utils.response_parser import parse_slide_response
+from utils.ppt_generator import PPTGenerator
+
+
+def bench_parser(deck_sizes=(8, 30), number=200):
+    results = {}
+    for slides in deck_sizes:
+        fake = FakeGemini(slides=slides)
+        for malformation in (None,) + MALFORMATIONS:
+            text = fake.deck_text(malformation=malformation)
+            timing = measure(lambda: parse_slide_response(text), number=number)
+            results[f"{slides}_slides_{malformation or 'clean'}"] = {
+                'size_kb': round(len(text.encode('utf-8')) / 1024, 2),
+                'slides_recovered': len(parse_slide_response(text)),
+                'seconds_per_parse': timing['best']
+            }
+    return results
+
+
+def bench_theme_lookup(number=2000):
+    install_fake_gemini()
+    counter = itertools.count()
+    suggest_theme_name('Quarterly revenue report for investors')
+    return {
+        'explicit_theme': measure(lambda: get_theme_settings('tech'), number=number)['best'],
+        'classifier_confident': measure(
+            lambda: get_theme_settings(None, 'Machine learning for cybersecurity'), number=number)['best'],
+        'recalled_topic': measure(
+            lambda: suggest_theme_name('Quarterly revenue report for investors'), number=number)['best'],
+        # A new topic each call, so neither the classifier nor the topic cache can answer
+        'model_fallback': measure(
+            lambda: suggest_theme_name(f"Things to consider {next(counter)}"), number=50)['best']
+    }
+
+
+def _render(slides, theme_settings):
+    started = time.perf_counter()
+    generator = PPTGenerator(theme_settings=theme_settings)
+    generator.add_title_slide('Benchmark deck', 'Rendering benchmark', theme_settings)
+    loaded = time.perf_counter()
+    for slide in slides:
+        generator.add_content_slide(slide['title'], slide['content'], 1, theme_settings)
+    built = time.perf_counter()
+    data = generator.to_bytes()
+    saved = time.perf_counter()
+    return {
+        'load_template': loaded - started,
+        'add_slides': built - loaded,
+        'save': saved - built,
+        'bytes': len(data)
+    }
+
+
+def bench_render(deck_sizes=(5, 10, 25, 50, 100), repeat=3):
+    theme_settings = THEMES['professional']
+    # Warm-up run so the themed template is built before timing starts
+    _render(parse_slide_response(FakeGemini(slides=5).deck_text()), theme_settings)
+    results = {}
+    for size in deck_sizes:
+        slides = parse_slide_response(FakeGemini(slides=size).deck_text())
+        runs = [_render(slides, theme_settings) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run['add_slides'] + run['save'])
+        results[f"{size}_slides"] = {
+            **best,
+            'seconds_per_slide': best['add_slides'] / size,
+            'save_bytes_per_slide': best['bytes'] / size
+        }
+    return results
+
+
+def bench_retheme(deck_sizes=(10, 30), repeat=3):
+    results = {}
+    for size in deck_sizes:
+        slides = parse_slide_response(FakeGemini(slides=size).deck_text())
+        render_themes('Benchmark deck', slides, list(THEMES), record=False)  # Warm-up
+        results[f"{size}_slides"] = {
+            'one_theme_seconds': measure(lambda: render_themes('Benchmark deck', slides, ['tech'], record=False),
+                                         repeat=repeat, number=1)['best'],
+            'all_themes_seconds': measure(lambda: render_themes('Benchmark deck', slides, list(THEMES), record=False),
+                                          repeat=repeat, number=1)['best']
+        }
+    return results
+
+
+def run(number=200):
+    return {
+        'parser': bench_parser(number=number),
+        'theme_lookup': bench_theme_lookup(),
+        'render': bench_render(),
+        'retheme': bench_retheme()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--number', type=int, default=200, help='Parses per timing round')
+    args = parser.parse_args()
+    report('pipeline', run(number=args.number), args.output)
+
+
+if __name__ == '__main__':
+    main()
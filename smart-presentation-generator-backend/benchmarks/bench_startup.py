@@ -0,0 +1,81 @@
+# benchmarks/bench_startup.py
+"""Cold-start cost of the API process, checked against a time budget.
+
+Each measurement runs in a fresh interpreter: importing the app module,
+creating the app, serving the first health check, and (separately) creating
+the app with template/theme preloading. Heavy modules that were imported
+along the way are reported too, since python-pptx and google.generativeai
+should only load on first use.
+
+Run from the backend directory:  python -m benchmarks.bench_startup [--budget 1.0] [--output results.json]
+Exits with status 1 if the median time to the first health check exceeds the budget.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from benchmarks.harness import report
+
+_HEAVY_MODULES = ('pptx', 'google.generativeai', 'lxml.etree')
+
+_PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app(preload={preload})
+created = time.perf_counter()
+response = flask_app.test_client().get('/api/health')
+served = time.perf_counter()
+assert response.status_code == 200
+print(json.dumps({{
+    'import': imported - started,
+    'create_app': created - imported,
+    'first_request': served - created,
+    'total': served - started,
+    'heavy_modules': [name for name in {heavy!r} if name in sys.modules]
+}}))
+'''
+
+
+def _probe(preload):
+    source = _PROBE.format(preload=preload, heavy=_HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', source], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _summarize(samples):
+    summary = {}
+    for key in ('import', 'create_app', 'first_request', 'total'):
+        values = [sample[key] for sample in samples]
+        summary[key] = {'best': min(values), 'median': statistics.median(values), 'mean': statistics.mean(values)}
+    summary['heavy_modules'] = samples[-1]['heavy_modules']
+    return summary
+
+
+def run(repeat=5):
+    return {
+        'cold_start': _summarize([_probe(False) for _ in range(repeat)]),
+        'cold_start_preloaded': _summarize([_probe(True) for _ in range(repeat)])
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh processes per measurement')
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='Seconds allowed from importing the app to the first health check')
+    args = parser.parse_args()
+
+    results = run(repeat=args.repeat)
+    median = results['cold_start']['total']['median']
+    results['budget'] = {'seconds': args.budget, 'within_budget': median <= args.budget}
+    report('startup', results, args.output)
+    if median > args.budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
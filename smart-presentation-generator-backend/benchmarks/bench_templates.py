@@ -0,0 +1,63 @@
+# benchmarks/bench_templates.py
+"""Per-request cost of getting a fresh base Presentation for a deck.
+
+Compares parsing the default package from disk, parsing cached template bytes
+from memory, and taking a pre-parsed presentation from the warm pool (with the
+pool refilled between requests, as it is between real requests).
+
+Parsing from memory costs about as much as parsing from disk (the package is
+small and in the page cache); the per-request saving comes from the warm pool,
+which moves the parse off the request path. The bytes cache exists so themed
+templates are built once per theme rather than on every parse.
+
+Run from the backend directory:  python -m benchmarks.bench_templates [--output results.json]
+"""
+import argparse
+import statistics
+import time
+from io import BytesIO
+from pptx import Presentation
+from benchmarks.harness import measure, report
+from services.theme_service import THEMES
+from utils.template_cache import TemplatePool, get_themed_template
+
+
+def _pool_latency(pool, theme_settings, requests):
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        pool.acquire(theme_settings)
+        samples.append(time.perf_counter() - started)
+        # Let the background refill finish before the next request arrives
+        while pool.stats() and min(pool.stats().values()) < pool.size:
+            time.sleep(0.001)
+    return {'best': min(samples), 'median': statistics.median(samples), 'mean': statistics.mean(samples)}
+
+
+def run(number=50):
+    theme_settings = THEMES['professional']
+    template = get_themed_template(theme_settings)
+
+    pool = TemplatePool(size=2)
+    pool.warm([theme_settings], include_default=False)
+
+    results = {
+        'disk_default_template': measure(Presentation, number=number),
+        'memory_template_bytes': measure(lambda: Presentation(BytesIO(template)), number=number),
+        'warm_pool_acquire': _pool_latency(pool, theme_settings, number)
+    }
+    baseline = results['disk_default_template']['median']
+    results['saved_per_request_seconds'] = baseline - results['warm_pool_acquire']['median']
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--number', type=int, default=50, help='Requests per measurement')
+    args = parser.parse_args()
+    report('templates', run(number=args.number), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_text_fit.py
+"""Cost of laying out a deck's bullets with the text-fit engine.
+
+Plans 100-slide decks (font size and continuation slides per slide, see
+services.render_service.plan_slide) for every theme, with cold measurement
+caches and warm ones, for a typical deck and one where every slide is too
+long for its placeholder.
+
+Run from the backend directory:  python -m benchmarks.bench_text_fit [--output results.json]
+"""
+import argparse
+import random
+import time
+from benchmarks.harness import measure, report
+from services.render_service import plan_slide
+from services.theme_service import THEMES
+from utils.template_cache import layout_text_box
+from utils.text_fit import line_count, line_word_widths, word_width
+
+_WORDS = ("the market growth strategy platform customer results revenue analysis learning quarterly "
+          "international data model team risk plan value insight process quality").split()
+
+
+def _deck(slides, bullets, words, seed=1):
+    rng = random.Random(seed)
+
+    def bullet():
+        return ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(*words))).capitalize() + '.'
+    return [{'title': f"Slide {index + 1}", 'content': [bullet() for _ in range(rng.randint(*bullets))]}
+            for index in range(slides)]
+
+
+def _plan_all(deck):
+    return sum(len(plan_slide(slide, theme_settings)) for theme_settings in THEMES.values() for slide in deck)
+
+
+def _cold(deck):
+    line_count.cache_clear()
+    line_word_widths.cache_clear()
+    word_width.cache_clear()
+    started = time.perf_counter()
+    slides = _plan_all(deck)
+    return time.perf_counter() - started, slides
+
+
+def run(slides=100):
+    # The placeholder geometry is read from the template once per process, not per deck
+    for layout_type in (1, 2):
+        layout_text_box(layout_type)
+    results = {}
+    decks = {
+        'typical': _deck(slides, bullets=(3, 5), words=(8, 16)),
+        'overflowing': _deck(slides, bullets=(8, 20), words=(20, 40)),
+    }
+    for name, deck in decks.items():
+        cold_seconds, rendered = _cold(deck)
+        warm = measure(lambda: _plan_all(deck), repeat=3, number=5)
+        results[name] = {
+            'slides_in': slides * len(THEMES),
+            'slides_out': rendered,
+            'cold_seconds_per_deck': cold_seconds / len(THEMES),
+            'warm_seconds_per_deck': warm['best'] / len(THEMES)
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--slides', type=int, default=100, help='Slides per deck')
+    args = parser.parse_args()
+    report('text_fit', run(slides=args.slides), args.output)
+
+
+if __name__ == '__main__':
+    main()
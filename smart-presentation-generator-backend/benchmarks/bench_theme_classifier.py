@@ -0,0 +1,116 @@
+# benchmarks/bench_theme_classifier.py
+"""Accuracy vs. latency of theme selection on labeled topic sets.
+
+Compares three strategies:
+  classifier  - the offline keyword/IDF classifier alone
+  hybrid      - the classifier, falling back to the model when it isn't confident
+  llm         - asking the model for every topic
+Accuracy is measured on fixtures/held_out_topics.json: everyday topics written
+and labeled against the theme descriptions the model is shown, independently
+of the classifier's lexicons. fixtures/labeled_topics.json, which shares the
+lexicons' vocabulary, is reported alongside as ``in_vocabulary`` for comparison
+only.
+
+The model is simulated by a fake transport with ``--llm-latency`` seconds per
+call that answers correctly for an assumed ``--llm-accuracy`` share of the
+topics (a fixed, seeded subset) and with another theme for the rest, so the
+hybrid and llm accuracies follow from that assumption; their latency reflects
+round-trips only.
+
+Run from the backend directory:  python -m benchmarks.bench_theme_classifier [--output results.json]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+from benchmarks.harness import FIXTURES_DIR, measure, report
+from config import THEME_CLASSIFIER_MIN_CONFIDENCE
+from services import theme_classifier
+from services.theme_classifier import classify_theme
+from services.theme_service import THEMES, suggest_theme_name
+from utils import gemini_client
+from utils.gemini_client import FakeTransport
+
+
+def load_labeled_topics(name='held_out_topics.json'):
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return json.load(f)
+
+
+def _simulated_model(rows, accuracy, seed=0):
+    rng = random.Random(seed)
+    labels = {}
+    for row in rows:
+        theme = row['theme']
+        if rng.random() >= accuracy:
+            theme = rng.choice([name for name in THEMES if name != row['theme']])
+        labels[row['topic']] = theme
+
+    def respond(prompt):
+        topic = re.search(r'topic: "(.*)"', prompt).group(1)
+        return labels[topic]
+    return respond
+
+
+def _timed_pass(rows, choose):
+    correct = 0
+    started = time.perf_counter()
+    for row in rows:
+        correct += choose(row['topic']) == row['theme']
+    elapsed = time.perf_counter() - started
+    return {'accuracy': correct / len(rows), 'mean_latency_seconds': elapsed / len(rows)}
+
+
+def _classifier_pass(rows):
+    confident = [row for row in rows if classify_theme(row['topic'])[1] >= THEME_CLASSIFIER_MIN_CONFIDENCE]
+    return {
+        **_timed_pass(rows, lambda topic: classify_theme(topic)[0]),
+        'confident_share': len(confident) / len(rows),
+        'accuracy_when_confident': (
+            sum(classify_theme(row['topic'])[0] == row['theme'] for row in confident) / len(confident)
+            if confident else 0.0
+        )
+    }
+
+
+def run(llm_latency=0.05, llm_accuracy=0.9):
+    rows = load_labeled_topics()
+    transport = FakeTransport(responder=_simulated_model(rows, llm_accuracy), latency=llm_latency)
+    gemini_client.set_transport(transport).cache = None
+
+    classifier_uncached = measure(
+        lambda: [theme_classifier._classify_normalized.__wrapped__(row['topic'].lower()) for row in rows],
+        number=20
+    )
+    in_vocabulary = load_labeled_topics('labeled_topics.json')
+
+    results = {
+        'topics': len(rows),
+        'min_confidence': THEME_CLASSIFIER_MIN_CONFIDENCE,
+        'assumed_llm_accuracy': llm_accuracy,
+        'classifier': {
+            **_classifier_pass(rows),
+            'uncached_latency_seconds': classifier_uncached['best'] / len(rows)
+        },
+        'hybrid': _timed_pass(rows, suggest_theme_name),
+        'llm': _timed_pass(rows, lambda topic: transport.generate(f'topic: "{topic}"', timeout=60)),
+        'in_vocabulary': {'topics': len(in_vocabulary), 'classifier': _classifier_pass(in_vocabulary)}
+    }
+    results['hybrid']['model_calls'] = transport.calls - len(rows)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='Simulated seconds per model call')
+    parser.add_argument('--llm-accuracy', type=float, default=0.9,
+                        help='Share of topics the simulated model labels correctly')
+    args = parser.parse_args()
+    report('theme_classifier', run(llm_latency=args.llm_latency, llm_accuracy=args.llm_accuracy), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/compare.py
+"""Compare two benchmark result files and flag timing regressions.
+
+Every numeric result whose key mentions seconds, latency or a timing
+statistic is compared; a value that grew by more than ``--threshold``
+(relative) is a regression, while throughput is a regression when it drops.
+
+Run from the backend directory:  python -m benchmarks.compare baseline.json current.json [--threshold 0.1]
+Exits with status 1 if any regression is found.
+"""
+import argparse
+import json
+import sys
+
+_TIMING_WORDS = ('seconds', 'latency', 'best', 'median', 'mean', 'p50', 'p95', 'p99', 'save', 'load_template',
+                 'add_slides', 'import', 'create_app', 'first_request', 'total')
+_HIGHER_IS_BETTER = ('throughput', 'accuracy', 'saved_per_request')
+
+
+def flatten(value, prefix=''):
+    """Return ``{dotted.path: number}`` for every numeric leaf of a results document."""
+    if isinstance(value, dict):
+        items = {}
+        for key, child in value.items():
+            items.update(flatten(child, f"{prefix}.{key}" if prefix else str(key)))
+        return items
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: float(value)}
+    return {}
+
+
+def compare(baseline, current, threshold=0.1):
+    """Return per-metric changes and the subset that regressed."""
+    old = flatten(baseline.get('results', baseline))
+    new = flatten(current.get('results', current))
+    changes = {}
+    regressions = {}
+    for path in sorted(old.keys() & new.keys()):
+        leaf = path.rsplit('.', 1)[-1]
+        higher_is_better = any(word in path for word in _HIGHER_IS_BETTER)
+        if not higher_is_better and not any(word in leaf for word in _TIMING_WORDS):
+            continue
+        if old[path] == 0:
+            continue
+        change = (new[path] - old[path]) / abs(old[path])
+        changes[path] = {'baseline': old[path], 'current': new[path], 'change': change}
+        if (-change if higher_is_better else change) > threshold:
+            regressions[path] = changes[path]
+    return changes, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline', help='Results JSON from the reference version')
+    parser.add_argument('current', help='Results JSON from the version under test')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Relative change treated as a regression')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    changes, regressions = compare(baseline, current, args.threshold)
+
+    print(json.dumps({
+        'benchmark': current.get('benchmark'),
+        'baseline_revision': baseline.get('revision'),
+        'current_revision': current.get('revision'),
+        'threshold': args.threshold,
+        'compared': len(changes),
+        'regressions': regressions
+    }, indent=2))
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/fake_gemini.py
+"""Deterministic local stand-in for Gemini, so benchmarks don't spend API quota.
+
+FakeGemini answers each kind of prompt the service sends (whole deck, deck
+plus theme, outline, single slide body, theme and batch theme) with text
+shaped like the real model's. Output size is set by the number of slides,
+bullets per slide and words per bullet; ``malformed_rate`` is the share of
+deck responses that are damaged the way real responses sometimes are.
+Responses depend only on the prompt and the seed, so runs are repeatable.
+"""
+import json
+import random
+import re
+from utils import gemini_client
+from utils.gemini_client import FakeTransport
+
+THEME_NAMES = ('professional', 'creative', 'minimal', 'vibrant', 'academic', 'tech')
+
+_WORDS = (
+    'strategy', 'growth', 'data', 'customer', 'design', 'impact', 'platform', 'research', 'team',
+    'market', 'quality', 'model', 'insight', 'process', 'value', 'future', 'risk', 'cost', 'trend',
+    'learning', 'system', 'network', 'security', 'experience', 'results', 'plan', 'scale', 'budget',
+)
+_TOPIC = re.compile(r'Topic: (.*)')
+_SLIDE_INDEX = re.compile(r'Write the content for slide (\d+): "(.*)"')
+_TOPIC_COUNT = re.compile(r'^\s+\d+\. ', re.MULTILINE)
+
+# Ways a deck response can be damaged, as seen in real model output
+MALFORMATIONS = ('truncated', 'markdown', 'prose_wrapped', 'trailing_comma')
+
+
+class FakeGemini:
+    """Responder for FakeTransport that mimics the model's answers to each prompt kind."""
+
+    def __init__(self, slides=8, bullets=4, words_per_bullet=14, malformed_rate=0.0, seed=0):
+        self.slides = slides
+        self.bullets = bullets
+        self.words_per_bullet = words_per_bullet
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+
+    def __call__(self, prompt):
+        rng = random.Random(f"{self.seed}:{prompt}")
+        if 'one slide title per element' in prompt:
+            return json.dumps([self._title(rng, index) for index in range(self.slides)])
+        match = _SLIDE_INDEX.search(prompt)
+        if match:
+            return json.dumps({'content': self._bullets(rng), 'visual_note': self._sentence(rng, 6)})
+        if 'Reply with a JSON array of theme names' in prompt:
+            count = len(_TOPIC_COUNT.findall(prompt.split('Reply with')[0]))
+            return json.dumps([rng.choice(THEME_NAMES) for _ in range(count)])
+        if 'Reply with just one word' in prompt:
+            return rng.choice(THEME_NAMES)
+        return self._deck(rng, with_theme='"theme"' in prompt)
+
+    def deck_text(self, topic='Benchmark topic', malformation=None, with_theme=False):
+        """Return a deck response for a topic, optionally damaged in a given way."""
+        rng = random.Random(f"{self.seed}:deck:{topic}")
+        slides = self._slides(rng)
+        return self._render_deck(rng, slides, with_theme, malformation)
+
+    def _deck(self, rng, with_theme):
+        slides = self._slides(rng)
+        malformation = rng.choice(MALFORMATIONS) if rng.random() < self.malformed_rate else None
+        return self._render_deck(rng, slides, with_theme, malformation)
+
+    def _render_deck(self, rng, slides, with_theme, malformation):
+        if malformation == 'markdown':
+            lines = []
+            for index, slide in enumerate(slides, start=1):
+                lines.append(f"## Slide {index}: {slide['title']}")
+                lines.extend(f"- {point}" for point in slide['content'])
+                lines.append(f"Visual: {slide['visual_note']}")
+                lines.append('')
+            return '\n'.join(lines)
+
+        body = json.dumps(slides, indent=2)
+        if with_theme:
+            body = json.dumps({'theme': rng.choice(THEME_NAMES), 'slides': slides}, indent=2)
+        if malformation == 'truncated':
+            return '```json\n' + body[:int(len(body) * 0.7)]
+        if malformation == 'prose_wrapped':
+            return f"Here is your presentation outline:\n\n{body}\n\nLet me know if you'd like any changes!"
+        if malformation == 'trailing_comma':
+            return '```json\n' + body.replace('\n  }\n]', '\n  },\n]') + '\n```'
+        return '```json\n' + body + '\n```'
+
+    def _slides(self, rng):
+        return [
+            {'title': self._title(rng, index), 'content': self._bullets(rng), 'visual_note': self._sentence(rng, 8)}
+            for index in range(self.slides)
+        ]
+
+    def _title(self, rng, index):
+        if index == 0:
+            return 'Agenda'
+        if index == self.slides - 1:
+            return 'Conclusion and Key Takeaways'
+        return self._sentence(rng, rng.randint(3, 6)).rstrip('.').title()
+
+    def _bullets(self, rng):
+        return [self._sentence(rng, self.words_per_bullet) for _ in range(self.bullets)]
+
+    def _sentence(self, rng, words):
+        text = ' '.join(rng.choice(_WORDS) for _ in range(words))
+        return text[0].upper() + text[1:] + '.'
+
+
+def install_fake_gemini(latency=0.0, slides=8, bullets=4, words_per_bullet=14, malformed_rate=0.0,
+                        seed=0, use_cache=False):
+    """Route all Gemini calls in this process to a FakeGemini; returns the FakeTransport.
+
+    The response cache is bypassed unless ``use_cache`` is set, so every
+    request pays the simulated latency.
+    """
+    responder = FakeGemini(slides=slides, bullets=bullets, words_per_bullet=words_per_bullet,
+                           malformed_rate=malformed_rate, seed=seed)
+    transport = FakeTransport(responder=responder, latency=latency)
+    client = gemini_client.set_transport(transport)
+    if not use_cache:
+        client.cache = None
+    return transport
@@ -0,0 +1,77 @@
+# benchmarks/harness.py
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def measure(func, repeat=5, number=100):
+    """Time ``func()`` over ``repeat`` rounds of ``number`` calls.
+
+    Returns per-call seconds for the best, median and mean round.
+    """
+    rounds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - started) / number)
+    return {
+        'best': min(rounds),
+        'median': statistics.median(rounds),
+        'mean': statistics.mean(rounds),
+        'repeat': repeat,
+        'number': number
+    }
+
+
+def summarize(samples):
+    """Return best, mean and tail percentiles of a list of per-call seconds."""
+    ordered = sorted(samples)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+    return {
+        'count': len(ordered),
+        'best': ordered[0],
+        'mean': statistics.mean(ordered),
+        'p50': percentile(0.5),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'max': ordered[-1]
+    }
+
+
+def _revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(name, results, output=None):
+    """Print results as JSON and optionally write them to ``output``."""
+    document = {
+        'benchmark': name,
+        'timestamp': datetime.now().isoformat(),
+        'revision': _revision(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results
+    }
+    text = json.dumps(document, indent=2)
+    print(text)
+    if output:
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output, 'w') as f:
+            f.write(text)
+    return document
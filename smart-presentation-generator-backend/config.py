@@ -8,7 +8,126 @@ load_dotenv()
 # API Keys
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
+# Gemini model settings
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash')
+GEMINI_TIMEOUT = float(os.getenv('GEMINI_TIMEOUT', 60))  # Seconds per call, including retries
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', 8))
+GEMINI_MAX_RETRIES = int(os.getenv('GEMINI_MAX_RETRIES', 3))
+GEMINI_RETRY_BASE_DELAY = float(os.getenv('GEMINI_RETRY_BASE_DELAY', 0.5))  # Seconds
+GEMINI_RETRY_MAX_DELAY = float(os.getenv('GEMINI_RETRY_MAX_DELAY', 8))  # Seconds
+
+# Gemini response cache (set GEMINI_CACHE_DB_PATH to keep responses across restarts)
+GEMINI_CACHE_ENABLED = os.getenv('GEMINI_CACHE_ENABLED', 'true').lower() == 'true'
+GEMINI_CACHE_MAX_ENTRIES = int(os.getenv('GEMINI_CACHE_MAX_ENTRIES', 512))
+GEMINI_CACHE_TTL = int(os.getenv('GEMINI_CACHE_TTL', 24 * 3600))  # Seconds
+GEMINI_CACHE_DB_PATH = os.getenv('GEMINI_CACHE_DB_PATH', '')
+GEMINI_CACHE_DB_MAX_ENTRIES = int(os.getenv('GEMINI_CACHE_DB_MAX_ENTRIES', 10000))
+
 # Application settings
 UPLOAD_FOLDER = 'static/uploads'
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'docx'}
-MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload
\ No newline at end of file
+MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload
+
+# Decks generated from uploaded documents: the extracted text is cut into chunks of
+# about DOCUMENT_CHUNK_TOKENS, summarized with at most DOCUMENT_SUMMARY_WORKERS
+# concurrent calls, and the summaries are merged into the slide prompt
+DOCUMENT_CHUNK_TOKENS = int(os.getenv('DOCUMENT_CHUNK_TOKENS', 8000))
+DOCUMENT_SUMMARY_WORKERS = int(os.getenv('DOCUMENT_SUMMARY_WORKERS', 4))
+DOCUMENT_MAX_CHUNKS = int(os.getenv('DOCUMENT_MAX_CHUNKS', 500))  # Text beyond this is left out
+
+# Document summaries cached by file hash, so re-uploads skip extraction and summarization
+DOCUMENT_CACHE_MAX_ENTRIES = int(os.getenv('DOCUMENT_CACHE_MAX_ENTRIES', 256))
+DOCUMENT_CACHE_TTL = int(os.getenv('DOCUMENT_CACHE_TTL', 7 * 24 * 3600))  # Seconds
+DOCUMENT_CACHE_DB_PATH = os.getenv('DOCUMENT_CACHE_DB_PATH', '')
+
+# Slide generation ('single' asks for the whole deck in one call, 'parallel' expands
+# an outline with one concurrent call per slide)
+GENERATION_MODE = os.getenv('GENERATION_MODE', 'single')
+MAX_SLIDES = int(os.getenv('MAX_SLIDES', 30))  # Largest num_slides a request may ask for
+PARALLEL_SLIDE_WORKERS = int(os.getenv('PARALLEL_SLIDE_WORKERS', 8))
+
+# Build decks on a slide master with the theme baked in instead of styling every shape
+PPT_THEMED_MASTER = os.getenv('PPT_THEMED_MASTER', 'true').lower() == 'true'
+
+# Write bullet paragraphs as XML in one pass instead of through python-pptx proxy objects
+PPT_BULK_TEXT = os.getenv('PPT_BULK_TEXT', 'true').lower() == 'true'
+
+# Bullets that don't fit their placeholder at the theme's font size are set smaller,
+# down to TEXT_FIT_MIN_FONT_SIZE points, and split onto continuation slides beyond that
+TEXT_FIT_ENABLED = os.getenv('TEXT_FIT_ENABLED', 'true').lower() == 'true'
+TEXT_FIT_MIN_FONT_SIZE = int(os.getenv('TEXT_FIT_MIN_FONT_SIZE', 12))
+
+# Generate requests with 'lazy' (the default when GENERATION_LAZY is set) return the slides
+# and an HTML/JSON preview without building the .pptx; it is built on first download.
+# Needs the presentation store (PRESENTATION_DB_PATH).
+GENERATION_LAZY = os.getenv('GENERATION_LAZY', 'false').lower() == 'true'
+
+# Pre-parsed template presentations kept ready per theme (0 disables the pool)
+TEMPLATE_POOL_SIZE = int(os.getenv('TEMPLATE_POOL_SIZE', 2))
+
+# Batch generation
+BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', 50))
+BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', 4))
+
+# Where generated decks go: 'memory' keeps them in the bounded artifact store,
+# 'disk' writes them to static/presentations
+ARTIFACT_STORAGE = os.getenv('ARTIFACT_STORAGE', 'memory')
+ARTIFACT_MEMORY_MAX_BYTES = int(os.getenv('ARTIFACT_MEMORY_MAX_BYTES', 256 * 1024 * 1024))
+ARTIFACT_TTL = int(os.getenv('ARTIFACT_TTL', 6 * 3600))  # Seconds
+ARTIFACT_SPILL_DIR = os.getenv('ARTIFACT_SPILL_DIR', 'static/artifacts')  # Empty disables disk spill
+ARTIFACT_DISK_MAX_BYTES = int(os.getenv('ARTIFACT_DISK_MAX_BYTES', 2 * 1024 * 1024 * 1024))
+
+# Record of generated decks (spec, slide content, theme and artifact) kept in SQLite;
+# an empty path disables it. Generate requests that ask for ``reuse`` are served from
+# it without calling Gemini when the same topic+description was generated within the
+# reuse window (0 disables reuse).
+PRESENTATION_DB_PATH = os.getenv('PRESENTATION_DB_PATH', 'static/presentations.db')
+PRESENTATION_REUSE_TTL = int(os.getenv('PRESENTATION_REUSE_TTL', 24 * 3600))  # Seconds
+# Decks are deleted this long after they were generated, and the oldest ones beyond
+# PRESENTATION_MAX_ENTRIES (0 disables either limit)
+PRESENTATION_RETENTION = int(os.getenv('PRESENTATION_RETENTION', 30 * 24 * 3600))  # Seconds
+PRESENTATION_MAX_ENTRIES = int(os.getenv('PRESENTATION_MAX_ENTRIES', 10000))
+# GET /api/presentations can't tell whose decks are whose, so it only lists the decks of
+# a given topic unless this is set
+PRESENTATION_LIST_ALL = os.getenv('PRESENTATION_LIST_ALL', 'false').lower() == 'true'
+
+# Near-duplicate requests (e.g. "Intro to ML" after "Introduction to Machine Learning")
+# start from the slides generated for the earlier one when their estimated similarity
+# is at least SIMILAR_TOPIC_THRESHOLD (0-1). With SIMILAR_TOPIC_ADAPT the cached
+# slides are rewritten for the new wording in one call instead of used as they are.
+# An empty SIMILAR_TOPIC_DB_PATH keeps the index in memory only.
+SIMILAR_TOPIC_CACHE_ENABLED = os.getenv('SIMILAR_TOPIC_CACHE_ENABLED', 'true').lower() == 'true'
+SIMILAR_TOPIC_THRESHOLD = float(os.getenv('SIMILAR_TOPIC_THRESHOLD', 0.7))
+SIMILAR_TOPIC_MAX_ENTRIES = int(os.getenv('SIMILAR_TOPIC_MAX_ENTRIES', 5000))
+SIMILAR_TOPIC_DB_PATH = os.getenv('SIMILAR_TOPIC_DB_PATH', 'static/similar_topics.db')
+SIMILAR_TOPIC_ADAPT = os.getenv('SIMILAR_TOPIC_ADAPT', 'false').lower() == 'true'
+
+# Identical generate and theme requests in flight at the same time share one run;
+# duplicates wait at most COALESCE_TIMEOUT seconds for it
+COALESCE_ENABLED = os.getenv('COALESCE_ENABLED', 'true').lower() == 'true'
+COALESCE_TIMEOUT = float(os.getenv('COALESCE_TIMEOUT', 180))
+
+# Themes are picked by the local classifier when it is at least this confident (0-1),
+# otherwise Gemini is asked
+THEME_CLASSIFIER_MIN_CONFIDENCE = float(os.getenv('THEME_CLASSIFIER_MIN_CONFIDENCE', 0.3))
+
+# How long a theme picked for a topic is reused across suggest/generate requests
+TOPIC_THEME_CACHE_TTL = int(os.getenv('TOPIC_THEME_CACHE_TTL', 900))  # Seconds
+TOPIC_THEME_CACHE_MAX_ENTRIES = int(os.getenv('TOPIC_THEME_CACHE_MAX_ENTRIES', 2048))
+
+# Where decks are rendered: 'inline' (on the request thread) or 'process' (warm worker processes)
+RENDER_BACKEND = os.getenv('RENDER_BACKEND', 'inline')
+RENDER_WORKERS = int(os.getenv('RENDER_WORKERS', os.cpu_count() or 2))
+RENDER_TIMEOUT = float(os.getenv('RENDER_TIMEOUT', 60))  # Seconds per deck
+RENDER_MAX_TASKS_PER_CHILD = int(os.getenv('RENDER_MAX_TASKS_PER_CHILD', 200))  # 0 keeps workers forever
+
+# Background generation jobs
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))
+JOB_QUEUE_MAX_DEPTH = int(os.getenv('JOB_QUEUE_MAX_DEPTH', 32))
+JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', 3600))  # Seconds a finished job is kept
+
+# Write one structured JSON log line per API request
+REQUEST_LOG_ENABLED = os.getenv('REQUEST_LOG_ENABLED', 'true').lower() == 'true'
+
+# Prime template and theme caches when the app is created, before it takes traffic
+APP_PRELOAD = os.getenv('APP_PRELOAD', 'false').lower() == 'true'
@@ -0,0 +1,33 @@
+# gunicorn.conf.py
+# Production server settings:  gunicorn -c gunicorn.conf.py
+import os
+
+wsgi_app = 'app:create_app()'
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# Threaded workers: generation is mostly waiting on Gemini, and SSE streams hold a thread each.
+# One worker per container: the job queue, the in-memory artifact store and the per-process
+# caches (coalesced requests, topic themes) live in the worker, so with several workers a job
+# poll or a download can reach one that doesn't know the job or deck and get a 404. Scale
+# with more containers behind sticky routing; RENDER_BACKEND=process puts rendering on every
+# core. GUNICORN_THREADS and GUNICORN_TIMEOUT override the defaults below; only raise
+# WEB_CONCURRENCY with ARTIFACT_STORAGE=disk and without async jobs.
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+threads = int(os.getenv('GUNICORN_THREADS', 32))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 180))
+graceful_timeout = 30
+
+# Create the app (and prime the template and theme caches) once in the master,
+# so forked workers share them and take traffic straight away
+preload_app = True
+os.environ.setdefault('APP_PRELOAD', 'true')
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # The Gemini client must not be shared across fork, so each worker makes its own
+    from services.warmup_service import warm_worker
+    warm_worker()
@@ -1,13 +1,14 @@
 # models/presentation.py
 class Presentation:
     """Model for a presentation."""
-    def __init__(self, id=None, title="", description="", theme="", slides=None, created_at=None):
+    def __init__(self, id=None, title="", description="", theme="", slides=None, created_at=None, file_name=None):
         self.id = id
         self.title = title
         self.description = description
         self.theme = theme
         self.slides = slides or []
         self.created_at = created_at
+        self.file_name = file_name
         
     def to_dict(self):
         return {
@@ -16,7 +17,8 @@ class Presentation:
             'description': self.description,
             'theme': self.theme,
             'slides': self.slides,
-            'created_at': self.created_at
+            'created_at': self.created_at,
+            'file_name': self.file_name
         }
     
     @classmethod
@@ -27,5 +29,6 @@ class Presentation:
             description=data.get('description', ''),
             theme=data.get('theme', ''),
             slides=data.get('slides', []),
-            created_at=data.get('created_at')
-        )
\ No newline at end of file
+            created_at=data.get('created_at'),
+            file_name=data.get('file_name')
+        )
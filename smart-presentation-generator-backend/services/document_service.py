@@ -0,0 +1,164 @@
+# services/document_service.py
+import hashlib
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from services.generation_service import generate_deck
+from services.prompt_service import build_document_summary_prompt, build_summary_merge_prompt
+from utils.document_text import DocumentError, READ_BLOCK_SIZE, estimate_tokens, iter_chunks, iter_text
+from utils.gemini_client import get_gemini_response
+from utils.response_cache import build_response_cache
+from utils.tracing import bind_context, traced
+from config import (UPLOAD_FOLDER, ALLOWED_EXTENSIONS, GEMINI_MODEL, DOCUMENT_CHUNK_TOKENS, DOCUMENT_SUMMARY_WORKERS,
+                    DOCUMENT_MAX_CHUNKS, DOCUMENT_CACHE_MAX_ENTRIES, DOCUMENT_CACHE_TTL, DOCUMENT_CACHE_DB_PATH)
+
+# Finished document summaries, keyed by the file's hash
+document_cache = build_response_cache(
+    max_entries=DOCUMENT_CACHE_MAX_ENTRIES,
+    ttl=DOCUMENT_CACHE_TTL,
+    disk_path=DOCUMENT_CACHE_DB_PATH or None
+)
+
+# Merge rounds before the remaining summaries are used as they are
+MAX_MERGE_ROUNDS = 4
+
+def save_upload(upload, folder=UPLOAD_FOLDER):
+    """Stream an uploaded file to disk in blocks, hashing it on the way.
+
+    Returns ``(path, extension, sha256)``. Raises DocumentError for file
+    types other than ALLOWED_EXTENSIONS.
+    """
+    file_name = upload.filename or ''
+    extension = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else ''
+    if extension not in ALLOWED_EXTENSIONS:
+        raise DocumentError(f"File type must be one of: {', '.join(sorted(ALLOWED_EXTENSIONS))}")
+
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{uuid.uuid4().hex}.{extension}")
+    digest = hashlib.sha256()
+    with open(path, 'wb') as f:
+        while True:
+            block = upload.stream.read(READ_BLOCK_SIZE)
+            if not block:
+                break
+            digest.update(block)
+            f.write(block)
+    return path, extension, digest.hexdigest()
+
+@traced('summarize_document')
+def summarize_document(path, extension, digest, chunk_tokens=DOCUMENT_CHUNK_TOKENS,
+                       max_workers=DOCUMENT_SUMMARY_WORKERS, max_chunks=DOCUMENT_MAX_CHUNKS):
+    """Summarize a document with a map-reduce over its text.
+
+    The text is extracted and cut into chunks as the file is read, and the
+    chunks are summarized concurrently by at most ``max_workers`` model calls,
+    with only a few chunks held in memory at once. The chunk summaries are then
+    merged until they fit in one chunk. A summary is cached by the file's
+    hash, so uploading the same file again skips extraction and summarization.
+
+    Returns a dict with the ``summary``, the number of ``chunks``, whether the
+    text was ``truncated`` at ``max_chunks`` and whether it was ``cached``.
+    """
+    cache_key = f"document:{digest}:{chunk_tokens}:{max_chunks}"
+    cached = document_cache.get(cache_key, GEMINI_MODEL)
+    if cached is not None:
+        return {**json.loads(cached), 'cached': True}
+
+    summaries, truncated = _summarize_chunks(iter_chunks(iter_text(path, extension), chunk_tokens),
+                                             max_workers, max_chunks)
+    if not summaries:
+        raise DocumentError("No text could be extracted from the document")
+    chunks = len(summaries)
+
+    # Reduce: merge neighbouring summaries until they fit in one chunk
+    for _ in range(MAX_MERGE_ROUNDS):
+        if len(summaries) == 1 or estimate_tokens('\n\n'.join(summaries)) <= chunk_tokens:
+            break
+        groups = _group_summaries(summaries, chunk_tokens)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as executor:
+            summaries = list(executor.map(bind_context(_merge_summaries), groups))
+
+    document = {'summary': '\n\n'.join(summaries), 'chunks': chunks, 'truncated': truncated}
+    document_cache.set(cache_key, GEMINI_MODEL, json.dumps(document))
+    return {**document, 'cached': False}
+
+def generate_deck_from_document(path, extension, digest, topic, description='', theme=None, timings=None,
+                                on_stage=None, mode=None, num_slides=None):
+    """Summarize an uploaded document, then generate a deck based on the summary.
+
+    The upload at ``path`` is removed once it has been read. Takes the same
+    ``timings``/``on_stage`` hooks as generate_deck, and adds the
+    ``summarize_document`` stage.
+    """
+    if timings is None:
+        timings = {}
+    if on_stage is not None:
+        on_stage('summarize_document')
+
+    started = time.perf_counter()
+    try:
+        document = summarize_document(path, extension, digest)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+    timings['summarize_document'] = time.perf_counter() - started
+
+    source_description = (f"{description}\n\nBase the presentation on this summary of the source document:\n"
+                          f"{document['summary']}").strip()
+    result = generate_deck(topic, source_description, theme, timings=timings, on_stage=on_stage, mode=mode,
+                           num_slides=num_slides)
+    result['document'] = {
+        'sha256': digest,
+        'chunks': document['chunks'],
+        'truncated': document['truncated'],
+        'cached': document['cached']
+    }
+    return result
+
+def _summarize_chunks(chunks, max_workers, max_chunks):
+    """Summarize chunks concurrently as they are produced; return the summaries in order."""
+    summaries = {}
+    truncated = False
+
+    def collect(done):
+        for future in done:
+            index, summary = future.result()
+            summaries[index] = summary
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        pending = set()
+        for index, chunk in enumerate(chunks):
+            if index >= max_chunks:
+                truncated = True
+                break
+            # Keep at most two chunks per worker in flight, so memory stays flat for large files
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(executor.submit(bind_context(_summarize_chunk), index, chunk))
+        collect(wait(pending).done)
+
+    return [summaries[index] for index in sorted(summaries) if summaries[index]], truncated
+
+def _summarize_chunk(index, chunk):
+    return index, get_gemini_response(build_document_summary_prompt(chunk)).strip()
+
+def _merge_summaries(summaries):
+    if len(summaries) == 1:
+        return summaries[0]
+    return get_gemini_response(build_summary_merge_prompt(summaries)).strip()
+
+def _group_summaries(summaries, chunk_tokens):
+    """Pack consecutive summaries into groups that each fit in one chunk (at least two per group)."""
+    groups = [[]]
+    size = 0
+    for summary in summaries:
+        tokens = estimate_tokens(summary)
+        if len(groups[-1]) >= 2 and size + tokens > chunk_tokens:
+            groups.append([])
+            size = 0
+        groups[-1].append(summary)
+        size += tokens
+    return groups
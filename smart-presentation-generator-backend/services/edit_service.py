@@ -0,0 +1,168 @@
+# services/edit_service.py
+import threading
+import time
+from services.prompt_service import generate_single_slide
+from services.render_service import plan_slide, render_slide_parts
+from services.slide_service import create_presentation, load_presentation_bytes, save_presentation_bytes
+from services.theme_service import get_theme_settings
+from utils.presentation_store import presentation_store
+from utils.pptx_patch import PackagePatch
+from utils.response_parser import validate_slides
+from utils.tracing import traced
+
+OPERATIONS = ('regenerate', 'update', 'insert', 'delete', 'reorder')
+
+# Edits of the same deck are applied one at a time
+_edit_locks = [threading.Lock() for _ in range(32)]
+
+class SlideEditError(ValueError):
+    """Raised when an edit operation is malformed or points outside the deck."""
+
+class _Entry:
+    """A content slide while edits are applied: its data, its slides in the package, and whether it changed."""
+
+    def __init__(self, slide, refs=(), changed=False):
+        self.slide = slide
+        self.refs = refs
+        self.changed = changed
+
+@traced('edit_presentation')
+def edit_presentation(presentation_id, operations):
+    """Apply slide edits to a stored deck and return where to download the result.
+
+    Operations run in order; each is a dict with ``op`` and its arguments
+    (``index`` is the 0-based position among the content slides):
+
+    - regenerate: ``index``, optional ``title`` and ``instruction``; asks the
+      model for that slide only, given the deck's slide titles
+    - update: ``index`` and ``slide`` (title/content/visual_note) to use as is
+    - insert: ``index`` and either ``slide`` or a ``title`` (plus optional
+      ``instruction``) to generate it from
+    - delete: ``index``
+    - reorder: ``order``, the current indexes in their new order
+
+    Only changed slides are rendered; they are patched into the existing
+    .pptx, whose other entries are copied unchanged. If the deck's file has
+    expired the whole deck is rendered from the edited slides instead; a deck
+    generated lazily that hasn't been downloaded yet stays unbuilt, and only
+    its slides are updated. Returns None if there is no such presentation.
+    """
+    if presentation_store is None:
+        return None
+
+    with _edit_locks[hash(presentation_id) % len(_edit_locks)]:
+        presentation = presentation_store.get(presentation_id)
+        if presentation is None:
+            return None
+
+        theme_settings = get_theme_settings(presentation.theme)
+        data = load_presentation_bytes(presentation.file_name) if presentation.file_name else None
+        patch = PackagePatch(data) if data is not None else None
+        entries = [_Entry(slide) for slide in presentation.slides]
+        if patch is not None:
+            # A content slide may have been split over several slides (see plan_slide)
+            counts = [len(plan_slide(slide, theme_settings)) for slide in presentation.slides]
+            if len(patch.slides) == sum(counts) + 1:
+                refs = iter(patch.slides[1:])
+                for entry, count in zip(entries, counts):
+                    entry.refs = [next(refs) for _ in range(count)]
+            else:
+                # The file doesn't match the stored slides (title slide first), so it can't be patched
+                patch = None
+
+        for operation in operations:
+            _apply_operation(presentation, entries, operation)
+        slides = [entry.slide for entry in entries]
+
+        if presentation.file_name is None:
+            # Generated lazily and not downloaded yet: the file is built from these slides on download
+            presentation_store.update_slides(presentation_id, slides, None)
+            return {
+                'presentation_id': presentation_id,
+                'download_url': f"/api/presentations/{presentation_id}/download",
+                'preview_url': f"/api/presentations/{presentation_id}/preview",
+                'slide_count': len(slides),
+                'slides': slides,
+                'slides_rendered': 0,
+                'patched': False,
+                'lazy': True
+            }
+
+        started = time.perf_counter()
+        if patch is not None:
+            changed = [entry for entry in entries if entry.changed]
+            parts = iter(render_slide_parts([entry.slide for entry in changed], theme_settings))
+            layout = [patch.slides[0]]
+            rendered = 0
+            for entry in entries:
+                if not entry.changed:
+                    layout.extend(entry.refs)
+                    continue
+                # New slides take the place of the entry's old ones; old ones left over are dropped
+                old_refs = iter(entry.refs)
+                for part in next(parts):
+                    layout.append((next(old_refs, None), *part))
+                    rendered += 1
+            file_name = save_presentation_bytes(presentation.title, patch.apply(layout))
+        else:
+            file_name = create_presentation(presentation.title, slides, presentation.theme)
+            rendered = len(slides) + 1
+
+        presentation_store.update_slides(presentation_id, slides, file_name)
+
+    return {
+        'presentation_id': presentation_id,
+        'file_path': file_name,
+        'download_url': f"/api/download/{file_name}",
+        'slide_count': len(slides),
+        'slides': slides,
+        'slides_rendered': rendered,
+        'patched': patch is not None,
+        'render_seconds': time.perf_counter() - started
+    }
+
+def _apply_operation(presentation, entries, operation):
+    """Apply one edit operation to the list of slide entries."""
+    if not isinstance(operation, dict) or operation.get('op') not in OPERATIONS:
+        raise SlideEditError(f"Each operation needs an 'op': one of {', '.join(OPERATIONS)}")
+    op = operation['op']
+
+    if op == 'reorder':
+        order = operation.get('order')
+        if not isinstance(order, list) or sorted(order) != list(range(len(entries))):
+            raise SlideEditError(f"'order' must list each slide index from 0 to {len(entries) - 1} once")
+        entries[:] = [entries[index] for index in order]
+        return
+
+    index = operation.get('index')
+    upper = len(entries) if op == 'insert' else len(entries) - 1
+    if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index <= upper:
+        raise SlideEditError(f"'{op}' needs an 'index' from 0 to {upper}")
+
+    if op == 'delete':
+        del entries[index]
+        return
+
+    slide = None
+    if operation.get('slide') is not None:
+        slides = validate_slides([operation['slide']])
+        if not slides:
+            raise SlideEditError("'slide' must be an object with a title or content")
+        slide = slides[0]
+
+    titles = [entry.slide.get('title', '') for entry in entries]
+    if op == 'insert':
+        if slide is None and not operation.get('title'):
+            raise SlideEditError("'insert' needs a 'slide' or a 'title' to generate it from")
+        titles.insert(index, str(operation.get('title') or ''))
+        entries.insert(index, _Entry(slide, changed=True))
+    elif op == 'update' and slide is None:
+        raise SlideEditError("'update' needs a 'slide'")
+
+    if slide is None:
+        if operation.get('title'):
+            titles[index] = str(operation['title']).strip()
+        slide = generate_single_slide(presentation.title, presentation.description, titles, index,
+                                      operation.get('instruction'))
+    entries[index].slide = slide
+    entries[index].changed = True
@@ -0,0 +1,323 @@
+# services/generation_service.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+from services.prompt_service import (generate_slide_prompts, generate_slide_prompts_parallel,
+                                     generate_slide_prompts_and_theme, adapt_slide_prompts)
+from services.preview_service import preview_spec
+from services.slide_service import create_presentation, presentation_available
+from services.theme_service import suggest_theme_name, suggest_themes_batch, remember_topic_theme, resolve_theme_name
+from utils.metrics import presentations_reused, presentations_materialized
+from utils.presentation_store import presentation_store
+from utils.similarity_index import similar_topics
+from utils.single_flight import SingleFlight
+from utils.tracing import bind_context, log
+from config import (GENERATION_MODE, BATCH_MAX_WORKERS, PRESENTATION_REUSE_TTL, RENDER_WORKERS, COALESCE_ENABLED,
+                    COALESCE_TIMEOUT, SIMILAR_TOPIC_ADAPT)
+
+_deck_flight = SingleFlight('generate', timeout=COALESCE_TIMEOUT)
+_materialize_flight = SingleFlight('materialize', timeout=COALESCE_TIMEOUT)
+
+def generate_deck(topic, description, theme=None, timings=None, on_stage=None, mode=None, num_slides=None,
+                  reuse=False, fresh=False, lazy=False):
+    """Run the full generation pipeline: slide content from Gemini, then the PowerPoint build.
+    
+    ``mode`` selects how slide content is generated: 'single' (one model call)
+    or 'parallel' (outline, then concurrent per-slide calls). It defaults to
+    GENERATION_MODE.
+    
+    If a ``timings`` dict is given, the duration of each stage (in seconds) is
+    recorded into it under the stage's function name. ``on_stage`` is called
+    with the stage name as each stage starts.
+    
+    Without a ``theme``, a theme already chosen for the topic (or a confident
+    local classification) is used; otherwise the theme is picked alongside the
+    content, so the model is never asked about the theme separately first.
+    
+    Each deck is recorded in the presentation store. With ``reuse``, a deck
+    generated within PRESENTATION_REUSE_TTL for the same topic, description
+    and slide count is returned instead (re-rendered, without Gemini, if its
+    file expired or another theme was asked for). Failing that, a request
+    close enough to an earlier one (see utils.similarity_index) starts from
+    the earlier request's slides, marked ``similar_to``. With ``fresh``, none
+    of that applies and the content isn't taken from the response cache
+    either, so the model writes a new deck.
+    
+    With ``lazy`` (and the presentation store enabled), the PowerPoint build
+    is skipped: the deck is recorded with its slide content only and the
+    result carries the ``slides``, a ``preview`` (see services.preview_service)
+    and a download URL that builds the file on first use (see
+    materialize_presentation), so a deck that is never downloaded never
+    touches python-pptx.
+    
+    Identical requests (same normalized topic, description, theme, mode and
+    slide count) that arrive while one is running wait for it and get the
+    same deck, marked ``coalesced``, instead of generating their own.
+    """
+    if timings is None:
+        timings = {}
+    lazy = lazy and presentation_store is not None
+    reuse = reuse and not fresh
+    if not COALESCE_ENABLED:
+        return _generate_deck(topic, description, theme, timings, on_stage, mode, num_slides, reuse, fresh, lazy)
+    
+    key = (_spec_key((topic, description, theme or '', mode or GENERATION_MODE, str(num_slides or '')))
+           + (reuse, fresh, lazy))
+    started = time.perf_counter()
+    result, shared = _deck_flight.do(key, _generate_deck, topic, description, theme, timings, on_stage, mode,
+                                     num_slides, reuse, fresh, lazy)
+    if shared:
+        timings['coalesced_wait'] = time.perf_counter() - started
+        return {**result, 'coalesced': True}
+    return result
+
+def _generate_deck(topic, description, theme, timings, on_stage, mode, num_slides, reuse, fresh, lazy):
+    """Run the pipeline for generate_deck."""
+    if on_stage is None:
+        on_stage = lambda stage: None
+    
+    if reuse and presentation_store is not None and PRESENTATION_REUSE_TTL:
+        stored = presentation_store.find(topic, description, num_slides, max_age=PRESENTATION_REUSE_TTL)
+        if stored is not None:
+            return _reuse_presentation(stored, topic, theme, num_slides, timings, on_stage, lazy)
+    
+    similar = None
+    if reuse and similar_topics is not None:
+        similar = similar_topics.query(topic, description, num_slides)
+    
+    # Generate slide-by-slide content using Gemini
+    on_stage('generate_slide_prompts')
+    started = time.perf_counter()
+    if similar is not None:
+        entry, similarity = similar
+        log(f"Reusing slides of similar topic '{entry['topic']}' ({similarity:.2f}) for topic: {topic}")
+        theme = theme or entry['theme']
+        slide_contents = entry['slides']
+        if SIMILAR_TOPIC_ADAPT:
+            slide_contents = adapt_slide_prompts(topic, description, slide_contents)
+        presentations_reused.inc(outcome='similar')
+    else:
+        slide_contents, theme = _generate_slide_contents(topic, description, theme, mode, num_slides,
+                                                         use_cache=not fresh)
+    timings['generate_slide_prompts'] = time.perf_counter() - started
+    
+    theme = resolve_theme_name(theme or "professional")
+    if lazy:
+        # The file is built when the deck is first downloaded
+        timings['create_presentation'] = 0.0
+        record = presentation_store.save(topic, description, theme, slide_contents, None,
+                                         requested_slides=num_slides)
+        result = _lazy_result(record)
+    else:
+        # Create the PowerPoint file
+        on_stage('create_presentation')
+        started = time.perf_counter()
+        ppt_path = create_presentation(
+            topic=topic,
+            slide_contents=slide_contents,
+            theme=theme
+        )
+        timings['create_presentation'] = time.perf_counter() - started
+        
+        result = {
+            'file_path': ppt_path,
+            'download_url': f"/api/download/{ppt_path}"
+        }
+        if presentation_store is not None:
+            record = presentation_store.save(topic, description, theme, slide_contents, ppt_path,
+                                             requested_slides=num_slides)
+            result['presentation_id'] = record.id
+    if similar is not None:
+        result['similar_to'] = {'topic': similar[0]['topic'], 'similarity': round(similar[1], 3)}
+    elif similar_topics is not None:
+        similar_topics.add(topic, description, slide_contents, theme, num_slides)
+    return result
+
+def _generate_slide_contents(topic, description, theme, mode, num_slides, use_cache=True):
+    """Generate slide content with Gemini; return ``(slide_contents, theme)``."""
+    if not theme:
+        theme = suggest_theme_name(topic, use_model=False)
+    if (mode or GENERATION_MODE) == 'parallel':
+        if theme:
+            slide_contents = generate_slide_prompts_parallel(topic, description, num_slides, use_cache=use_cache)
+        else:
+            # Ask for the theme while the slide calls run rather than before them
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                theme_future = executor.submit(bind_context(suggest_theme_name), topic)
+                slide_contents = generate_slide_prompts_parallel(topic, description, num_slides, use_cache=use_cache)
+                theme = theme_future.result()
+    elif theme:
+        slide_contents = generate_slide_prompts(topic, description, num_slides, use_cache=use_cache)
+    else:
+        slide_contents, theme = generate_slide_prompts_and_theme(topic, description, num_slides,
+                                                                 use_cache=use_cache)
+        remember_topic_theme(topic, theme)
+    return slide_contents, theme
+
+def _reuse_presentation(stored, topic, theme, num_slides, timings, on_stage, lazy=False):
+    """Answer a repeat request from a stored deck, rendering it again only if needed."""
+    theme = resolve_theme_name(theme) if theme else stored.theme
+    timings['generate_slide_prompts'] = 0.0
+    log(f"Reusing stored presentation {stored.id} for topic: {topic}")
+    
+    if lazy:
+        timings['create_presentation'] = 0.0
+        if theme != stored.theme:
+            stored = presentation_store.save(topic, stored.description, theme, stored.slides, None,
+                                             requested_slides=num_slides)
+        presentations_reused.inc(outcome='lazy')
+        return {**_lazy_result(stored), 'reused': True}
+    
+    presentation_id = stored.id
+    ppt_path = stored.file_name
+    if theme != stored.theme or not presentation_available(ppt_path):
+        on_stage('create_presentation')
+        started = time.perf_counter()
+        ppt_path = create_presentation(topic=topic, slide_contents=stored.slides, theme=theme)
+        timings['create_presentation'] = time.perf_counter() - started
+        if theme == stored.theme:
+            presentation_store.set_file_name(stored.id, ppt_path)
+        else:
+            presentation_id = presentation_store.save(topic, stored.description, theme, stored.slides, ppt_path,
+                                                      requested_slides=num_slides).id
+        presentations_reused.inc(outcome='rendered')
+    else:
+        timings['create_presentation'] = 0.0
+        presentations_reused.inc(outcome='artifact')
+    
+    return {
+        'file_path': ppt_path,
+        'download_url': f"/api/download/{ppt_path}",
+        'presentation_id': presentation_id,
+        'reused': True
+    }
+
+def _lazy_result(presentation):
+    """Return the generate result for a deck whose file hasn't been built yet."""
+    return {
+        'presentation_id': presentation.id,
+        'theme': presentation.theme,
+        'slides': presentation.slides,
+        'preview': preview_spec(presentation.title, presentation.slides, presentation.theme),
+        'preview_url': f"/api/presentations/{presentation.id}/preview",
+        'download_url': f"/api/presentations/{presentation.id}/download",
+        'lazy': True
+    }
+
+def materialize_presentation(presentation):
+    """Return the file name of a stored deck's .pptx, building it from its slides if there is none yet.
+    
+    Lazily generated decks are built here on first download and the file is
+    recorded in the store, so later downloads reuse it; a file that expired
+    is built again. Concurrent first downloads of a deck share one build.
+    """
+    if presentation_available(presentation.file_name):
+        return presentation.file_name
+    file_name, shared = _materialize_flight.do(presentation.id, _build_stored_presentation, presentation)
+    return file_name
+
+def _build_stored_presentation(presentation):
+    started = time.perf_counter()
+    while True:
+        file_name = create_presentation(presentation.title, presentation.slides, presentation.theme)
+        # Build again if the slides were edited meanwhile, so the file matches the stored slides
+        current = presentation_store.get(presentation.id)
+        if current is None or current.slides == presentation.slides:
+            break
+        presentation = current
+    presentation_store.set_file_name(presentation.id, file_name)
+    presentations_materialized.inc()
+    log(f"Built presentation {presentation.id} as {file_name} "
+          f"in {time.perf_counter() - started:.3f}s")
+    return file_name
+
+def render_themes(topic, slide_contents, themes, description='', max_workers=RENDER_WORKERS, record=True):
+    """Render existing slide content in one or more themes, skipping content generation.
+    
+    Only the PowerPoint build runs, so a theme change costs a render rather
+    than a model call. Several themes are rendered concurrently (in parallel
+    with the 'process' render backend). Returns ``{theme_name: result}``;
+    with ``record``, each rendered deck is recorded in the presentation store.
+    """
+    themes = list(dict.fromkeys(resolve_theme_name(theme) for theme in themes))
+    
+    def build(theme):
+        started = time.perf_counter()
+        ppt_path = create_presentation(topic=topic, slide_contents=slide_contents, theme=theme)
+        result = {
+            'file_path': ppt_path,
+            'download_url': f"/api/download/{ppt_path}",
+            'render_seconds': time.perf_counter() - started
+        }
+        if record and presentation_store is not None:
+            result['presentation_id'] = presentation_store.save(topic, description, theme, slide_contents,
+                                                                ppt_path).id
+        return result
+    
+    if len(themes) == 1:
+        return {themes[0]: build(themes[0])}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(themes)))) as executor:
+        return dict(zip(themes, executor.map(bind_context(build), themes)))
+
+def generate_batch(items, mode=None, max_workers=BATCH_MAX_WORKERS):
+    """Generate one deck per spec in ``items`` (dicts with topic, description, theme and num_slides).
+    
+    Identical specs are generated once, themes for specs without one are
+    picked with a single batched model call, and decks are built in parallel.
+    Returns one result per item, in order, each with its own status so a
+    failing item doesn't affect the others.
+    """
+    results = [None] * len(items)
+    unique_specs = {}
+    
+    for index, item in enumerate(items):
+        topic = str(item.get('topic') or '').strip()
+        if not topic:
+            results[index] = {'index': index, 'topic': topic, 'status': 'failed', 'error': 'Topic is required'}
+            continue
+        spec = (
+            topic,
+            str(item.get('description') or '').strip(),
+            str(item.get('theme') or '').strip().lower()
+        )
+        num_slides = item.get('num_slides')
+        group = unique_specs.setdefault(_spec_key(spec) + (num_slides,),
+                                        {'spec': spec, 'num_slides': num_slides, 'indexes': []})
+        group['indexes'].append(index)
+    
+    # Pick themes for every spec without one in a single model call
+    groups = list(unique_specs.values())
+    unthemed = [group for group in groups if not group['spec'][2]]
+    if unthemed:
+        suggestions = suggest_themes_batch([group['spec'][0] for group in unthemed])
+        for group, theme_name in zip(unthemed, suggestions):
+            group['theme'] = theme_name
+    for group in groups:
+        group.setdefault('theme', group['spec'][2])
+    
+    def build(group):
+        topic, description, _ = group['spec']
+        timings = {}
+        try:
+            result = generate_deck(topic, description, group['theme'], timings=timings, mode=mode,
+                                   num_slides=group['num_slides'])
+            return {'status': 'completed', 'theme': group['theme'], 'timings': timings, **result}
+        except Exception as e:
+            log(f"Error generating batch item '{topic}': {e}")
+            return {'status': 'failed', 'theme': group['theme'], 'error': str(e)}
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups) or 1))) as executor:
+        outcomes = list(executor.map(bind_context(build), groups))
+    
+    for group, outcome in zip(groups, outcomes):
+        first = group['indexes'][0]
+        for index in group['indexes']:
+            result = {'index': index, 'topic': group['spec'][0], **outcome}
+            if index != first:
+                result['duplicate_of'] = first
+            results[index] = result
+    
+    return results
+
+def _spec_key(spec):
+    """Normalize a (topic, description, theme) spec for duplicate detection."""
+    return tuple(' '.join(part.split()).casefold() for part in spec)
@@ -0,0 +1,154 @@
+# services/job_service.py
+import queue
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from utils.metrics import registry
+from utils.tracing import bind_context, log
+from config import JOB_WORKERS, JOB_QUEUE_MAX_DEPTH, JOB_RESULT_TTL
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at its depth limit."""
+
+
+class JobQueue:
+    """Bounded queue of background jobs processed by a fixed pool of worker threads."""
+
+    def __init__(self, worker_count=JOB_WORKERS, max_depth=JOB_QUEUE_MAX_DEPTH, result_ttl=JOB_RESULT_TTL):
+        self.worker_count = worker_count
+        self.max_depth = max_depth
+        self.result_ttl = result_ttl
+        self._queue = queue.Queue(maxsize=max_depth)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def submit(self, func, *args, **kwargs):
+        """Queue ``func(*args, timings=..., on_stage=..., **kwargs)`` and return the new job record.
+        
+        The job runs with the submitting request's id, so its logs and stage
+        timings stay attributable. Raises QueueFullError if the queue already
+        holds ``max_depth`` pending jobs.
+        """
+        self._start_workers()
+        self._prune_finished()
+        
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'status': 'queued',
+            'stage': None,
+            'created_at': datetime.now().isoformat(),
+            'timings': {},
+            'result': None,
+            'error': None,
+            '_enqueued': time.perf_counter(),
+            '_finished': None,
+        }
+        
+        with self._lock:
+            self._jobs[job_id] = job
+        try:
+            self._queue.put_nowait((job_id, bind_context(func), args, kwargs))
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job_id]
+            raise QueueFullError(f"Job queue is full ({self.max_depth} pending jobs)")
+        
+        return self.get(job_id)
+
+    def get(self, job_id):
+        """Return a snapshot of a job record, or None if the job is unknown or expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {key: value for key, value in job.items() if not key.startswith('_')}
+            snapshot['timings'] = dict(job['timings'])
+        return snapshot
+
+    def stats(self):
+        """Return queue depth and job counts by status."""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {
+            'workers': self.worker_count,
+            'queue_depth': self._queue.qsize(),
+            'max_depth': self.max_depth,
+            'jobs': counts
+        }
+
+    def _start_workers(self):
+        # Workers are started on first use so importing this module stays cheap
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.worker_count):
+                worker = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            job_id, func, args, kwargs = self._queue.get()
+            try:
+                self._run(job_id, func, args, kwargs)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id, func, args, kwargs):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job['status'] = 'running'
+            job['timings']['queued'] = time.perf_counter() - job['_enqueued']
+
+        def on_stage(stage):
+            with self._lock:
+                job['stage'] = stage
+        
+        started = time.perf_counter()
+        try:
+            result = func(*args, timings=job['timings'], on_stage=on_stage, **kwargs)
+            with self._lock:
+                job['status'] = 'completed'
+                job['result'] = result
+        except Exception as e:
+            log(f"Job {job_id} failed: {str(e)}")
+            log(traceback.format_exc())
+            with self._lock:
+                job['status'] = 'failed'
+                job['error'] = str(e)
+        finally:
+            with self._lock:
+                job['stage'] = None
+                job['timings']['total'] = time.perf_counter() - started
+                job['_finished'] = time.monotonic()
+
+    def _prune_finished(self):
+        cutoff = time.monotonic() - self.result_ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job['_finished'] is not None and job['_finished'] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+# Shared queue used by the API
+job_queue = JobQueue()
+
+
+@registry.register_collector
+def _collect_job_metrics():
+    stats = job_queue.stats()
+    return [
+        ('job_queue_depth', 'gauge', 'Generation jobs waiting for a worker.', [({}, stats['queue_depth'])]),
+        ('jobs', 'gauge', 'Retained generation jobs by status.',
+         [({'status': status}, count) for status, count in stats['jobs'].items()]),
+    ]
@@ -0,0 +1,106 @@
+# services/preview_service.py
+from html import escape
+from services.render_service import SUBTITLE
+from services.theme_service import THEMES, resolve_theme_name
+
+# Preview slides are the deck's size (720x540 points) in CSS pixels, so theme font sizes carry over
+PREVIEW_SLIDE_WIDTH = 720
+
+def _hex(color):
+    return '#%02x%02x%02x' % tuple(color)
+
+def _bullet_html(point):
+    """Return ``(level, html)`` for a bullet: a string, or a dict as described in utils.text_xml.bullet_parts."""
+    if not isinstance(point, dict):
+        return 0, escape(str(point))
+    try:
+        level = min(max(int(point.get('level') or 0), 0), 8)
+    except (TypeError, ValueError):
+        level = 0
+    runs = point.get('runs')
+    if not isinstance(runs, list) or not runs:
+        runs = [point]
+    parts = []
+    for run in runs:
+        if not isinstance(run, dict):
+            continue
+        text = escape(str(run.get('text', ''))).replace('\n', '<br>')
+        if run.get('bold'):
+            text = f'<strong>{text}</strong>'
+        if run.get('italic'):
+            text = f'<em>{text}</em>'
+        parts.append(text)
+    return level, ''.join(parts)
+
+def preview_spec(title, slides, theme=None):
+    """Return a JSON-ready preview of a deck: its theme's colors and fonts, and its slides.
+
+    Built from THEMES and the slide content only, so no PowerPoint file is
+    needed (python-pptx isn't imported).
+    """
+    theme_name = resolve_theme_name(theme) if theme else 'professional'
+    settings = THEMES[theme_name]
+    return {
+        'title': title,
+        'theme': {
+            'name': theme_name,
+            'background_color': _hex(settings['background_color']),
+            'title_color': _hex(settings['title_color']),
+            'content_color': _hex(settings['content_color']),
+            'accent_color': _hex(settings['accent_color']),
+            'title_font': settings['title_font'],
+            'content_font': settings['content_font'],
+            'title_font_size': settings['title_font_size'],
+            'content_font_size': settings['content_font_size']
+        },
+        'slides': [{'title': title, 'subtitle': SUBTITLE}] + [
+            {'title': slide.get('title', ''), 'content': slide.get('content', []),
+             'visual_note': slide.get('visual_note', '')}
+            for slide in slides
+        ]
+    }
+
+def render_preview_html(title, slides, theme=None):
+    """Render a standalone HTML page previewing a deck in its theme's colors and fonts."""
+    spec = preview_spec(title, slides, theme)
+    theme = spec['theme']
+
+    sections = []
+    for number, slide in enumerate(spec['slides']):
+        if number == 0:
+            body = f'<p class="subtitle">{escape(slide["subtitle"])}</p>'
+        else:
+            items = []
+            for point in slide['content']:
+                level, text = _bullet_html(point)
+                items.append(f'<li style="margin-left:{level * 1.5}em">{text}</li>')
+            body = f'<ul>{"".join(items)}</ul>'
+            if slide['visual_note']:
+                body += f'<p class="note">{escape(slide["visual_note"])}</p>'
+        kind = 'title-slide' if number == 0 else 'slide'
+        sections.append(f'<section class="{kind}"><h2>{escape(slide["title"])}</h2>{body}</section>')
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{escape(title)}</title>
+<style>
+body {{ margin: 0; padding: 24px; background: #e5e5e5; font-family: {escape(theme['content_font'])}, sans-serif; }}
+section {{ box-sizing: border-box; width: {PREVIEW_SLIDE_WIDTH}px; aspect-ratio: 4 / 3; margin: 0 auto 24px;
+  padding: 36px 48px; overflow: hidden; background: {theme['background_color']};
+  border-top: 6px solid {theme['accent_color']}; box-shadow: 0 1px 4px rgba(0, 0, 0, 0.3); }}
+h2 {{ margin: 0 0 24px; color: {theme['title_color']}; font-family: {escape(theme['title_font'])}, sans-serif;
+  font-size: {theme['title_font_size']}px; }}
+ul {{ margin: 0; padding-left: 1.2em; color: {theme['content_color']}; font-size: {theme['content_font_size']}px; }}
+li {{ margin-bottom: 0.4em; }}
+.title-slide {{ display: flex; flex-direction: column; justify-content: center; text-align: center; }}
+.subtitle {{ color: {theme['content_color']}; font-size: {theme['content_font_size']}px; }}
+.note {{ margin-top: 16px; color: {theme['accent_color']}; font-size: 12px; font-style: italic; }}
+</style>
+</head>
+<body>
+{''.join(sections)}
+</body>
+</html>
+"""
@@ -1,10 +1,21 @@
 # services/prompt_service.py (enhanced version)
-from utils.gemini_client import get_gemini_response
+from utils.gemini_client import get_gemini_response, stream_gemini_response
+from utils.json_stream import JSONArrayStream
+from utils.response_parser import parse_slide_response, extract_theme_field, validate_slides
+from utils.tracing import traced, bind_context, log
+from concurrent.futures import ThreadPoolExecutor
+from services.theme_service import THEMES
+from config import PARALLEL_SLIDE_WORKERS
+import itertools
 import json
 import re
 
-def generate_slide_prompts(topic, description, num_slides=None):
-    """Generate content for each slide based on the topic and description."""
+def build_slide_prompt(topic, description, num_slides=None, include_theme=False):
+    """Build the prompt asking Gemini for the slide-by-slide content.
+    
+    With ``include_theme`` the model is also asked to pick the presentation
+    theme, wrapping the slides in an object with ``theme`` and ``slides`` fields.
+    """
     # Set default number of slides if not specified
     if not num_slides:
         num_slides = "5-8"  # Default range
@@ -35,60 +46,289 @@ def generate_slide_prompts(topic, description, num_slides=None):
     Make this presentation informative, professional, and compelling.
     """
     
+    if include_theme:
+        system_prompt += """
+    Also choose the single best matching visual theme for this presentation from this list:
+    - professional (business, corporate, formal)
+    - creative (art, design, innovation)
+    - minimal (modern, simple, clean)
+    - vibrant (energetic, bold, marketing)
+    - academic (education, research, scholarly)
+    - tech (technology, digital, futuristic)
+    
+    Wrap your response in a JSON object with two properties:
+    - "theme": The name of the chosen theme
+    - "slides": The JSON array of slides described above
+    """
+    return system_prompt
+
+@traced('generate_slide_prompts')
+def generate_slide_prompts(topic, description, num_slides=None, use_cache=True):
+    """Generate content for each slide based on the topic and description.
+    
+    Without ``use_cache`` the model is asked again rather than the response
+    cache answering.
+    """
+    system_prompt = build_slide_prompt(topic, description, num_slides)
+    
     # Get response from Gemini
-    response = get_gemini_response(system_prompt)
+    response = get_gemini_response(system_prompt, use_cache=use_cache)
+    
+    return parse_slide_response(response)
+
+@traced('generate_slide_prompts')
+def generate_slide_prompts_and_theme(topic, description, num_slides=None, use_cache=True):
+    """Generate slide content and pick the theme in the same Gemini call.
+    
+    Returns ``(slides, theme_name)``; theme_name is None if the model didn't
+    name a valid theme. ``use_cache`` is as for generate_slide_prompts.
+    """
+    system_prompt = build_slide_prompt(topic, description, num_slides, include_theme=True)
+    
+    # Get response from Gemini
+    response = get_gemini_response(system_prompt, use_cache=use_cache)
+    
+    theme_name = extract_theme_field(response)
+    if theme_name not in THEMES:
+        theme_name = None
+    return parse_slide_response(response), theme_name
+
+def stream_slide_prompts(topic, description, num_slides=None):
+    """Generate slide content like generate_slide_prompts, yielding each slide as soon as
+    its JSON object has fully arrived from the model stream.
+    
+    Each slide is normalized like the full-response path (see
+    utils.response_parser.validate_slides) before it is yielded.
+    """
+    return _stream_slides(build_slide_prompt(topic, description, num_slides))
+
+def stream_slide_prompts_and_theme(topic, description, num_slides=None):
+    """Stream slide content like stream_slide_prompts, picking the theme in the same call.
+    
+    Returns ``(theme_name, slides)`` once the first slide has arrived, since
+    the model writes the ``theme`` field before the slides; ``slides`` yields
+    every slide, the first included. theme_name is None if the model didn't
+    name a valid theme by then.
+    """
+    received = []
+    slides = _stream_slides(build_slide_prompt(topic, description, num_slides, include_theme=True), received)
+    first = next(slides, None)
+    theme_name = extract_theme_field(''.join(received))
+    if theme_name not in THEMES:
+        theme_name = None
+    return theme_name, itertools.chain([first] if first is not None else [], slides)
+
+def _stream_slides(prompt, received=None):
+    """Yield the slides of a streamed response; ``received`` collects the raw text up to the first slide."""
+    parser = JSONArrayStream()
+    # Raw text is only kept until the first slide parses, for the fallback below
+    received = [] if received is None else received
+    
+    for chunk in stream_gemini_response(prompt):
+        if received is not None:
+            received.append(chunk)
+        for slide in validate_slides(parser.feed(chunk)):
+            received = None
+            yield slide
+    
+    # The model didn't answer with a JSON array; fall back to the full-response parser
+    if received is not None:
+        for slide in parse_slide_response(''.join(received)):
+            yield slide
+
+def build_outline_prompt(topic, description, num_slides=None):
+    """Build the short prompt asking Gemini for the slide titles only."""
+    if not num_slides:
+        num_slides = "5-8"  # Default range
+    
+    return f"""
+    You are a presentation creation assistant. Plan the outline of a professional,
+    well-structured presentation.
+    
+    Topic: {topic}
+    Description: {description}
+    
+    List approximately {num_slides} slide titles including an agenda/overview slide,
+    content slides and a conclusion slide with key takeaways. Do not include the title slide.
+    Each title should be concise and engaging (8 words or less).
+    
+    Format your response as a JSON array of strings, one slide title per element.
+    """
+
+def build_slide_body_prompt(topic, description, titles, index, instruction=None):
+    """Build the prompt asking Gemini for the content of a single slide in the outline.
+    
+    An ``instruction`` (e.g. from a user editing the slide) is passed on to the model.
+    """
+    outline = "\n".join(f"    {number}. {title}" for number, title in enumerate(titles, start=1))
+    
+    prompt = f"""
+    You are a presentation creation assistant writing one slide of a presentation.
+    
+    Topic: {topic}
+    Description: {description}
     
-    # Parse the JSON response
+    Full outline of the presentation:
+{outline}
+    
+    Write the content for slide {index + 1}: "{titles[index]}".
+    Stay focused on this slide's title and avoid repeating the other slides.
+    
+    Format your response as a JSON object with these properties:
+    - "content": Array of 3-5 bullet points as strings (each 1-2 sentences max)
+    - "visual_note": A string describing suggested visuals (chart type, image concept, etc.)
+    """
+    if instruction:
+        prompt += f"""
+    Follow this instruction for the slide: {instruction}
+    """
+    return prompt
+
+def build_document_summary_prompt(text):
+    """Build the prompt asking Gemini to summarize one chunk of an uploaded document."""
+    return f"""
+    You are a presentation creation assistant reading part of a source document that a
+    presentation will be based on.
+    
+    Summarize this part of the document in 5-10 concise bullet points. Keep the key facts,
+    figures, names, arguments and conclusions; leave out filler and repetition.
+    
+    Document text:
+    \"\"\"
+{text}
+    \"\"\"
+    
+    Respond with the bullet points only, one per line, each starting with "- ".
+    """
+
+def build_summary_merge_prompt(summaries):
+    """Build the prompt asking Gemini to merge summaries of consecutive parts of a document."""
+    parts = "\n\n".join(f"    Part {number}:\n{summary}" for number, summary in enumerate(summaries, start=1))
+    
+    return f"""
+    You are a presentation creation assistant. These are summaries of consecutive parts
+    of one source document.
+    
+{parts}
+    
+    Merge them into a single summary of 8-15 concise bullet points that keeps the most
+    important facts, figures, arguments and conclusions, in the document's order.
+    
+    Respond with the bullet points only, one per line, each starting with "- ".
+    """
+
+@traced('generate_slide_prompts')
+def generate_slide_prompts_parallel(topic, description, num_slides=None, max_workers=PARALLEL_SLIDE_WORKERS,
+                                    use_cache=True):
+    """Generate slide content in two phases: an outline call for the titles, then one
+    concurrent call per slide for its bullets and visual note.
+    
+    Slides are returned in outline order. Falls back to generate_slide_prompts if
+    the outline call fails or returns no titles, or if any slide's call fails
+    (after the client's retries), so a deck never has blank slides. ``use_cache``
+    is as for generate_slide_prompts.
+    """
+    try:
+        outline_response = get_gemini_response(build_outline_prompt(topic, description, num_slides),
+                                               use_cache=use_cache)
+        titles = _parse_outline(outline_response)
+        if not titles:
+            raise ValueError("Outline response contained no slide titles")
+    except Exception as e:
+        log(f"Outline generation failed, using single-call generation: {e}")
+        return generate_slide_prompts(topic, description, num_slides, use_cache=use_cache)
+    
+    def expand(index):
+        return _generate_slide_body(topic, description, titles, index, use_cache)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(titles)))) as executor:
+            return list(executor.map(bind_context(expand), range(len(titles))))
+    except Exception as e:
+        log(f"Slide generation failed, using single-call generation: {e}")
+        return generate_slide_prompts(topic, description, num_slides, use_cache=use_cache)
+
+def _parse_outline(response):
+    """Extract the list of slide titles from the outline response."""
+    start, end = response.find('['), response.rfind(']')
+    if start != -1 and end > start:
+        try:
+            items = json.loads(response[start:end + 1])
+            titles = [item.get('title', '') if isinstance(item, dict) else str(item) for item in items]
+            return [title.strip() for title in titles if title and title.strip()]
+        except json.JSONDecodeError:
+            pass
+    
+    # Fall back to one title per numbered or bulleted line
+    titles = []
+    for line in response.split('\n'):
+        line = line.strip()
+        if re.match(r'^(\d+[.)]|[-*])\s+', line):
+            titles.append(re.sub(r'^(\d+[.)]|[-*])\s+', '', line).strip('"').strip())
+    return titles
+
+@traced('generate_slide_prompts')
+def generate_single_slide(topic, description, titles, index, instruction=None):
+    """Generate one slide of an existing deck, sending the model only the deck's titles
+    and the slide's own title. Errors from the model are raised.
+    
+    The response cache is skipped, so asking again gives a new version of the slide.
+    """
+    response = get_gemini_response(build_slide_body_prompt(topic, description, titles, index, instruction),
+                                   use_cache=False)
+    return _parse_slide_body(response, titles[index])
+
+def _generate_slide_body(topic, description, titles, index, use_cache=True):
+    """Generate the bullets and visual note for one slide of the outline. Errors from the model are raised."""
+    response = get_gemini_response(build_slide_body_prompt(topic, description, titles, index),
+                                   use_cache=use_cache)
+    return _parse_slide_body(response, titles[index])
+
+def _parse_slide_body(response, title):
+    """Build a slide from a single-slide response: a JSON object, or bullet lines as a fallback."""
+    slide = {'title': title, 'content': [], 'visual_note': ''}
+    start, end = response.find('{'), response.rfind('}')
+    if start != -1 and end > start:
+        try:
+            body = json.loads(response[start:end + 1])
+            slide['content'] = [str(point) for point in body.get('content', [])]
+            slide['visual_note'] = str(body.get('visual_note', '') or '')
+            return slide
+        except (json.JSONDecodeError, AttributeError):
+            pass
+    
+    # Fall back to bullet lines
+    for line in response.split('\n'):
+        line = line.strip()
+        if line.startswith('- ') or line.startswith('* '):
+            slide['content'].append(line[2:])
+    return slide
+
+def build_adapt_prompt(topic, description, slides):
+    """Build the prompt asking Gemini to rework slides written for a closely related request."""
+    return f"""
+    You are a presentation creation assistant. This presentation was written for a closely
+    related request:
+    
+    {json.dumps(slides, ensure_ascii=False)}
+    
+    Adapt it to this request, keeping the slide count and structure, and changing titles,
+    bullet points and visual notes only where the new topic or description calls for it:
+    
+    Topic: {topic}
+    Description: {description}
+    
+    Respond with the adapted presentation as a JSON array in the same format, where each
+    object has "title", "content" (array of bullet points) and "visual_note".
+    """
+
+@traced('generate_slide_prompts')
+def adapt_slide_prompts(topic, description, slides):
+    """Adapt cached slide content to a near-duplicate request in one model call.
+    The cached slides are returned unchanged if the model gives no usable answer."""
     try:
-        # Try to extract JSON if it's wrapped in code blocks or other text
-        json_match = re.search(r'```json\s*([\s\S]*?)\s*```|```\s*([\s\S]*?)\s*```|\{\s*"[\s\S]*?\s*\}\]', response)
-        if json_match:
-            json_str = json_match.group(1) or json_match.group(2) or json_match.group(0)
-            slides_data = json.loads(json_str)
-            return slides_data
-        
-        # If no code blocks, try to parse the whole response
-        slides_data = json.loads(response)
-        return slides_data
-    except json.JSONDecodeError:
-        # Manual extraction as fallback
-        slides = []
-        current_slide = None
-        
-        lines = response.split('\n')
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines
-            if not line:
-                continue
-            
-            # Check for slide title
-            if (line.startswith('# ') or line.startswith('## ') or 
-                line.startswith('Slide ') or re.match(r'^\d+\.', line)):
-                
-                # Save the previous slide if it exists
-                if current_slide and 'title' in current_slide:
-                    slides.append(current_slide)
-                
-                # Extract title
-                title = re.sub(r'^# |^## |^Slide \d+: |\d+\.\s*', '', line)
-                current_slide = {'title': title, 'content': [], 'visual_note': ''}
-            
-            # Check for bullet points
-            elif line.startswith('- ') or line.startswith('* ') or re.match(r'^\d+\)', line):
-                if current_slide:
-                    content = re.sub(r'^- |^\* |^\d+\)\s*', '', line)
-                    current_slide['content'].append(content)
-            
-            # Check for visual notes
-            elif line.lower().startswith('visual') or 'image:' in line.lower():
-                if current_slide:
-                    visual = re.sub(r'^visual:?|^visual note:?', '', line, flags=re.IGNORECASE).strip()
-                    current_slide['visual_note'] = visual
-        
-        # Add the last slide
-        if current_slide and 'title' in current_slide:
-            slides.append(current_slide)
-        
-        return slides
\ No newline at end of file
+        adapted = parse_slide_response(get_gemini_response(build_adapt_prompt(topic, description, slides)))
+    except Exception as e:
+        log(f"Error adapting cached slides: {e}")
+        return slides
+    return adapted or slides
@@ -0,0 +1,276 @@
+# services/render_service.py
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from utils.metrics import registry
+from utils.text_fit import fits, fit_font_size, paginate
+from utils.tracing import traced, log
+from config import (RENDER_BACKEND, RENDER_WORKERS, RENDER_TIMEOUT, RENDER_MAX_TASKS_PER_CHILD, TEXT_FIT_ENABLED,
+                    TEXT_FIT_MIN_FONT_SIZE)
+
+SUBTITLE = "Created with Smart Presentation Generator"
+
+def new_generator(theme_settings):
+    """Return a PPTGenerator on the themed template."""
+    # python-pptx is imported on first use so the API process starts without it
+    from utils.ppt_generator import PPTGenerator
+    return PPTGenerator(theme_settings=theme_settings)
+
+def choose_layout(title):
+    """Return the layout for a content slide from its title."""
+    title = title.lower()
+    
+    # Check if this is likely an agenda/overview slide
+    if any(keyword in title for keyword in ['agenda', 'overview', 'outline', 'contents']):
+        # Use section header for agenda
+        return 2  # Section header layout
+    
+    # Title and content layout for everything else, conclusions included
+    return 1
+
+def plan_slide(slide_data, theme_settings):
+    """Return the slides one slide of content is laid out as, as ``(title, content, layout_type, font_size)``.
+    
+    Bullets are measured against the layout's text placeholder with the
+    theme's content font. If they don't fit at the theme's size, the largest
+    size down to TEXT_FIT_MIN_FONT_SIZE that fits is used; content that
+    doesn't fit even then is split across "(cont.)" slides. An agenda too long
+    for the section header layout moves to the title and content layout
+    first. ``font_size`` is None where the theme's size fits.
+    """
+    title = slide_data.get('title', '')
+    content = slide_data.get('content', [])
+    layout_type = choose_layout(title)
+    if not TEXT_FIT_ENABLED or not content or not theme_settings:
+        return [(title, content, layout_type, None)]
+    
+    # python-pptx is imported on first use, as in new_generator
+    from utils.template_cache import layout_text_box
+    from utils.text_xml import bullet_parts
+    font, size = theme_settings['content_font'], theme_settings['content_font_size']
+    paragraphs = []
+    for point in content:
+        level, runs = bullet_parts(point)
+        paragraphs.append((level, ''.join(text for text, _, _ in runs).replace('\v', '\n'),
+                           any(bold for _, bold, _ in runs)))
+    box = layout_text_box(layout_type)
+    if box is None:
+        return [(title, content, layout_type, None)]
+    if layout_type != 1 and not fits(paragraphs, font, size, box):
+        layout_type, box = 1, layout_text_box(1)
+    
+    font_size = fit_font_size(paragraphs, font, size, TEXT_FIT_MIN_FONT_SIZE, box)
+    if font_size is not None:
+        return [(title, content, layout_type, None if font_size == size else font_size)]
+    
+    # Split over as few slides as the smallest size allows, then set them all at the
+    # largest size every one of them fits at
+    pages = paginate(paragraphs, font, TEXT_FIT_MIN_FONT_SIZE, box)
+    font_size = min(fit_font_size([paragraphs[index] for index in page], font, size, TEXT_FIT_MIN_FONT_SIZE, box)
+                    or TEXT_FIT_MIN_FONT_SIZE for page in pages)
+    planned = []
+    for number, page in enumerate(pages):
+        planned.append((title if number == 0 else f"{title} (cont.)", [content[index] for index in page],
+                        layout_type, None if font_size == size else font_size))
+    return planned
+
+def add_slide(ppt_gen, slide_data, theme_settings):
+    """Add one slide of content, as several slides if its bullets don't fit on one; return how many."""
+    planned = plan_slide(slide_data, theme_settings)
+    for title, content, layout_type, font_size in planned:
+        ppt_gen.add_content_slide(title, content, layout_type, theme_settings, font_size=font_size)
+    return len(planned)
+
+def build_presentation(topic, slide_contents, theme_settings):
+    """Build the deck (title slide, then one slide per entry) and return its PPTGenerator."""
+    ppt_gen = new_generator(theme_settings)
+    ppt_gen.add_title_slide(topic, SUBTITLE, theme_settings)
+    for slide_data in slide_contents:
+        add_slide(ppt_gen, slide_data, theme_settings)
+    return ppt_gen
+
+def render_presentation(topic, slide_contents, theme_settings, file_path=None):
+    """Build a deck and return its .pptx bytes, or save it to ``file_path`` and return the path.
+    
+    This is the unit of work shipped to render worker processes, so it only
+    takes picklable arguments and never calls the model.
+    """
+    ppt_gen = build_presentation(topic, slide_contents, theme_settings)
+    if file_path:
+        return ppt_gen.save(file_path)
+    return ppt_gen.to_bytes()
+
+@traced('render_slides')
+def render_slide_parts(slide_contents, theme_settings):
+    """Render content slides on their own and return, per slide of content, its rendered slides'
+    ``(slide_xml, rels_xml)`` (more than one if it was split, see plan_slide).
+    
+    The parts point at the themed template's layouts by name, so they can be
+    placed in any deck rendered from the same theme.
+    """
+    ppt_gen = new_generator(theme_settings)
+    counts = [add_slide(ppt_gen, slide_data, theme_settings) for slide_data in slide_contents]
+    parts = iter([(slide.part.blob, slide.part.rels.xml) for slide in ppt_gen.prs.slides])
+    return [[next(parts) for _ in range(count)] for count in counts]
+
+class InlineRenderer:
+    """Renders decks on the calling thread."""
+    
+    name = 'inline'
+    
+    def render(self, topic, slide_contents, theme_settings, file_path=None):
+        return render_presentation(topic, slide_contents, theme_settings, file_path)
+    
+    def start(self):
+        pass
+    
+    def stats(self):
+        return {'backend': self.name}
+
+class ProcessRenderer:
+    """Renders decks in a pool of warm worker processes, off the request threads' GIL.
+    
+    Workers import python-pptx and fill their template pools when they start.
+    Each render waits at most ``timeout`` seconds; workers are replaced after
+    ``max_tasks_per_child`` renders (Python 3.11+) to bound memory growth. If
+    the pool breaks (e.g. a worker is killed), it is recreated and the deck is
+    rendered inline.
+    
+    A render that times out while running can't be cancelled, so its worker
+    would stay busy; the pool is recycled instead: its workers are terminated
+    and a new pool is started on the next render. Other renders that were
+    running on the old pool see it break and are rendered inline.
+    """
+    
+    name = 'process'
+    
+    def __init__(self, workers=RENDER_WORKERS, timeout=RENDER_TIMEOUT, max_tasks_per_child=RENDER_MAX_TASKS_PER_CHILD):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._recycled = 0
+    
+    def start(self):
+        """Start the pool (if needed) and have every worker load its templates."""
+        executor = self._get_executor()
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result(timeout=self.timeout)
+    
+    def render(self, topic, slide_contents, theme_settings, file_path=None):
+        executor = self._get_executor()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = executor.submit(render_presentation, topic, slide_contents, theme_settings, file_path)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                with self._lock:
+                    self._timeouts += 1
+                if not future.cancel():
+                    self._recycle(executor)
+                raise TimeoutError(f"Rendering took longer than {self.timeout:.0f}s")
+            with self._lock:
+                self._completed += 1
+            return result
+        except BrokenProcessPool as e:
+            log(f"Render pool broke ({e}); restarting it and rendering inline")
+            with self._lock:
+                self._failed += 1
+            self._restart(executor)
+            return render_presentation(topic, slide_contents, theme_settings, file_path)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.name,
+                'workers': self.workers,
+                'started': self._executor is not None and self._pid == os.getpid(),
+                'in_flight': self._in_flight,
+                'completed': self._completed,
+                'broken_pool_fallbacks': self._failed,
+                'timeouts': self._timeouts,
+                'pools_recycled': self._recycled
+            }
+    
+    def _get_executor(self):
+        with self._lock:
+            # A pool created before fork (e.g. by a preloading server) belongs to the parent
+            if self._executor is None or self._pid != os.getpid():
+                kwargs = {}
+                if sys.version_info >= (3, 11) and self.max_tasks_per_child:
+                    kwargs['max_tasks_per_child'] = self.max_tasks_per_child
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    **kwargs
+                )
+                self._pid = os.getpid()
+            return self._executor
+    
+    def _restart(self, broken_executor):
+        with self._lock:
+            if self._executor is broken_executor:
+                self._executor = None
+        broken_executor.shutdown(wait=False)
+    
+    def _recycle(self, executor):
+        """Terminate a pool's workers, so a runaway render doesn't keep one busy."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self._recycled += 1
+        log("Render timed out; terminating the render pool's workers")
+        # ProcessPoolExecutor has no public way to stop running work
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+def _init_worker():
+    from services.warmup_service import preload
+    preload()
+
+def _ping():
+    return os.getpid()
+
+def create_renderer(backend=RENDER_BACKEND):
+    """Return the renderer for a backend name: 'inline' or 'process'."""
+    if backend == 'process':
+        return ProcessRenderer()
+    return InlineRenderer()
+
+# Shared renderer used by slide_service
+renderer = create_renderer()
+
+@traced('render')
+def render(topic, slide_contents, theme_settings, file_path=None):
+    """Render a deck with the configured backend; see render_presentation."""
+    return renderer.render(topic, slide_contents, theme_settings, file_path)
+
+@registry.register_collector
+def _collect_render_metrics():
+    stats = renderer.stats()
+    return [
+        ('render_in_flight', 'gauge', 'Decks currently being rendered.',
+         [({'backend': stats['backend']}, stats.get('in_flight', 0))]),
+        ('render_timeouts_total', 'counter', 'Renders that took longer than the render timeout.',
+         [({'backend': stats['backend']}, stats.get('timeouts', 0))]),
+        ('render_pool_recycles_total', 'counter', 'Render pools terminated after a timed-out render.',
+         [({'backend': stats['backend']}, stats.get('pools_recycled', 0))]),
+    ]
@@ -1,57 +1,99 @@
 # services/slide_service.py (enhanced version)
-from utils.ppt_generator import PPTGenerator
 from services.theme_service import get_theme_settings
+from services.render_service import render, new_generator, add_slide, SUBTITLE
+from utils.artifact_store import artifact_store
+from utils.metrics import presentation_bytes
+from utils.tracing import traced
+from config import ARTIFACT_STORAGE
 import os
 import uuid
 import re
 
+@traced('create_presentation')
 def create_presentation(topic, slide_contents, theme=None):
     """Create a PowerPoint presentation based on provided content and theme."""
     # Get theme settings
     theme_settings = get_theme_settings(theme, topic)
     
-    # Initialize PPT generator
-    ppt_gen = PPTGenerator()
+    # Build and save the deck with the configured render backend
+    file_name = _presentation_file_name(topic)
+    if ARTIFACT_STORAGE == 'memory':
+        data = render(topic, slide_contents, theme_settings)
+        artifact_store.put(file_name, data)
+        presentation_bytes.inc(len(data))
+    else:
+        file_path = render(topic, slide_contents, theme_settings,
+                           file_path=os.path.join('static', 'presentations', file_name))
+        presentation_bytes.inc(os.path.getsize(file_path))
+    return file_name
+
+def create_presentation_streaming(topic, slide_iter, theme=None):
+    """Build a presentation from slides as they arrive, yielding progress events.
     
-    # Add title slide
-    subtitle = "Created with Smart Presentation Generator"
-    ppt_gen.add_title_slide(topic, subtitle, theme_settings)
+    Yields ``('slide', index, slide_data)`` after each slide is added and
+    finally ``('done', file_name, slide_count)`` once the deck is saved.
+    """
+    theme_settings = get_theme_settings(theme, topic)
     
-    # Process each slide
-    for slide_data in slide_contents:
-        title = slide_data.get('title', '')
-        content = slide_data.get('content', [])
-        
-        # Check if this is likely an agenda/overview slide
-        is_agenda = any(keyword in title.lower() for keyword in ['agenda', 'overview', 'outline', 'contents'])
-        
-        # Check if this is likely a conclusion/summary slide
-        is_conclusion = any(keyword in title.lower() for keyword in ['conclusion', 'summary', 'key takeaway', 'thank you'])
-        
-        # Choose appropriate layout based on content
-        if is_agenda:
-            # Use section header for agenda
-            layout_type = 2  # Section header layout
-        elif is_conclusion:
-            # Use title and content for conclusion
-            layout_type = 1  # Title and content layout
-        elif len(content) > 6:
-            # Content-heavy slide
-            layout_type = 1  # Title and content layout
-        else:
-            # Standard content slide
-            layout_type = 1  # Title and content layout
-        
-        # Add the slide
-        ppt_gen.add_content_slide(title, content, layout_type, theme_settings)
+    ppt_gen = new_generator(theme_settings)
+    ppt_gen.add_title_slide(topic, SUBTITLE, theme_settings)
     
-    # Create unique filename
-    unique_id = str(uuid.uuid4())[:8]
-    safe_topic = re.sub(r'[^\w\s-]', '', topic).strip().replace(' ', '_')
-    file_name = f"{safe_topic}_{unique_id}.pptx"
-    file_path = os.path.join('static', 'presentations', file_name)
+    count = 0
+    for slide_data in slide_iter:
+        add_slide(ppt_gen, slide_data, theme_settings)
+        count += 1
+        yield ('slide', count, slide_data)
+    
+    file_name = _save_presentation(ppt_gen, topic)
     
-    # Save the presentation
-    ppt_gen.save(file_path)
+    yield ('done', file_name, count)
+
+def load_presentation_bytes(file_name):
+    """Return the .pptx bytes of a generated deck, or None if it no longer exists."""
+    artifact = artifact_store.get(file_name)
+    if artifact is not None:
+        return artifact[0]
     
-    return file_name
\ No newline at end of file
+    file_path = os.path.join('static', 'presentations', os.path.basename(file_name))
+    if os.path.exists(file_path):
+        with open(file_path, 'rb') as f:
+            return f.read()
+    return None
+
+def presentation_available(file_name):
+    """Return True if a generated deck can still be downloaded."""
+    if not file_name:
+        return False
+    return (file_name in artifact_store
+            or os.path.exists(os.path.join('static', 'presentations', os.path.basename(file_name))))
+
+def _save_presentation(ppt_gen, topic):
+    """Save the deck to the artifact store or static/presentations and return its file name."""
+    file_name = _presentation_file_name(topic)
+    if ARTIFACT_STORAGE == 'memory':
+        data = ppt_gen.to_bytes()
+        artifact_store.put(file_name, data)
+        presentation_bytes.inc(len(data))
+    else:
+        file_path = ppt_gen.save(os.path.join('static', 'presentations', file_name))
+        presentation_bytes.inc(os.path.getsize(file_path))
+    return file_name
+
+def save_presentation_bytes(topic, data):
+    """Store already built .pptx bytes like a generated deck and return the new file name."""
+    file_name = _presentation_file_name(topic)
+    if ARTIFACT_STORAGE == 'memory':
+        artifact_store.put(file_name, data)
+    else:
+        file_path = os.path.join('static', 'presentations', file_name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as f:
+            f.write(data)
+    presentation_bytes.inc(len(data))
+    return file_name
+
+def _presentation_file_name(topic):
+    """Create a unique file name for a presentation about the topic."""
+    unique_id = str(uuid.uuid4())[:8]
+    safe_topic = re.sub(r'[^\w\s-]', '', topic).strip().replace(' ', '_')
+    return f"{safe_topic}_{unique_id}.pptx"
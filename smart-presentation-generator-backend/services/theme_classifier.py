@@ -0,0 +1,130 @@
+# services/theme_classifier.py
+import math
+import re
+from functools import lru_cache
+
+# Keywords that point to each theme, matched against stemmed topic words
+THEME_LEXICONS = {
+    "professional": [
+        "business", "corporate", "formal", "finance", "financial", "sales", "revenue", "strategy",
+        "management", "leadership", "quarterly", "report", "budget", "investment", "investor",
+        "stakeholder", "compliance", "enterprise", "company", "client", "consulting", "market share",
+        "operations", "accounting", "profit", "proposal", "onboarding", "policy", "hr", "kpi",
+        "pitch", "board", "annual", "negotiation", "project management", "supply chain", "bank",
+        "insurance", "economics", "economy", "trade", "startup", "entrepreneurship", "retail",
+    ],
+    "creative": [
+        "art", "artist", "design", "designer", "creative", "creativity", "innovation", "music",
+        "painting", "drawing", "photography", "film", "cinema", "fashion", "architecture",
+        "storytelling", "poetry", "literature", "craft", "illustration", "animation", "theater",
+        "theatre", "dance", "sculpture", "gallery", "museum", "branding", "culture", "travel",
+        "tourism", "food", "cooking", "recipe", "nature", "scenery", "landscape",
+        "wedding", "hobby", "game design", "writing", "novel",
+    ],
+    "minimal": [
+        "minimal", "minimalism", "minimalist", "simple", "simplicity", "clean", "modern",
+        "essentials", "basics", "summary", "overview", "productivity", "mindfulness", "meditation",
+        "habits", "decluttering", "focus", "wellness", "lifestyle", "time management", "zen",
+        "calm", "balance", "organization", "checklist", "quick", "brief",
+    ],
+    "vibrant": [
+        "marketing", "campaign", "social media", "advertising", "brand awareness", "energetic",
+        "bold", "launch", "promotion", "event", "party", "sports", "fitness", "football",
+        "cricket", "basketball", "youth", "influencer", "viral", "motivation", "motivational",
+        "celebration", "festival", "concert", "entertainment", "fun", "kids", "summer", "color", "colour",
+        "growth hacking", "engagement", "rally", "competition", "hackathon", "esports",
+    ],
+    "academic": [
+        "education", "research", "scholarly", "study", "studies", "thesis", "dissertation",
+        "history", "historical", "science", "scientific", "biology", "chemistry", "physics",
+        "mathematics", "math", "geography", "philosophy", "psychology", "sociology", "literature review",
+        "lecture", "course", "curriculum", "university", "school", "student", "teaching", "learning outcomes",
+        "experiment", "hypothesis", "theory", "analysis", "climate", "environment", "ecology",
+        "medicine", "medical", "anatomy", "law", "civilization", "ancient", "war", "revolution",
+        "evolution", "genetics", "astronomy", "language", "linguistics", "political",
+    ],
+    "tech": [
+        "technology", "tech", "digital", "futuristic", "software", "hardware", "computer", "computing",
+        "ai", "artificial intelligence", "machine learning", "deep learning", "neural", "data",
+        "data science", "cloud", "cybersecurity", "security", "blockchain", "crypto", "cryptocurrency",
+        "programming", "coding", "developer", "python", "javascript", "api", "devops", "kubernetes",
+        "internet", "iot", "robotics", "robot", "automation", "quantum", "algorithm", "network",
+        "5g", "app", "mobile", "web", "database", "saas", "semiconductor", "chip", "virtual reality",
+        "augmented reality", "metaverse", "space", "rocket", "electric vehicle", "gadget",
+    ],
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SUFFIXES = ("ations", "ation", "ings", "ing", "ies", "ers", "er", "es", "s")
+
+
+def _stem(word):
+    """Very light suffix stripping so 'designs', 'designing' and 'design' match."""
+    for suffix in _SUFFIXES:
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def _terms(text):
+    """Return the stemmed unigrams and bigrams of a text."""
+    words = [_stem(word) for word in _WORD.findall(text.lower())]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def _build_weights(lexicons):
+    """Build per-theme term weights, scaled by how few themes share a term (IDF)."""
+    theme_terms = {
+        theme: {' '.join(_stem(word) for word in _WORD.findall(keyword)) for keyword in keywords}
+        for theme, keywords in lexicons.items()
+    }
+    document_frequency = {}
+    for terms in theme_terms.values():
+        for term in terms:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+
+    theme_count = len(lexicons)
+    weights = {}
+    for theme, terms in theme_terms.items():
+        for term in terms:
+            # Multi-word terms are more specific than single words
+            specificity = 1.5 if ' ' in term else 1.0
+            idf = math.log(theme_count / document_frequency[term]) + 1.0
+            weights.setdefault(term, {})[theme] = idf * specificity
+    return weights
+
+
+# Built once at import
+_TERM_WEIGHTS = _build_weights(THEME_LEXICONS)
+
+
+def score_themes(text):
+    """Return the score of every theme for a text."""
+    scores = dict.fromkeys(THEME_LEXICONS, 0.0)
+    for term in _terms(text):
+        for theme, weight in _TERM_WEIGHTS.get(term, {}).items():
+            scores[theme] += weight
+    return scores
+
+
+@lru_cache(maxsize=4096)
+def _classify_normalized(text):
+    scores = score_themes(text)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (best, best_score), (_, runner_up_score) = ranked[0], ranked[1]
+    if best_score <= 0:
+        return None, 0.0
+    # Margin over the runner-up, damped for topics with very little evidence
+    confidence = (best_score - runner_up_score) / best_score * min(1.0, best_score / 2.0)
+    return best, confidence
+
+
+def classify_theme(topic, description=''):
+    """Classify a topic into a theme name offline.
+
+    Returns ``(theme_name, confidence)`` with confidence in [0, 1], or
+    ``(None, 0.0)`` when no theme keyword matches. Results are memoized per
+    normalized text.
+    """
+    text = ' '.join(f"{topic} {description or ''}".lower().split())
+    return _classify_normalized(text)
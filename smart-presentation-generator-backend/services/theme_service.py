@@ -1,7 +1,15 @@
 # services/theme_service.py (enhanced version)
 from utils.gemini_client import get_gemini_response
+from services.theme_classifier import classify_theme
+from utils.single_flight import SingleFlight, CoalesceTimeoutError
+from utils.tracing import traced, log
+from config import (THEME_CLASSIFIER_MIN_CONFIDENCE, TOPIC_THEME_CACHE_TTL, TOPIC_THEME_CACHE_MAX_ENTRIES,
+                    COALESCE_ENABLED, COALESCE_TIMEOUT)
+from collections import OrderedDict
 import json
 import re
+import threading
+import time
 
 # Comprehensive theme definitions
 THEMES = {
@@ -73,6 +81,41 @@ THEMES = {
     }
 }
 
+# Short-lived memory of the theme picked per normalized topic, shared by
+# /api/suggest-theme and /api/generate so a deck needs only one theme decision
+_topic_themes = OrderedDict()
+_topic_themes_lock = threading.Lock()
+_theme_flight = SingleFlight('suggest_theme', timeout=COALESCE_TIMEOUT)
+
+def _normalize_topic(topic):
+    return ' '.join(topic.lower().split())
+
+def remember_topic_theme(topic, theme_name):
+    """Remember the theme chosen for a topic for TOPIC_THEME_CACHE_TTL seconds."""
+    if not topic or theme_name not in THEMES:
+        return
+    with _topic_themes_lock:
+        key = _normalize_topic(topic)
+        _topic_themes[key] = (theme_name, time.monotonic() + TOPIC_THEME_CACHE_TTL)
+        _topic_themes.move_to_end(key)
+        while len(_topic_themes) > TOPIC_THEME_CACHE_MAX_ENTRIES:
+            _topic_themes.popitem(last=False)
+
+def recall_topic_theme(topic):
+    """Return the theme recently chosen for a topic, or None."""
+    if not topic:
+        return None
+    with _topic_themes_lock:
+        key = _normalize_topic(topic)
+        entry = _topic_themes.get(key)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del _topic_themes[key]
+            return None
+        return entry[0]
+
+@traced('get_theme_settings')
 def get_theme_settings(theme_preference=None, topic=None):
     """
     Get theme settings based on preference and topic.
@@ -84,30 +127,9 @@ def get_theme_settings(theme_preference=None, topic=None):
     
     # If no valid theme is specified but we have a topic
     if topic and not theme_preference:
-        # Ask Gemini to suggest the best theme based on the topic
-        prompt = f"""
-        I need to choose a presentation theme for a topic: "{topic}".
-        Choose the single best matching theme from this list based on the topic:
-        - professional (business, corporate, formal)
-        - creative (art, design, innovation)
-        - minimal (modern, simple, clean)
-        - vibrant (energetic, bold, marketing)
-        - academic (education, research, scholarly)
-        - tech (technology, digital, futuristic)
-        
-        Reply with just one word: the name of the best matching theme.
-        """
-        
-        try:
-            response = get_gemini_response(prompt).strip().lower()
-            # Extract theme name if it's embedded in text
-            theme_match = re.search(r'(professional|creative|minimal|vibrant|academic|tech)', response)
-            if theme_match:
-                suggested_theme = theme_match.group(1)
-                if suggested_theme in THEMES:
-                    return THEMES[suggested_theme]
-        except Exception as e:
-            print(f"Error getting theme suggestion: {e}")
+        suggested_theme = suggest_theme_name(topic)
+        if suggested_theme:
+            return THEMES[suggested_theme]
     
     # If theme preference is specified but invalid, or if suggestion fails
     if theme_preference:
@@ -129,6 +151,120 @@ def get_theme_settings(theme_preference=None, topic=None):
     # Default to professional if all else fails
     return THEMES["professional"]
 
+def resolve_theme_name(theme_preference=None, topic=None):
+    """Return the name of the theme get_theme_settings picks for a preference and topic."""
+    theme_settings = get_theme_settings(theme_preference, topic)
+    return next(name for name, settings in THEMES.items() if settings is theme_settings)
+
+@traced('suggest_theme')
+def suggest_theme_name(topic, use_model=True):
+    """
+    Suggest the name of the best theme for a topic.
+    A theme recently chosen for the same topic is reused; otherwise the local
+    classifier answers when it is confident, and Gemini is asked if not (unless
+    ``use_model`` is False). Returns None if no suggestion could be made.
+    """
+    theme_name = recall_topic_theme(topic)
+    if theme_name:
+        return theme_name
+    
+    theme_name, confidence = classify_theme(topic)
+    if theme_name and confidence >= THEME_CLASSIFIER_MIN_CONFIDENCE:
+        remember_topic_theme(topic, theme_name)
+        return theme_name
+    if not use_model:
+        return None
+    
+    # Identical topics asked about at the same time share one model call
+    if not COALESCE_ENABLED:
+        return _suggest_theme_with_model(topic, theme_name)
+    try:
+        return _theme_flight.do(_normalize_topic(topic), _suggest_theme_with_model, topic, theme_name)[0]
+    except CoalesceTimeoutError as e:
+        log(f"Error getting theme suggestion: {e}")
+        return theme_name
+
+def _suggest_theme_with_model(topic, fallback=None):
+    """Ask Gemini for the theme of a topic; return ``fallback`` if it gives no valid answer."""
+    # Ask Gemini to suggest the best theme based on the topic
+    prompt = f"""
+        I need to choose a presentation theme for a topic: "{topic}".
+        Choose the single best matching theme from this list based on the topic:
+        - professional (business, corporate, formal)
+        - creative (art, design, innovation)
+        - minimal (modern, simple, clean)
+        - vibrant (energetic, bold, marketing)
+        - academic (education, research, scholarly)
+        - tech (technology, digital, futuristic)
+        
+        Reply with just one word: the name of the best matching theme.
+        """
+    
+    try:
+        response = get_gemini_response(prompt).strip().lower()
+        # Extract theme name if it's embedded in text
+        theme_match = re.search(r'(professional|creative|minimal|vibrant|academic|tech)', response)
+        if theme_match and theme_match.group(1) in THEMES:
+            remember_topic_theme(topic, theme_match.group(1))
+            return theme_match.group(1)
+    except Exception as e:
+        log(f"Error getting theme suggestion: {e}")
+    
+    # Fall back to the classifier's low-confidence guess
+    return fallback
+
+@traced('suggest_theme')
+def suggest_themes_batch(topics):
+    """Suggest a theme name for each topic using a single Gemini call.
+    
+    Topics the local classifier is confident about don't go to the model.
+    Returns a list of theme names in the same order as ``topics``; topics
+    without a usable answer get "professional".
+    """
+    suggestions = ["professional"] * len(topics)
+    pending = []
+    for index, topic in enumerate(topics):
+        theme_name, confidence = classify_theme(topic)
+        if theme_name and confidence >= THEME_CLASSIFIER_MIN_CONFIDENCE:
+            suggestions[index] = theme_name
+        else:
+            pending.append(index)
+            if theme_name:
+                suggestions[index] = theme_name
+    if not pending:
+        return suggestions
+    
+    numbered_topics = "\n".join(f"        {number}. {topics[index]}" for number, index in enumerate(pending, start=1))
+    prompt = f"""
+        I need to choose a presentation theme for each of these topics:
+{numbered_topics}
+        
+        For each topic, choose the single best matching theme from this list:
+        - professional (business, corporate, formal)
+        - creative (art, design, innovation)
+        - minimal (modern, simple, clean)
+        - vibrant (energetic, bold, marketing)
+        - academic (education, research, scholarly)
+        - tech (technology, digital, futuristic)
+        
+        Reply with a JSON array of theme names, one per topic, in the same order.
+        """
+    
+    try:
+        response = get_gemini_response(prompt).lower()
+        start, end = response.find('['), response.rfind(']')
+        if start != -1 and end > start:
+            names = json.loads(response[start:end + 1])
+        else:
+            names = re.findall(r'(professional|creative|minimal|vibrant|academic|tech)', response)
+        for index, name in zip(pending, names):
+            if isinstance(name, str) and name.strip() in THEMES:
+                suggestions[index] = name.strip()
+    except Exception as e:
+        log(f"Error getting batch theme suggestions: {e}")
+    
+    return suggestions
+
 def get_all_themes():
     """Return a list of all available themes with their descriptions."""
     return {name: {
@@ -0,0 +1,52 @@
+# services/warmup_service.py
+import time
+from datetime import datetime
+from config import GEMINI_API_KEY, PPT_THEMED_MASTER
+from services.theme_service import THEMES
+from services.theme_classifier import classify_theme
+
+def preload():
+    """Prime the caches that are safe to share across fork.
+    
+    Imports python-pptx, builds the themed templates and fills the template
+    pool for every theme, reads the text boxes that bullets are fitted to,
+    and touches the theme classifier. Meant to run once
+    in the server's master process (or before the first request). Returns the
+    elapsed seconds.
+    """
+    started = time.perf_counter()
+    from utils.template_cache import template_pool, layout_text_box
+    
+    template_pool.warm(list(THEMES.values()) if PPT_THEMED_MASTER else ())
+    for layout_type in (1, 2):
+        layout_text_box(layout_type)
+    classify_theme("warmup")
+    
+    elapsed = time.perf_counter() - started
+    print(f"[{datetime.now()}] Preloaded templates for {len(THEMES)} themes in {elapsed:.3f}s")
+    return elapsed
+
+def warm_worker():
+    """Prime per-process state that must not be created before fork.
+    
+    Creates the Gemini client (and imports google.generativeai) and starts
+    the render worker processes, if that backend is used, so the first
+    request doesn't pay for them. Returns the elapsed seconds.
+    """
+    started = time.perf_counter()
+    from services.render_service import renderer
+    try:
+        renderer.start()
+    except Exception as e:
+        print(f"[{datetime.now()}] Could not start the {renderer.name} renderer during warmup: {e}")
+    
+    if GEMINI_API_KEY:
+        from utils.gemini_client import get_client
+        try:
+            get_client()
+        except Exception as e:
+            print(f"[{datetime.now()}] Could not create Gemini client during warmup: {e}")
+    
+    elapsed = time.perf_counter() - started
+    print(f"[{datetime.now()}] Worker warmed up in {elapsed:.3f}s")
+    return elapsed
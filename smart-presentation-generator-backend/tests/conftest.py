@@ -0,0 +1,51 @@
+# tests/conftest.py
+"""Shared fixtures: the app on a temporary presentation store, with Gemini replaced by a local responder.
+
+Run from the backend directory:  python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+
+# Settings are read when config is imported, so point the stores at a scratch directory first
+_STATE_DIR = tempfile.mkdtemp(prefix='spg-tests-')
+os.environ['PRESENTATION_DB_PATH'] = os.path.join(_STATE_DIR, 'presentations.db')
+os.environ['SIMILAR_TOPIC_DB_PATH'] = ''
+os.environ['GEMINI_CACHE_DB_PATH'] = ''
+os.environ['DOCUMENT_CACHE_DB_PATH'] = ''
+os.environ['ARTIFACT_SPILL_DIR'] = os.path.join(_STATE_DIR, 'artifacts')
+os.environ['REQUEST_LOG_ENABLED'] = 'false'
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import json
+import pytest
+from utils import gemini_client
+from utils.gemini_client import FakeTransport
+
+
+def deck_response(*slides):
+    """Return a model response for a deck of (title, content) pairs."""
+    return json.dumps([{'title': title, 'content': content} for title, content in slides])
+
+
+@pytest.fixture
+def gemini():
+    """Return a function that routes Gemini calls to a responder, with the response cache on and empty."""
+    def install(responder):
+        gemini_client.response_cache.clear()
+        transport = FakeTransport(responder=responder, chunk_size=16)
+        gemini_client.set_transport(transport)
+        return transport
+    yield install
+    gemini_client.response_cache.clear()
+
+
+@pytest.fixture
+def client():
+    from app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    return app.test_client()
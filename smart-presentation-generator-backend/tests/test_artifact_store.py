@@ -0,0 +1,62 @@
+# tests/test_artifact_store.py
+import hashlib
+import os
+import time
+from utils.artifact_store import ArtifactStore
+
+_EXITED_PID = '99999999'  # Above the kernel's pid limit, so never a live process
+
+
+def _store(spill_dir, max_memory_bytes=10, max_disk_bytes=1000):
+    return ArtifactStore(max_memory_bytes=max_memory_bytes, ttl=3600, spill_dir=str(spill_dir),
+                         max_disk_bytes=max_disk_bytes)
+
+
+def test_spills_into_a_per_process_directory(tmp_path):
+    store = _store(tmp_path)
+    store.put('a.pptx', b'0123456789')
+    store.put('b.pptx', b'abcdefghij')
+
+    assert os.listdir(tmp_path / str(os.getpid())) == ['a.pptx']
+    assert store.get('a.pptx') == (b'0123456789', hashlib.sha1(b'0123456789').hexdigest())
+
+
+def test_adopts_files_of_exited_processes_from_metadata(tmp_path):
+    (tmp_path / _EXITED_PID).mkdir()
+    (tmp_path / _EXITED_PID / 'old.pptx').write_bytes(b'old deck')
+    (tmp_path / 'flat.pptx').write_bytes(b'flat deck')
+
+    store = _store(tmp_path)
+    assert store.stats()['disk'] == {'artifacts': 2, 'bytes': 17}
+    assert not (tmp_path / _EXITED_PID).exists()
+    # ETags are only computed once a file is read
+    assert store._disk['old.pptx'][1] is None
+    assert store.get('old.pptx') == (b'old deck', hashlib.sha1(b'old deck').hexdigest())
+    assert store._disk['old.pptx'][1] == hashlib.sha1(b'old deck').hexdigest()
+
+
+def test_indexes_files_left_in_its_own_directory(tmp_path):
+    # A restarted container often gives the worker the pid it had before
+    own = tmp_path / str(os.getpid())
+    own.mkdir()
+    (own / 'earlier.pptx').write_bytes(b'x' * 600)
+    (own / 'later.pptx').write_bytes(b'y' * 600)
+    os.utime(own / 'earlier.pptx', (time.time() - 100, time.time() - 100))
+
+    store = _store(tmp_path)
+    assert store.stats()['disk'] == {'artifacts': 1, 'bytes': 600}
+    assert os.listdir(own) == ['later.pptx']
+
+
+def test_leaves_files_of_live_processes_alone(tmp_path):
+    other = tmp_path / str(os.getppid())
+    other.mkdir()
+    (other / 'theirs.pptx').write_bytes(b'x' * 100)
+
+    store = _store(tmp_path, max_disk_bytes=15)
+    store.put('a.pptx', b'0123456789')
+    store.put('b.pptx', b'abcdefghij')
+    store.put('c.pptx', b'klmnopqrst')
+
+    assert store.stats()['disk'] == {'artifacts': 1, 'bytes': 10}
+    assert (other / 'theirs.pptx').read_bytes() == b'x' * 100
@@ -0,0 +1,120 @@
+# tests/test_generation.py
+import itertools
+from datetime import datetime, timedelta
+from conftest import deck_response
+from utils.presentation_store import PresentationStore
+
+
+def _numbered_decks():
+    counter = itertools.count(1)
+    return lambda prompt: deck_response((f"Version {next(counter)}", ['A point']))
+
+
+def _slides(client, result):
+    return client.get(f"/api/presentations/{result['presentation_id']}").get_json()['presentation']['slides']
+
+
+def test_fresh_generates_new_content(client, gemini):
+    transport = gemini(_numbered_decks())
+    body = {'topic': 'Fresh decks', 'description': 'x', 'theme': 'minimal', 'fresh': True}
+    first = client.post('/api/generate', json=body).get_json()
+    second = client.post('/api/generate', json=body).get_json()
+
+    assert transport.calls == 2
+    assert _slides(client, first) != _slides(client, second)
+
+
+def test_stored_decks_are_reused_only_when_asked(client, gemini):
+    transport = gemini(_numbered_decks())
+    body = {'topic': 'Reused decks', 'description': 'x', 'theme': 'minimal'}
+    first = client.post('/api/generate', json=body).get_json()
+    again = client.post('/api/generate', json=body).get_json()
+    reused = client.post('/api/generate', json={**body, 'reuse': True}).get_json()
+
+    assert 'reused' not in again and again['presentation_id'] != first['presentation_id']
+    assert reused['reused'] and reused['presentation_id'] == again['presentation_id']
+    assert transport.calls == 1  # The repeat without reuse was answered by the response cache
+
+
+def test_listing_requires_a_topic(client, gemini):
+    gemini(_numbered_decks())
+    client.post('/api/generate', json={'topic': 'Listed deck', 'theme': 'minimal'})
+
+    assert client.get('/api/presentations').status_code == 400
+    listed = client.get('/api/presentations?topic=listed%20deck').get_json()['presentations']
+    assert [item['title'] for item in listed] == ['Listed deck']
+
+
+def test_prune_drops_expired_and_excess_decks(tmp_path):
+    store = PresentationStore(str(tmp_path / 'presentations.db'), retention=3600, max_entries=2)
+    old = store.save('Old', '', 'minimal', [], None)
+    with store._conn:
+        store._conn.execute("UPDATE presentations SET created_at = ? WHERE id = ?",
+                            ((datetime.now() - timedelta(hours=2)).isoformat(), old.id))
+    kept = [store.save(f"Deck {index}", '', 'minimal', [], None) for index in range(3)]
+
+    assert store.prune() == 2
+    assert store.get(old.id) is None and store.get(kept[0].id) is None
+    assert len(store) == 2
+
+
+def test_regenerating_a_slide_asks_the_model_each_time(client, gemini):
+    counter = itertools.count(1)
+
+    def respond(prompt):
+        if 'Write the content for slide' in prompt:
+            return f'{{"content": ["Take {next(counter)}"], "visual_note": ""}}'
+        return deck_response(('Intro', ['A point']), ('Details', ['Another point']))
+
+    transport = gemini(respond)
+    deck = client.post('/api/generate', json={'topic': 'Regenerated slides', 'theme': 'minimal'}).get_json()
+    edit_url = f"/api/presentations/{deck['presentation_id']}/edit"
+    first = client.post(edit_url, json={'op': 'regenerate', 'index': 1}).get_json()
+    second = client.post(edit_url, json={'op': 'regenerate', 'index': 1}).get_json()
+
+    assert transport.calls == 3
+    assert first['slides'][1]['content'] == ['Take 1']
+    assert second['slides'][1]['content'] == ['Take 2']
+
+
+def test_fresh_skips_near_duplicate_topics(client, gemini):
+    transport = gemini(_numbered_decks())
+    body = {'description': 'Supervised and unsupervised methods', 'theme': 'minimal'}
+    client.post('/api/generate', json={**body, 'topic': 'Introduction to Machine Learning'})
+    similar = client.post('/api/generate', json={**body, 'topic': 'Intro to machine learning', 'reuse': True})
+    fresh = client.post('/api/generate', json={**body, 'topic': 'Intro to machine learning', 'reuse': True,
+                                               'fresh': True})
+
+    assert similar.get_json()['similar_to']['topic'] == 'Introduction to Machine Learning'
+    assert 'similar_to' not in fresh.get_json()
+    assert transport.calls == 2
+
+
+def test_failed_slide_call_falls_back_to_single_call(client, gemini):
+    def respond(prompt):
+        if 'one slide title per element' in prompt:
+            return '["Intro", "Details", "Summary"]'
+        if 'Write the content for slide 2' in prompt:
+            raise ValueError('model refused')
+        if 'Write the content for slide' in prompt:
+            return '{"content": ["From the slide call"], "visual_note": ""}'
+        return deck_response(('Intro', ['Whole deck']), ('Details', ['Whole deck']), ('Summary', ['Whole deck']))
+
+    gemini(respond)
+    result = client.post('/api/generate', json={'topic': 'Partly failing slides', 'theme': 'minimal',
+                                                'mode': 'parallel'}).get_json()
+
+    assert all(slide['content'] == ['Whole deck'] for slide in _slides(client, result))
+
+
+def test_num_slides_is_validated(client, gemini):
+    transport = gemini(_numbered_decks())
+    for num_slides in ([3], -1, 0, 10 ** 6, 'many', True):
+        response = client.post('/api/generate', json={'topic': 'Bad counts', 'num_slides': num_slides})
+        assert response.status_code == 400, num_slides
+    batch = client.post('/api/generate/batch', json={'items': [{'topic': 'Bad counts', 'num_slides': [3]}]})
+    assert batch.status_code == 400
+    assert transport.calls == 0
+
+    assert client.post('/api/generate', json={'topic': 'Good count', 'theme': 'minimal',
+                                              'num_slides': '4'}).status_code == 200
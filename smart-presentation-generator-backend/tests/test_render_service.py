@@ -0,0 +1,26 @@
+# tests/test_render_service.py
+import pytest
+from services.render_service import ProcessRenderer
+from services.theme_service import get_theme_settings
+
+_SLIDES = [{'title': f"Slide {index}", 'content': ['Point one', 'Point two', 'Point three']}
+           for index in range(400)]
+
+
+def test_timed_out_render_recycles_the_pool():
+    renderer = ProcessRenderer(workers=1, timeout=120)
+    renderer.start()
+    worker = next(iter(renderer._executor._processes.values()))
+    theme_settings = get_theme_settings('professional')
+
+    renderer.timeout = 0.01
+    with pytest.raises(TimeoutError):
+        renderer.render('Runaway deck', _SLIDES, theme_settings)
+    worker.join(timeout=10)
+    assert not worker.is_alive()
+    assert renderer.stats()['timeouts'] == 1
+    assert renderer.stats()['pools_recycled'] == 1
+
+    renderer.timeout = 120
+    assert renderer.render('Small deck', _SLIDES[:2], theme_settings)[:2] == b'PK'
+    renderer._executor.shutdown()
@@ -0,0 +1,17 @@
+# tests/test_similarity_index.py
+from utils.similarity_index import SimilarityIndex
+
+_SLIDES = [{'title': 'One', 'content': ['First'], 'visual_note': ''}]
+
+
+def test_hit_keeps_the_entry_through_a_reload(tmp_path):
+    path = str(tmp_path / 'similar.db')
+    index = SimilarityIndex(max_entries=2, path=path)
+    index.add('Introduction to machine learning', '', _SLIDES)
+    index.add('History of the Roman empire', '', _SLIDES)
+    assert index.query('Intro to machine learning') is not None
+
+    # A new process loads only the most recently used entries
+    reloaded = SimilarityIndex(max_entries=1, path=path)
+    assert reloaded.query('Introduction to machine learning') is not None
+    assert reloaded.query('History of the Roman empire') is None
@@ -0,0 +1,49 @@
+# tests/test_streaming.py
+import json
+from conftest import deck_response
+
+_UNNORMALIZED = deck_response(('Agenda', 'Only one bullet here'), ('Second', None))
+
+
+def _events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines())
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def test_stream_normalizes_string_and_null_content(client, gemini):
+    gemini(lambda prompt: _UNNORMALIZED)
+    response = client.post('/api/generate/stream', json={'topic': 'Streaming normalization'})
+    events = _events(response.get_data(as_text=True))
+
+    assert [name for name, _ in events] == ['start', 'slide', 'slide', 'done']
+    assert events[1][1]['content'] == ['Only one bullet here']
+    assert events[2][1]['title'] == 'Second'
+    assert events[2][1]['content'] == []
+    assert events[3][1]['slide_count'] == 2
+
+
+def test_stream_matches_generate(client, gemini):
+    gemini(lambda prompt: _UNNORMALIZED)
+    generated = client.post('/api/generate', json={'topic': 'Streaming parity', 'fresh': True})
+    assert generated.status_code == 200
+
+    events = _events(client.post('/api/generate/stream', json={'topic': 'Streaming parity'}).get_data(as_text=True))
+    stored = client.get(f"/api/presentations/{events[-1][1]['presentation_id']}").get_json()
+    assert stored['presentation']['slides'] == [
+        {'title': 'Agenda', 'content': ['Only one bullet here'], 'visual_note': ''},
+        {'title': 'Second', 'content': [], 'visual_note': ''},
+    ]
+
+
+def test_stream_picks_the_theme_in_the_same_call(client, gemini):
+    transport = gemini(lambda prompt: json.dumps({'theme': 'vibrant', 'slides': [
+        {'title': 'One', 'content': ['First']}, {'title': 'Two', 'content': ['Second']}]}))
+    response = client.post('/api/generate/stream', json={'topic': 'Zxqv wobble'})
+    events = _events(response.get_data(as_text=True))
+
+    assert [name for name, _ in events] == ['start', 'slide', 'slide', 'done']
+    assert events[-1][1]['theme'] == 'vibrant'
+    assert transport.calls == 1
@@ -0,0 +1,26 @@
+# tests/test_tracing.py
+from utils.gemini_client import stream_gemini_response
+from utils.tracing import start_request, end_request, current_trace, log
+
+
+def test_streamed_gemini_call_is_traced(gemini):
+    gemini(lambda prompt: 'x' * 40)
+    token = start_request('streamtrace')
+    try:
+        assert ''.join(stream_gemini_response('Streamed prompt')) == 'x' * 40
+        assert current_trace().summary()['gemini']['calls'] == 1
+    finally:
+        end_request(token)
+
+
+def test_log_lines_carry_the_request_id(capsys):
+    log('outside a request')
+    token = start_request('logtrace')
+    try:
+        log('inside a request')
+    finally:
+        end_request(token)
+
+    outside, inside = capsys.readouterr().out.splitlines()
+    assert '[logtrace]' not in outside
+    assert inside.endswith('[logtrace] inside a request')
@@ -0,0 +1,217 @@
+# utils/artifact_store.py
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from utils.metrics import registry
+from config import ARTIFACT_MEMORY_MAX_BYTES, ARTIFACT_TTL, ARTIFACT_SPILL_DIR, ARTIFACT_DISK_MAX_BYTES
+
+
+class ArtifactStore:
+    """Bounded store for generated files, kept in memory with an optional disk spill tier.
+
+    Artifacts expire ``ttl`` seconds after they are stored. When the memory tier
+    grows past ``max_memory_bytes`` the least recently used artifacts move to
+    ``spill_dir`` (or are dropped if there is none); the disk tier is likewise
+    capped at ``max_disk_bytes``.
+
+    Each process spills into its own subdirectory of ``spill_dir``, so
+    processes sharing it never count or evict each other's files. Files left
+    by processes that have exited (e.g. before a restart) are taken over on
+    first use, indexed from their size and age only; their ETags are
+    computed when they are first read.
+    """
+
+    def __init__(self, max_memory_bytes, ttl, spill_dir=None, max_disk_bytes=0):
+        self.max_memory_bytes = max_memory_bytes
+        self.ttl = ttl
+        self.spill_dir = spill_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()  # name -> (data, etag, expires_at)
+        self._disk = OrderedDict()  # name -> (size, etag or None until read, expires_at)
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._process_dir = None
+
+    def put(self, name, data):
+        """Store an artifact and return its ETag."""
+        etag = hashlib.sha1(data).hexdigest()
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._check_process()
+            self._remove(name)
+            self._memory[name] = (data, etag, expires_at)
+            self._memory_bytes += len(data)
+            self._enforce_limits()
+        return etag
+
+    def get(self, name):
+        """Return ``(data, etag)`` for an artifact, or None if it is unknown or expired."""
+        now = time.time()
+        with self._lock:
+            self._check_process()
+            entry = self._memory.get(name)
+            if entry is not None:
+                data, etag, expires_at = entry
+                if expires_at >= now:
+                    self._memory.move_to_end(name)
+                    return data, etag
+                self._remove(name)
+                return None
+
+            entry = self._disk.get(name)
+            if entry is None:
+                return None
+            size, etag, expires_at = entry
+            if expires_at < now:
+                self._remove(name)
+                return None
+            path = self._spill_path(name)
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._remove(name)
+            return None
+        if etag is None:
+            etag = hashlib.sha1(data).hexdigest()
+            with self._lock:
+                if name in self._disk:
+                    self._disk[name] = (size, etag, expires_at)
+        return data, etag
+
+    def __contains__(self, name):
+        now = time.time()
+        with self._lock:
+            self._check_process()
+            entry = self._memory.get(name) or self._disk.get(name)
+            return entry is not None and entry[-1] >= now
+
+    def stats(self):
+        """Return artifact counts and byte totals per tier."""
+        with self._lock:
+            self._check_process()
+            return {
+                'memory': {'artifacts': len(self._memory), 'bytes': self._memory_bytes},
+                'disk': {'artifacts': len(self._disk), 'bytes': self._disk_bytes}
+            }
+
+    def _enforce_limits(self):
+        now = time.time()
+        for name in [name for name, entry in self._memory.items() if entry[2] < now]:
+            self._remove(name)
+        for name in [name for name, entry in self._disk.items() if entry[2] < now]:
+            self._remove(name)
+
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            name, (data, etag, expires_at) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(data)
+            if self.spill_dir and len(data) <= self.max_disk_bytes:
+                with open(self._spill_path(name), 'wb') as f:
+                    f.write(data)
+                self._disk[name] = (len(data), etag, expires_at)
+                self._disk_bytes += len(data)
+
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            name = next(iter(self._disk))
+            self._remove(name)
+
+    def _remove(self, name):
+        entry = self._memory.pop(name, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[0])
+        entry = self._disk.pop(name, None)
+        if entry is not None:
+            self._disk_bytes -= entry[0]
+            try:
+                os.remove(self._spill_path(name))
+            except FileNotFoundError:
+                pass
+
+    def _spill_path(self, name):
+        return os.path.join(self._process_dir, os.path.basename(name))
+
+    def _check_process(self):
+        # The store is created before gunicorn forks, so the spill directory is set up
+        # by the first call in each process; a forked worker starts with an empty disk tier
+        pid = os.getpid()
+        if not self.spill_dir or self._pid == pid:
+            return
+        self._pid = pid
+        self._disk.clear()
+        self._disk_bytes = 0
+        self._process_dir = os.path.join(self.spill_dir, str(pid))
+        os.makedirs(self._process_dir, exist_ok=True)
+        self._adopt_spilled_files()
+
+    def _adopt_spilled_files(self):
+        # Take over files spilled by processes that have exited, expiring them by file age.
+        # Only metadata is read; moving a file within the directory doesn't copy it.
+        # Files already in this process's directory were left by an earlier process with the
+        # same pid, e.g. the same worker in a restarted container
+        entries = []
+        for source in os.scandir(self._process_dir):
+            if source.is_file():
+                stat = source.stat()
+                entries.append((stat.st_mtime, source.name, stat.st_size))
+        for entry in os.scandir(self.spill_dir):
+            if entry.is_file():
+                sources = [entry]  # Spilled before per-process subdirectories
+            elif entry.path == self._process_dir:
+                continue
+            elif entry.is_dir() and entry.name.isdigit() and not _process_alive(int(entry.name)):
+                sources = [source for source in os.scandir(entry.path) if source.is_file()]
+            else:
+                continue
+            for source in sources:
+                path = os.path.join(self._process_dir, source.name)
+                try:
+                    stat = source.stat()
+                    os.replace(source.path, path)
+                except FileNotFoundError:
+                    continue  # Taken over by another process first
+                entries.append((stat.st_mtime, source.name, stat.st_size))
+            if entry.is_dir():
+                try:
+                    os.rmdir(entry.path)
+                except OSError:
+                    pass
+        for mtime, name, size in sorted(entries):
+            self._disk[name] = (size, None, mtime + self.ttl)
+            self._disk_bytes += size
+        self._enforce_limits()
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Alive, but owned by another user
+    return True
+
+
+# Shared store for decks rendered in memory
+artifact_store = ArtifactStore(
+    max_memory_bytes=ARTIFACT_MEMORY_MAX_BYTES,
+    ttl=ARTIFACT_TTL,
+    spill_dir=ARTIFACT_SPILL_DIR or None,
+    max_disk_bytes=ARTIFACT_DISK_MAX_BYTES
+)
+
+
+@registry.register_collector
+def _collect_artifact_metrics():
+    stats = artifact_store.stats()
+    return [
+        ('artifacts', 'gauge', 'Stored presentation artifacts by tier.',
+         [({'tier': tier}, tier_stats['artifacts']) for tier, tier_stats in stats.items()]),
+        ('artifact_bytes', 'gauge', 'Bytes of stored presentation artifacts by tier.',
+         [({'tier': tier}, tier_stats['bytes']) for tier, tier_stats in stats.items()]),
+    ]
@@ -0,0 +1,110 @@
+# utils/document_text.py
+import codecs
+import zipfile
+from lxml import etree
+
+# Rough size of a model token, used to keep chunks under a token budget
+CHARS_PER_TOKEN = 4
+READ_BLOCK_SIZE = 64 * 1024
+
+_W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+class DocumentError(ValueError):
+    """Raised when an uploaded document can't be read."""
+
+
+def estimate_tokens(text):
+    """Return a rough token count for text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def iter_text(path, extension):
+    """Yield the text of a .txt, .docx or .pdf file piece by piece, without loading it whole."""
+    readers = {'txt': _iter_txt, 'docx': _iter_docx, 'pdf': _iter_pdf}
+    if extension not in readers:
+        raise DocumentError(f"Unsupported document type: .{extension}")
+    return readers[extension](path)
+
+
+def iter_chunks(pieces, max_tokens):
+    """Regroup streamed text into chunks of at most about ``max_tokens``.
+
+    Chunks end at a paragraph break where possible, then at a line break,
+    sentence or word, so only about one chunk of text is held at a time.
+    """
+    max_chars = max(max_tokens * CHARS_PER_TOKEN, 1)
+    buffer = ''
+    for piece in pieces:
+        buffer += piece
+        while len(buffer) >= max_chars:
+            cut = _split_point(buffer, max_chars)
+            chunk = buffer[:cut].strip()
+            buffer = buffer[cut:]
+            if chunk:
+                yield chunk
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def _split_point(text, limit):
+    for separator in ('\n\n', '\n', '. ', ' '):
+        index = text.rfind(separator, limit // 2, limit)
+        if index != -1:
+            return index + len(separator)
+    return limit
+
+
+def _iter_txt(path):
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(READ_BLOCK_SIZE)
+            if not block:
+                break
+            yield decoder.decode(block)
+    yield decoder.decode(b'', final=True)
+
+
+def _iter_docx(path):
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile as e:
+        raise DocumentError(f"Not a valid .docx file: {e}")
+
+    with archive:
+        try:
+            document = archive.open('word/document.xml')
+        except KeyError as e:
+            raise DocumentError(f"Not a valid .docx file: {e}")
+
+        with document:
+            # Parse paragraph by paragraph, discarding each one once its text is out
+            for _, paragraph in etree.iterparse(document, events=('end',), tag=f'{{{_W}}}p'):
+                parts = []
+                for node in paragraph.iter(f'{{{_W}}}t', f'{{{_W}}}tab', f'{{{_W}}}br'):
+                    if node.tag == f'{{{_W}}}t':
+                        parts.append(node.text or '')
+                    else:
+                        parts.append('\t' if node.tag == f'{{{_W}}}tab' else '\n')
+                yield ''.join(parts) + '\n\n'
+                paragraph.clear()
+                while paragraph.getprevious() is not None:
+                    del paragraph.getparent()[0]
+
+
+def _iter_pdf(path):
+    try:
+        # Optional dependency, only needed for PDF uploads
+        from pypdf import PdfReader
+        from pypdf.errors import PdfReadError
+    except ImportError:
+        raise DocumentError("PDF uploads need the pypdf package (pip install pypdf)")
+
+    with open(path, 'rb') as f:
+        try:
+            reader = PdfReader(f)
+            for page in reader.pages:
+                yield (page.extract_text() or '') + '\n\n'
+        except PdfReadError as e:
+            raise DocumentError(f"Not a valid .pdf file: {e}")
@@ -1,12 +1,266 @@
 # utils/gemini_client.py
-import google.generativeai as genai
-from config import GEMINI_API_KEY
+import random
+import threading
+import time
+from config import (GEMINI_API_KEY, GEMINI_MODEL, GEMINI_TIMEOUT, GEMINI_MAX_CONCURRENCY,
+                    GEMINI_MAX_RETRIES, GEMINI_RETRY_BASE_DELAY, GEMINI_RETRY_MAX_DELAY,
+                    GEMINI_CACHE_ENABLED, GEMINI_CACHE_MAX_ENTRIES, GEMINI_CACHE_TTL,
+                    GEMINI_CACHE_DB_PATH, GEMINI_CACHE_DB_MAX_ENTRIES)
+from utils.response_cache import build_response_cache
+from utils.metrics import registry, gemini_requests, gemini_retries, gemini_bytes, gemini_tokens
+from utils.tracing import traced, traced_stream, log
 
-# Initialize the Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
+# Shared response cache for identical prompts
+response_cache = build_response_cache(
+    max_entries=GEMINI_CACHE_MAX_ENTRIES,
+    ttl=GEMINI_CACHE_TTL,
+    disk_path=GEMINI_CACHE_DB_PATH,
+    disk_max_entries=GEMINI_CACHE_DB_MAX_ENTRIES
+) if GEMINI_CACHE_ENABLED else None
 
-def get_gemini_response(prompt):
-    """Get a response from Gemini API."""
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    response = model.generate_content(prompt)
-    return response.text
\ No newline at end of file
+
+@registry.register_collector
+def _collect_cache_metrics():
+    if response_cache is None:
+        return []
+    stats = response_cache.stats()
+    return [
+        ('gemini_cache_hits_total', 'counter', 'Gemini response cache hits by tier.',
+         [({'tier': tier}, hits) for tier, hits in stats['hits'].items()]),
+        ('gemini_cache_misses_total', 'counter', 'Gemini response cache misses.', [({}, stats['misses'])]),
+        ('gemini_cache_hit_ratio', 'gauge', 'Share of Gemini cache lookups that hit.', [({}, stats['hit_rate'])]),
+        ('gemini_cache_entries', 'gauge', 'Cached Gemini responses by tier.',
+         [({'tier': tier}, size) for tier, size in stats['sizes'].items()]),
+    ]
+
+
+class GenAITransport:
+    """Transport that sends prompts to the Gemini API through google.generativeai."""
+
+    def __init__(self, model_name=GEMINI_MODEL, api_key=GEMINI_API_KEY):
+        import google.generativeai as genai
+        from google.api_core import exceptions
+
+        # Initialize the Gemini API once and keep the model (and its channel) for the process
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+        self.retryable_errors = (
+            exceptions.TooManyRequests,
+            exceptions.ResourceExhausted,
+            exceptions.ServiceUnavailable,
+            exceptions.InternalServerError,
+            exceptions.DeadlineExceeded,
+            ConnectionError,
+            TimeoutError,
+        )
+
+    def generate(self, prompt, timeout):
+        response = self.model.generate_content(prompt, request_options={'timeout': timeout})
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            gemini_tokens.inc(getattr(usage, 'prompt_token_count', 0) or 0, kind='prompt')
+            gemini_tokens.inc(getattr(usage, 'candidates_token_count', 0) or 0, kind='completion')
+        return response.text
+
+    def stream(self, prompt, timeout):
+        response = self.model.generate_content(prompt, stream=True, request_options={'timeout': timeout})
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+
+class FakeTransport:
+    """Local stand-in for the Gemini API, for tests and benchmarks.
+
+    ``responder`` is called with each prompt and returns the response text;
+    it defaults to returning ``default_response``. ``latency`` seconds are
+    slept per call to mimic the network round-trip, and streamed responses
+    are cut into ``chunk_size`` character chunks.
+    """
+
+    retryable_errors = (ConnectionError, TimeoutError)
+
+    def __init__(self, responder=None, default_response='', latency=0.0, chunk_size=64, model_name=GEMINI_MODEL):
+        self.responder = responder or (lambda prompt: default_response)
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.model_name = model_name
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, timeout):
+        with self._lock:
+            self.calls += 1
+        if self.latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Fake Gemini call exceeded its {timeout:.2f}s timeout")
+        if self.latency:
+            time.sleep(self.latency)
+        return self.responder(prompt)
+
+    def stream(self, prompt, timeout):
+        # Deliver the whole response in fixed-size chunks once the latency has passed
+        text = self.generate(prompt, timeout)
+        for start in range(0, len(text), self.chunk_size):
+            yield text[start:start + self.chunk_size]
+
+
+class GeminiClient:
+    """Long-lived Gemini client with deadlines, bounded concurrency and retries.
+
+    Each call gets an overall deadline of ``timeout`` seconds covering the wait
+    for a concurrency slot, every attempt and the backoff sleeps in between.
+    Errors listed in the transport's ``retryable_errors`` are retried up to
+    ``max_retries`` times with jittered exponential backoff.
+    """
+
+    def __init__(self, transport, timeout=GEMINI_TIMEOUT, max_concurrency=GEMINI_MAX_CONCURRENCY,
+                 max_retries=GEMINI_MAX_RETRIES, base_delay=GEMINI_RETRY_BASE_DELAY,
+                 max_delay=GEMINI_RETRY_MAX_DELAY, cache=None):
+        self.transport = transport
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.cache = cache
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    @property
+    def model_name(self):
+        return self.transport.model_name
+
+    def generate(self, prompt, use_cache=True, timeout=None):
+        """Return the model's response text for a prompt."""
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(prompt, self.model_name)
+            if cached is not None:
+                gemini_requests.inc(outcome='cache_hit')
+                return cached
+
+        gemini_bytes.inc(len(prompt.encode('utf-8')), direction='sent')
+        try:
+            text = self._call_with_retries(prompt, timeout or self.timeout)
+        except Exception:
+            gemini_requests.inc(outcome='error')
+            raise
+        gemini_requests.inc(outcome='ok')
+        gemini_bytes.inc(len(text.encode('utf-8')), direction='received')
+
+        if cache is not None:
+            cache.set(prompt, self.model_name, text)
+        return text
+
+    def stream(self, prompt, use_cache=True, timeout=None):
+        """Yield the model's response text in chunks as they arrive.
+
+        The call holds a concurrency slot until the stream is exhausted. It is
+        retried only if it fails before the first chunk has been yielded.
+        """
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(prompt, self.model_name)
+            if cached is not None:
+                gemini_requests.inc(outcome='cache_hit')
+                yield cached
+                return
+
+        gemini_bytes.inc(len(prompt.encode('utf-8')), direction='sent')
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        chunks = [] if cache is not None else None
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._slots.acquire(timeout=remaining):
+                raise TimeoutError(f"Gemini request exceeded its {timeout:.1f}s deadline")
+            started = False
+            try:
+                for chunk in self.transport.stream(prompt, timeout=max(deadline - time.monotonic(), 0.001)):
+                    started = True
+                    gemini_bytes.inc(len(chunk.encode('utf-8')), direction='received')
+                    if chunks is not None:
+                        chunks.append(chunk)
+                    yield chunk
+                break
+            except self.transport.retryable_errors as e:
+                if started or attempt >= self.max_retries:
+                    gemini_requests.inc(outcome='error')
+                    raise
+                error = e
+            except Exception:
+                gemini_requests.inc(outcome='error')
+                raise
+            finally:
+                self._slots.release()
+
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+            if time.monotonic() + delay >= deadline:
+                gemini_requests.inc(outcome='error')
+                raise error
+            gemini_retries.inc()
+            log(f"Gemini stream failed ({error}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+        gemini_requests.inc(outcome='ok')
+        if cache is not None:
+            cache.set(prompt, self.model_name, ''.join(chunks))
+
+    def _call_with_retries(self, prompt, timeout):
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Gemini request exceeded its {timeout:.1f}s deadline")
+            if not self._slots.acquire(timeout=remaining):
+                raise TimeoutError("Timed out waiting for a free Gemini request slot")
+            try:
+                return self.transport.generate(prompt, timeout=max(deadline - time.monotonic(), 0.001))
+            except self.transport.retryable_errors as e:
+                if attempt >= self.max_retries:
+                    raise
+                error = e
+            finally:
+                self._slots.release()
+
+            # Full jitter: sleep a random amount up to the capped exponential delay
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+            if time.monotonic() + delay >= deadline:
+                raise error
+            gemini_retries.inc()
+            log(f"Gemini request failed ({error}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Return the shared Gemini client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GeminiClient(GenAITransport(), cache=response_cache)
+    return _client
+
+def set_transport(transport):
+    """Replace the transport of the shared client, e.g. with a FakeTransport."""
+    global _client
+    with _client_lock:
+        _client = GeminiClient(transport, cache=response_cache)
+    return _client
+
+@traced('gemini')
+def get_gemini_response(prompt, use_cache=True, timeout=None):
+    """Get a response from Gemini API, served from the response cache when possible."""
+    return get_client().generate(prompt, use_cache=use_cache, timeout=timeout)
+
+@traced_stream('gemini')
+def stream_gemini_response(prompt, use_cache=True, timeout=None):
+    """Stream a response from Gemini API as an iterator of text chunks."""
+    return get_client().stream(prompt, use_cache=use_cache, timeout=timeout)
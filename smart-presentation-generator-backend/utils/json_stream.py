@@ -0,0 +1,150 @@
+# utils/json_stream.py
+import json
+import re
+
+# Characters that matter while scanning inside an element, outside / inside strings
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_NON_WHITESPACE = re.compile(r'\S')
+
+# Results of scanning an element other than a decoded value
+_INCOMPLETE = object()
+_MALFORMED = object()
+
+
+class JSONArrayStream:
+    """Incremental parser for a JSON array of objects arriving in chunks.
+
+    Text before the array (prose, a ```json fence) is skipped; the array is the
+    first ``[`` followed by ``{``. Each element is decoded as soon as its
+    closing brace arrives and only the unconsumed tail of the input is kept,
+    so memory stays bounded by the largest single element. Elements that fail
+    to decode are skipped.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0
+        self._state = 'seek'  # seek -> array -> done
+        self._depth = 0
+        self._in_string = False
+        self._start = None
+        self.skipped = 0
+
+    @property
+    def done(self):
+        """True once the closing bracket of the array has been seen."""
+        return self._state == 'done'
+
+    def feed(self, chunk):
+        """Add a chunk of text and return the list of elements it completed."""
+        if self._state == 'done':
+            return []
+        self._buffer += chunk
+        elements = []
+
+        while True:
+            if self._state == 'seek':
+                if not self._seek_array():
+                    break
+            elif self._state == 'array':
+                if self._depth == 0:
+                    if not self._next_element():
+                        break
+                else:
+                    element = self._scan_element()
+                    if element is _INCOMPLETE:
+                        break
+                    if element is not _MALFORMED:
+                        elements.append(element)
+            else:
+                break
+
+        return elements
+
+    def _seek_array(self):
+        start = self._buffer.find('[', self._pos)
+        if start == -1:
+            self._buffer = ''
+            self._pos = 0
+            return False
+        match = _NON_WHITESPACE.search(self._buffer, start + 1)
+        if match is None:
+            # Need more input to know whether this bracket opens the array
+            self._buffer = self._buffer[start:]
+            self._pos = 0
+            return False
+        if match.group() == '{':
+            self._state = 'array'
+            self._buffer = self._buffer[match.start():]
+            self._pos = 0
+        else:
+            self._pos = start + 1
+        return True
+
+    def _next_element(self):
+        # Between elements: skip whitespace and commas until '{' or ']'
+        match = _NON_WHITESPACE.search(self._buffer, self._pos)
+        while match is not None and match.group() == ',':
+            match = _NON_WHITESPACE.search(self._buffer, match.end())
+        if match is None:
+            self._buffer = ''
+            self._pos = 0
+            return False
+        char = match.group()
+        if char == ']':
+            self._state = 'done'
+            self._buffer = ''
+            return False
+        if char == '{':
+            self._start = match.start()
+            self._depth = 1
+            self._pos = match.end()
+        else:
+            # Stray character between elements
+            self._pos = match.end()
+        return True
+
+    def _scan_element(self):
+        buffer = self._buffer
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buffer, self._pos)
+                if match is None:
+                    self._pos = len(buffer)
+                    return _INCOMPLETE
+                if match.group() == '\\':
+                    if match.end() >= len(buffer):
+                        # The escaped character hasn't arrived yet
+                        self._pos = match.start()
+                        return _INCOMPLETE
+                    self._pos = match.end() + 1
+                    continue
+                self._in_string = False
+                self._pos = match.end()
+                continue
+
+            match = _STRUCTURAL.search(buffer, self._pos)
+            if match is None:
+                self._pos = len(buffer)
+                return _INCOMPLETE
+            char = match.group()
+            self._pos = match.end()
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    break
+
+        text = buffer[self._start:self._pos]
+        self._buffer = buffer[self._pos:]
+        self._pos = 0
+        self._start = None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            self.skipped += 1
+            return _MALFORMED
@@ -0,0 +1,225 @@
+# utils/metrics.py
+import bisect
+import threading
+
+# Latency buckets in seconds, from sub-millisecond shape edits to slow model calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, optionally split by labels."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, such as the number of calls in flight."""
+
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets, with sum and count."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def snapshot(self, **labels):
+        """Return ``{'count': ..., 'sum': ...}`` for one label set."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return {'count': state[2], 'sum': state[1]} if state else {'count': 0, 'sum': 0.0}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics plus collector callbacks, rendered in the Prometheus text format.
+
+    Collectors are called at scrape time and return ``(name, kind, help_text,
+    samples)`` tuples, where samples is a list of ``(labels_dict, value)``;
+    they expose state that other components already track (cache counters,
+    queue depth) without mirroring it on every update.
+    """
+
+    def __init__(self, prefix=''):
+        self.prefix = prefix
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+        return collector
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+                continue
+            for name, kind, help_text, samples in families:
+                full_name = self.prefix + name
+                lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} {kind}")
+                for labels, value in samples:
+                    label_text = _format_labels(list(labels), list(labels.values()))
+                    lines.append(f"{full_name}{label_text} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def _get_or_create(self, cls, name, help_text, labelnames, **kwargs):
+        full_name = self.prefix + name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = cls(full_name, help_text, labelnames, **kwargs)
+            return metric
+
+
+# Shared registry exposed on /api/metrics
+registry = MetricsRegistry(prefix='spg_')
+
+# Per-stage instrumentation used by utils.tracing
+stage_duration = registry.histogram('stage_duration_seconds', 'Time spent in each pipeline stage.', ['stage'])
+stage_in_flight = registry.gauge('stage_in_flight', 'Calls currently running per pipeline stage.', ['stage'])
+stage_errors = registry.counter('stage_errors_total', 'Pipeline stage calls that raised, by exception type.',
+                                ['stage', 'error'])
+
+# HTTP requests
+http_request_duration = registry.histogram('http_request_duration_seconds', 'Time to produce an API response.',
+                                           ['method', 'endpoint', 'status'])
+http_requests_in_flight = registry.gauge('http_requests_in_flight', 'API requests currently being handled.')
+
+# Gemini traffic
+gemini_requests = registry.counter('gemini_requests_total', 'Gemini calls by outcome.', ['outcome'])
+gemini_retries = registry.counter('gemini_retries_total', 'Gemini attempts retried after a transient error.')
+gemini_bytes = registry.counter('gemini_bytes_total', 'Prompt and response text sent to and received from Gemini.',
+                                ['direction'])
+gemini_tokens = registry.counter('gemini_tokens_total', 'Tokens reported by the Gemini API.', ['kind'])
+
+# Request coalescing
+coalesced_requests = registry.counter('coalesced_requests_total',
+                                      'Requests answered by an identical request already in flight, by kind.',
+                                      ['kind'])
+coalesce_timeouts = registry.counter('coalesce_timeouts_total',
+                                     'Requests that gave up waiting on an identical request in flight, by kind.',
+                                     ['kind'])
+
+# Generated output
+presentation_bytes = registry.counter('presentation_bytes_total', 'Bytes of .pptx files written.')
+presentations_reused = registry.counter('presentations_reused_total',
+                                        'Generate requests answered from earlier decks, by how.',
+                                        ['outcome'])
+presentations_materialized = registry.counter('presentations_materialized_total',
+                                              'Lazily generated decks built on first download.')
@@ -3,19 +3,41 @@ from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.dml.color import RGBColor
+from io import BytesIO
 import os
+import re
+from config import PPT_THEMED_MASTER, PPT_BULK_TEXT
 from models.templates import SLIDE_TEMPLATES
+from utils.template_cache import template_pool, theme_key
+from utils.tracing import traced
+from utils.text_xml import bullet_parts, is_plain, default_run_properties_xml, paragraph_xml, append_paragraphs
 
 class PPTGenerator:
     """Utility class for generating PowerPoint presentations."""
     
-    def __init__(self, template_path=None):
-        """Initialize with optional template."""
+    @traced('ppt.load_template')
+    def __init__(self, template_path=None, theme_settings=None):
+        """Initialize with optional template.
+        
+        Without a template path the presentation comes pre-parsed from the
+        template pool. When ``theme_settings`` is given (and themed masters are
+        enabled), it starts from a template with the theme baked into its
+        master, and slides added with the same theme skip per-shape formatting.
+        """
+        self.theme_key = None
         if template_path and os.path.exists(template_path):
             self.prs = Presentation(template_path)
+        elif theme_settings and PPT_THEMED_MASTER:
+            self.prs = template_pool.acquire(theme_settings)
+            self.theme_key = theme_key(theme_settings)
         else:
-            self.prs = Presentation()
+            self.prs = template_pool.acquire()
+    
+    def _needs_theming(self, theme_settings):
+        """Return True if the theme isn't already provided by the slide master."""
+        return bool(theme_settings) and (self.theme_key is None or theme_key(theme_settings) != self.theme_key)
     
+    @traced('ppt.add_title_slide')
     def add_title_slide(self, title, subtitle=None, theme_settings=None):
         """Add a title slide to the presentation."""
         slide_layout = self.prs.slide_layouts[SLIDE_TEMPLATES["title_slide"].layout_type]
@@ -31,13 +53,14 @@ class PPTGenerator:
             subtitle_shape.text = subtitle
         
         # Apply theme if provided
-        if theme_settings:
+        if self._needs_theming(theme_settings):
             self._apply_theme_to_slide(slide, theme_settings, is_title_slide=True)
         
         return slide
     
-    def add_content_slide(self, title, content, layout_type=1, theme_settings=None):
-        """Add a content slide with bullet points."""
+    @traced('ppt.add_content_slide')
+    def add_content_slide(self, title, content, layout_type=1, theme_settings=None, font_size=None):
+        """Add a content slide with bullet points, set at ``font_size`` points if given."""
         slide_layout = self.prs.slide_layouts[layout_type]
         slide = self.prs.slides.add_slide(slide_layout)
         
@@ -45,33 +68,43 @@ class PPTGenerator:
         title_shape = slide.shapes.title
         title_shape.text = title
         
+        needs_theming = self._needs_theming(theme_settings)
+        formatted_shapes = []
+        
         # Add content as bullet points
         if hasattr(slide, 'placeholders') and len(slide.placeholders) > 1:
             content_shape = slide.placeholders[1]
-            text_frame = content_shape.text_frame
-            
-            # Clear any existing text
-            for paragraph in text_frame.paragraphs:
-                if paragraph.text:
-                    paragraph.text = ""
-            
-            # Add new content
-            first_paragraph = True
-            for point in content:
-                if first_paragraph and text_frame.paragraphs:
-                    p = text_frame.paragraphs[0]
-                    first_paragraph = False
-                else:
-                    p = text_frame.add_paragraph()
-                p.text = point
-                p.level = 0  # First level bullet
+            if self._write_bullets(content_shape, content, theme_settings if needs_theming else None,
+                                   replace_first=True, font_size=font_size):
+                formatted_shapes.append(content_shape)
+            else:
+                text_frame = content_shape.text_frame
+                
+                # Clear any existing text
+                for paragraph in text_frame.paragraphs:
+                    if paragraph.text:
+                        paragraph.text = ""
+                
+                # Add new content
+                first_paragraph = True
+                for point in content:
+                    if first_paragraph and text_frame.paragraphs:
+                        p = text_frame.paragraphs[0]
+                        first_paragraph = False
+                    else:
+                        p = text_frame.add_paragraph()
+                    self._set_bullet(p, point)
+                    if font_size:
+                        for run in p.runs:
+                            run.font.size = Pt(font_size)
         
         # Apply theme if provided
-        if theme_settings:
-            self._apply_theme_to_slide(slide, theme_settings)
+        if needs_theming:
+            self._apply_theme_to_slide(slide, theme_settings, formatted_shapes=formatted_shapes)
         
         return slide
     
+    @traced('ppt.add_two_column_slide')
     def add_two_column_slide(self, title, left_content, right_content, theme_settings=None):
         """Add a slide with two columns of content."""
         slide_layout = self.prs.slide_layouts[SLIDE_TEMPLATES["two_content"].layout_type]
@@ -81,34 +114,93 @@ class PPTGenerator:
         title_shape = slide.shapes.title
         title_shape.text = title
         
+        needs_theming = self._needs_theming(theme_settings)
+        formatted_shapes = []
+        
         # Add left column content
         if hasattr(slide, 'placeholders') and len(slide.placeholders) > 1:
             left_shape = slide.placeholders[1]
-            text_frame = left_shape.text_frame
-            
-            for point in left_content:
-                p = text_frame.add_paragraph()
-                p.text = point
-                p.level = 0
+            if self._write_bullets(left_shape, left_content, theme_settings if needs_theming else None):
+                formatted_shapes.append(left_shape)
+            else:
+                text_frame = left_shape.text_frame
+                
+                for point in left_content:
+                    self._set_bullet(text_frame.add_paragraph(), point)
         
         # Add right column content
         if hasattr(slide, 'placeholders') and len(slide.placeholders) > 2:
             right_shape = slide.placeholders[2]
-            text_frame = right_shape.text_frame
-            
-            for point in right_content:
-                p = text_frame.add_paragraph()
-                p.text = point
-                p.level = 0
+            if self._write_bullets(right_shape, right_content, theme_settings if needs_theming else None):
+                formatted_shapes.append(right_shape)
+            else:
+                text_frame = right_shape.text_frame
+                
+                for point in right_content:
+                    self._set_bullet(text_frame.add_paragraph(), point)
         
         # Apply theme if provided
-        if theme_settings:
-            self._apply_theme_to_slide(slide, theme_settings)
+        if needs_theming:
+            self._apply_theme_to_slide(slide, theme_settings, formatted_shapes=formatted_shapes)
         
         return slide
     
-    def _apply_theme_to_slide(self, slide, theme_settings, is_title_slide=False):
-        """Apply theme settings to a slide."""
+    def _set_bullet(self, paragraph, point):
+        """Fill a paragraph with a bullet (see utils.text_xml.bullet_parts) through python-pptx."""
+        level, runs = bullet_parts(point)
+        if is_plain(runs):
+            paragraph.text = runs[0][0]
+        else:
+            for text, bold, italic in runs:
+                for index, segment in enumerate(re.split('\n|\v', text)):
+                    if index:
+                        paragraph.add_line_break()
+                    if segment:
+                        run = paragraph.add_run()
+                        run.text = segment
+                        if bold:
+                            run.font.bold = True
+                        if italic:
+                            run.font.italic = True
+        paragraph.level = level
+    
+    def _write_bullets(self, shape, content, theme_settings=None, replace_first=False, font_size=None):
+        """Write all bullets of a text placeholder as XML in one pass.
+        
+        Produces the same XML as filling the paragraphs through python-pptx (and
+        then applying ``theme_settings`` to them, if given). The placeholder's
+        single empty paragraph is kept, or with ``replace_first`` it holds the
+        first bullet, and a ``font_size`` is set on every run. Returns False,
+        leaving the shape untouched, if the fast path is disabled or the text
+        body isn't a fresh placeholder's.
+        """
+        if not PPT_BULK_TEXT or not content:
+            return False
+        tx_body = shape.text_frame._txBody
+        paragraphs = tx_body.p_lst
+        if len(paragraphs) != 1 or len(paragraphs[0]) or paragraphs[0].attrib:
+            return False
+        
+        default_run_properties = default_run_properties_xml(
+            theme_settings['content_font_size'], theme_settings['content_font'], theme_settings['content_color']
+        ) if theme_settings else ''
+        
+        xml = []
+        if not replace_first:
+            xml.append(paragraph_xml(None, (), default_run_properties))
+        for point in content:
+            level, runs = bullet_parts(point)
+            xml.append(paragraph_xml(level, runs, default_run_properties, font_size))
+        
+        tx_body.remove(paragraphs[0])
+        append_paragraphs(tx_body, xml)
+        return True
+    
+    def _apply_theme_to_slide(self, slide, theme_settings, is_title_slide=False, formatted_shapes=()):
+        """Apply theme settings to a slide.
+        
+        Shapes in ``formatted_shapes`` already carry the content formatting and are skipped.
+        """
         # Background color
         background = slide.background
         fill = background.fill
@@ -125,15 +217,23 @@ class PPTGenerator:
         # Additional formatting for content if not a title slide
         if not is_title_slide:
             for shape in slide.shapes:
-                if hasattr(shape, 'text_frame') and shape != title_shape:
+                if hasattr(shape, 'text_frame') and shape != title_shape and shape not in formatted_shapes:
                     for paragraph in shape.text_frame.paragraphs:
                         paragraph.font.size = Pt(theme_settings['content_font_size'])
                         paragraph.font.name = theme_settings['content_font']
                         paragraph.font.color.rgb = RGBColor(*theme_settings['content_color'])
     
+    @traced('ppt.save')
     def save(self, file_path):
         """Save the presentation to the specified path."""
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         self.prs.save(file_path)
-        return file_path
\ No newline at end of file
+        return file_path
+    
+    @traced('ppt.save')
+    def to_bytes(self):
+        """Return the presentation as .pptx bytes without touching the disk."""
+        buffer = BytesIO()
+        self.prs.save(buffer)
+        return buffer.getvalue()
\ No newline at end of file
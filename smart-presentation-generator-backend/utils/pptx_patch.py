@@ -0,0 +1,161 @@
+# utils/pptx_patch.py
+import copy
+import posixpath
+import re
+import struct
+import zipfile
+from io import BytesIO
+from lxml import etree
+
+_P = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+_R = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PACKAGE_RELS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_CONTENT_TYPES = 'http://schemas.openxmlformats.org/package/2006/content-types'
+SLIDE_RELATIONSHIP = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide'
+SLIDE_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.presentationml.slide+xml'
+
+_PRESENTATION = 'ppt/presentation.xml'
+_PRESENTATION_RELS = 'ppt/_rels/presentation.xml.rels'
+_CONTENT_TYPES_ITEM = '[Content_Types].xml'
+_SLIDE_NAME = re.compile(r'^ppt/slides/slide(\d+)\.xml$')
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+
+def _serialize(element):
+    # Same serialization python-pptx uses for package parts
+    return etree.tostring(element, encoding='UTF-8', standalone=True)
+
+
+def _rels_name(part_name):
+    directory, file_name = posixpath.split(part_name)
+    return posixpath.join(directory, '_rels', file_name + '.rels')
+
+
+class SlideRef:
+    """A slide already in the package: its ``<p:sldId>`` entry and part name."""
+
+    def __init__(self, slide_id, part_name):
+        self.slide_id = slide_id
+        self.part_name = part_name
+
+
+class PackagePatch:
+    """Edit the slide list of a .pptx package without rebuilding it.
+
+    Slides are replaced, inserted, deleted and reordered by rewriting only
+    their own parts plus the slide list bookkeeping (presentation.xml, its
+    relationships and [Content_Types].xml). Every other zip entry, including
+    untouched slides, is copied with its compressed bytes as they are.
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._zip = zipfile.ZipFile(BytesIO(data))
+        self._presentation = etree.fromstring(self._zip.read(_PRESENTATION))
+        self._relationships = etree.fromstring(self._zip.read(_PRESENTATION_RELS))
+        self._content_types = etree.fromstring(self._zip.read(_CONTENT_TYPES_ITEM))
+
+        targets = {rel.get('Id'): posixpath.normpath(posixpath.join('ppt', rel.get('Target')))
+                   for rel in self._relationships if rel.get('Type') == SLIDE_RELATIONSHIP}
+        self._slide_list = self._presentation.find(f'{{{_P}}}sldIdLst')
+        if self._slide_list is None:
+            raise ValueError("Package has no slide list")
+        self.slides = [SlideRef(slide_id, targets[slide_id.get(f'{{{_R}}}id')]) for slide_id in self._slide_list]
+
+    def apply(self, entries):
+        """Lay the package's slides out as ``entries`` and return the new .pptx bytes.
+
+        Each entry is a SlideRef to keep as it is, a ``(SlideRef, slide_xml,
+        rels_xml)`` tuple to give an existing slide new parts in place, or a
+        ``(None, slide_xml, rels_xml)`` tuple for a new slide. Slides left out
+        are deleted.
+        """
+        written = {}
+        kept = set()
+        next_number = max([int(match.group(1)) for match in map(_SLIDE_NAME.match, self._zip.namelist())
+                           if match] or [0]) + 1
+        next_slide_id = max([int(ref.slide_id.get('id')) for ref in self.slides] or [255]) + 1
+        next_rel = max([int(rel.get('Id')[3:]) for rel in self._relationships
+                        if rel.get('Id', '').startswith('rId') and rel.get('Id')[3:].isdigit()] or [0]) + 1
+
+        order = []
+        for entry in entries:
+            if isinstance(entry, SlideRef):
+                ref = entry
+            else:
+                ref, slide_xml, rels_xml = entry
+                if ref is None:
+                    part_name = f'ppt/slides/slide{next_number}.xml'
+                    next_number += 1
+                    rel_id = f'rId{next_rel}'
+                    next_rel += 1
+                    etree.SubElement(self._relationships, f'{{{_PACKAGE_RELS}}}Relationship', Id=rel_id,
+                                     Type=SLIDE_RELATIONSHIP, Target=posixpath.relpath(part_name, 'ppt'))
+                    etree.SubElement(self._content_types, f'{{{_CONTENT_TYPES}}}Override',
+                                     PartName=f'/{part_name}', ContentType=SLIDE_CONTENT_TYPE)
+                    slide_id = etree.Element(f'{{{_P}}}sldId', id=str(next_slide_id))
+                    slide_id.set(f'{{{_R}}}id', rel_id)
+                    next_slide_id += 1
+                    ref = SlideRef(slide_id, part_name)
+                written[ref.part_name] = slide_xml
+                written[_rels_name(ref.part_name)] = rels_xml
+            kept.add(ref.part_name)
+            order.append(ref)
+
+        removed = {ref.part_name for ref in self.slides} - kept
+        if removed:
+            rel_ids = {ref.slide_id.get(f'{{{_R}}}id') for ref in self.slides if ref.part_name in removed}
+            for rel in list(self._relationships):
+                if rel.get('Id') in rel_ids:
+                    self._relationships.remove(rel)
+            for override in list(self._content_types):
+                if override.get('PartName', '').lstrip('/') in removed:
+                    self._content_types.remove(override)
+
+        if [ref.slide_id for ref in order] != list(self._slide_list):
+            for slide_id in list(self._slide_list):
+                self._slide_list.remove(slide_id)
+            self._slide_list.extend(ref.slide_id for ref in order)
+            written[_PRESENTATION] = _serialize(self._presentation)
+        if removed or any(ref not in self.slides for ref in order):
+            written[_PRESENTATION_RELS] = _serialize(self._relationships)
+            written[_CONTENT_TYPES_ITEM] = _serialize(self._content_types)
+
+        dropped = removed | {_rels_name(name) for name in removed}
+        self.slides = order
+        return self._write(written, dropped)
+
+    def _write(self, written, dropped):
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as target:
+            for info in self._zip.infolist():
+                if info.filename in dropped:
+                    continue
+                if info.filename in written:
+                    target.writestr(info.filename, written.pop(info.filename))
+                else:
+                    self._copy_raw(info, target)
+            # New slides go after everything that was already there
+            for name, data in written.items():
+                target.writestr(name, data)
+        self._data = buffer.getvalue()
+        self._zip = zipfile.ZipFile(BytesIO(self._data))
+        return self._data
+
+    def _copy_raw(self, info, target):
+        """Copy one entry's compressed bytes into ``target`` without inflating them."""
+        fields = struct.unpack(zipfile.structFileHeader,
+                               self._data[info.header_offset:info.header_offset + zipfile.sizeFileHeader])
+        start = info.header_offset + zipfile.sizeFileHeader + fields[10] + fields[11]  # Name and extra lengths
+        raw = self._data[start:start + info.compress_size]
+
+        # ZipFile has no public call for this, so write the entry the way writestr does
+        entry = copy.copy(info)
+        entry.flag_bits &= ~_DATA_DESCRIPTOR_FLAG
+        entry.extra = b''
+        entry.header_offset = target.fp.tell()
+        target.fp.write(entry.FileHeader())
+        target.fp.write(raw)
+        target.filelist.append(entry)
+        target.NameToInfo[entry.filename] = entry
+        target.start_dir = target.fp.tell()
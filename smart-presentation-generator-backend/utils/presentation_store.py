@@ -0,0 +1,219 @@
+# utils/presentation_store.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from models.presentation import Presentation
+from utils.metrics import registry
+from config import PRESENTATION_DB_PATH, PRESENTATION_RETENTION, PRESENTATION_MAX_ENTRIES
+
+# Saves prune old decks at most this often, in seconds
+PRUNE_INTERVAL = 60
+
+
+def _normalize(text):
+    return ' '.join(str(text or '').split()).casefold()
+
+
+def topic_hash(topic):
+    """Return the lookup key for a topic, ignoring case and whitespace differences."""
+    return hashlib.sha256(_normalize(topic).encode('utf-8')).hexdigest()
+
+
+class PresentationStore:
+    """Record of generated decks in SQLite: the spec, slide content, theme and artifact name.
+
+    The slide content is what makes a deck reproducible: a deck whose artifact
+    has expired, or that is wanted in another theme, can be rendered again
+    without calling Gemini. The database runs in WAL mode so lookups don't wait
+    on writes from other threads or worker processes.
+
+    Decks older than ``retention`` seconds and the oldest beyond
+    ``max_entries`` are deleted as new ones are saved (0 disables either limit).
+    """
+
+    def __init__(self, path, retention=0, max_entries=0):
+        self.path = path
+        self.retention = retention
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._pruned_at = 0.0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = None
+        self._pid = None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS presentations ("
+                "id TEXT PRIMARY KEY, topic_hash TEXT NOT NULL, title TEXT NOT NULL, "
+                "description TEXT NOT NULL, requested_slides INTEGER, theme TEXT NOT NULL, "
+                "slides TEXT NOT NULL, file_name TEXT, created_at TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_presentations_topic ON presentations (topic_hash, created_at)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_presentations_theme ON presentations (theme, created_at)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_presentations_created_at ON presentations (created_at)"
+            )
+
+    @property
+    def _conn(self):
+        # Like the response cache's disk tier, each process opens its own connection
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._pid = os.getpid()
+        return self._connection
+
+    def save(self, topic, description, theme, slides, file_name, requested_slides=None):
+        """Record a generated deck and return it as a Presentation."""
+        presentation = Presentation(
+            id=uuid.uuid4().hex,
+            title=topic,
+            description=description or '',
+            theme=theme,
+            slides=slides,
+            created_at=datetime.now().isoformat(),
+            file_name=file_name
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO presentations (id, topic_hash, title, description, requested_slides, theme, "
+                "slides, file_name, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (presentation.id, topic_hash(topic), presentation.title, presentation.description,
+                 requested_slides, theme, json.dumps(slides), file_name, presentation.created_at)
+            )
+        if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+            self.prune()
+        return presentation
+
+    def prune(self):
+        """Delete decks past the retention period and the oldest beyond the size limit; return how many."""
+        self._pruned_at = time.monotonic()
+        deleted = 0
+        with self._lock, self._conn:
+            if self.retention:
+                cutoff = (datetime.now() - timedelta(seconds=self.retention)).isoformat()
+                deleted += self._conn.execute(
+                    "DELETE FROM presentations WHERE created_at < ?", (cutoff,)
+                ).rowcount
+            if self.max_entries:
+                deleted += self._conn.execute(
+                    "DELETE FROM presentations WHERE id IN ("
+                    "SELECT id FROM presentations ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                ).rowcount
+        if deleted:
+            print(f"[{datetime.now()}] Pruned {deleted} stored presentations")
+        return deleted
+
+    def get(self, presentation_id):
+        """Return the stored Presentation with this id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, title, description, theme, slides, created_at, file_name "
+                "FROM presentations WHERE id = ?", (presentation_id,)
+            ).fetchone()
+        return self._to_presentation(row) if row else None
+
+    def find(self, topic, description, requested_slides=None, max_age=None):
+        """Return the newest deck generated for the same topic, description and slide count.
+
+        Topics and descriptions match regardless of case and whitespace. With
+        ``max_age`` (seconds), older decks are ignored.
+        """
+        query = ("SELECT id, title, description, theme, slides, created_at, file_name FROM presentations "
+                 "WHERE topic_hash = ? AND requested_slides IS ?")
+        params = [topic_hash(topic), requested_slides]
+        if max_age:
+            query += " AND created_at >= ?"
+            params.append((datetime.now() - timedelta(seconds=max_age)).isoformat())
+        query += " ORDER BY created_at DESC"
+
+        wanted = _normalize(description)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        for row in rows:
+            if _normalize(row[2]) == wanted:
+                return self._to_presentation(row)
+        return None
+
+    def list(self, limit=20, offset=0, theme=None, topic=None):
+        """Return stored decks, newest first, optionally only those with a theme or topic."""
+        query = "SELECT id, title, description, theme, slides, created_at, file_name FROM presentations"
+        conditions = []
+        params = []
+        if theme:
+            conditions.append("theme = ?")
+            params.append(theme)
+        if topic:
+            conditions.append("topic_hash = ?")
+            params.append(topic_hash(topic))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._to_presentation(row) for row in rows]
+
+    def set_file_name(self, presentation_id, file_name):
+        """Point a stored deck at a newly rendered artifact."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE presentations SET file_name = ? WHERE id = ?", (file_name, presentation_id)
+            )
+
+    def update_slides(self, presentation_id, slides, file_name):
+        """Replace a stored deck's slide content and point it at the artifact rendered from it."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE presentations SET slides = ?, file_name = ? WHERE id = ?",
+                (json.dumps(slides), file_name, presentation_id)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM presentations").fetchone()[0]
+
+    @staticmethod
+    def _to_presentation(row):
+        presentation_id, title, description, theme, slides, created_at, file_name = row
+        return Presentation(
+            id=presentation_id,
+            title=title,
+            description=description,
+            theme=theme,
+            slides=json.loads(slides),
+            created_at=created_at,
+            file_name=file_name
+        )
+
+
+# Shared store, or None if PRESENTATION_DB_PATH is empty
+presentation_store = PresentationStore(
+    PRESENTATION_DB_PATH,
+    retention=PRESENTATION_RETENTION,
+    max_entries=PRESENTATION_MAX_ENTRIES
+) if PRESENTATION_DB_PATH else None
+
+
+@registry.register_collector
+def _collect_presentation_metrics():
+    if presentation_store is None:
+        return []
+    return [
+        ('stored_presentations', 'gauge', 'Decks recorded in the presentation store.',
+         [({}, len(presentation_store))]),
+    ]
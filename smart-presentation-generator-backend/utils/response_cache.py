@@ -0,0 +1,190 @@
+# utils/response_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_cache_key(prompt, model_name):
+    """Build a content-addressed key from the normalized prompt and the model name."""
+    # Collapse whitespace so indentation changes in the prompt templates don't bust the cache
+    normalized = ' '.join(prompt.split())
+    return hashlib.sha256(f"{model_name}\n{normalized}".encode('utf-8')).hexdigest()
+
+
+class MemoryTier:
+    """In-process LRU tier with TTL and entry-count eviction."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=1024, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SqliteTier:
+    """On-disk tier backed by SQLite so cached responses survive restarts."""
+
+    name = 'disk'
+
+    def __init__(self, path, max_entries=10000, ttl=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = None
+        self._pid = None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)"
+            )
+
+    @property
+    def _conn(self):
+        # A connection must not be shared across fork (e.g. by a preloading
+        # app server), so each process opens its own on first use
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key):
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at < now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now)
+            )
+            # Drop expired rows, then the least recently used ones beyond the size limit
+            self._conn.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """Tiered cache of model responses keyed on the normalized prompt plus model name.
+
+    Tiers are checked in order; a hit in a slower tier is copied into the
+    faster ones. Any object with ``name``, ``get``, ``set`` and ``clear`` can
+    be used as a tier.
+    """
+
+    def __init__(self, tiers):
+        self.tiers = list(tiers)
+        self._lock = threading.Lock()
+        self._hits = {tier.name: 0 for tier in self.tiers}
+        self._misses = 0
+
+    def get(self, prompt, model_name):
+        """Return the cached response for a prompt, or None on a miss."""
+        key = make_cache_key(prompt, model_name)
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                # Promote into the faster tiers
+                for faster in self.tiers[:index]:
+                    faster.set(key, value)
+                with self._lock:
+                    self._hits[tier.name] += 1
+                return value
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def set(self, prompt, model_name, value):
+        """Store a response in every tier."""
+        key = make_cache_key(prompt, model_name)
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self):
+        """Return hit/miss counters, the hit rate and the size of each tier."""
+        with self._lock:
+            hits = dict(self._hits)
+            misses = self._misses
+        lookups = sum(hits.values()) + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': (sum(hits.values()) / lookups) if lookups else 0.0,
+            'sizes': {tier.name: len(tier) for tier in self.tiers}
+        }
+
+
+def build_response_cache(max_entries, ttl=None, disk_path=None, disk_max_entries=10000):
+    """Build the default cache: an LRU memory tier plus an optional SQLite tier."""
+    tiers = [MemoryTier(max_entries=max_entries, ttl=ttl)]
+    if disk_path:
+        tiers.append(SqliteTier(disk_path, max_entries=disk_max_entries, ttl=ttl))
+    return ResponseCache(tiers)
@@ -0,0 +1,209 @@
+# utils/response_parser.py
+import json
+import re
+from utils.json_stream import JSONArrayStream
+from utils.tracing import traced
+
+# Precompiled patterns used by the parser
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_NON_WHITESPACE = re.compile(r'\S')
+_THEME_FIELD = re.compile(r'"theme"\s*:\s*"([^"]*)"')
+
+# Markdown fallback patterns
+_TITLE_LINE = re.compile(r'^(?:#{1,3} |(?:\*\*)?Slide \d+|\d+\.)')
+_TITLE_PREFIX = re.compile(r'^(?:#{1,3}\s+)?(?:\*\*)?(?:Slide \d+\s*[:.-]?\s*|\d+\.\s*)?')
+_BULLET_LINE = re.compile(r'^(?:[-*•] |\d+\))\s*')
+_VISUAL_PREFIX = re.compile(r'^(?:visual note|visual|image):?\s*', re.IGNORECASE)
+
+
+@traced('parse_slide_response')
+def parse_slide_response(response):
+    """Parse a model response into a list of slide dicts.
+
+    The first JSON array of slide objects in the response (fenced or not) is
+    located with a single bracket-balanced scan and validated against the
+    slide schema. If the response holds no usable JSON, slides are recovered
+    from markdown headings and bullets instead.
+    """
+    slides = validate_slides(extract_json_array(response))
+    if slides:
+        return slides
+    return parse_markdown_slides(response)
+
+
+def extract_json_array(text):
+    """Return the first decodable JSON array of objects in ``text``, or None.
+
+    Candidate arrays start at a ``[`` followed by ``{``; the matching ``]`` is
+    found by tracking nesting depth and string state, so the scan is linear in
+    the length of the text. If a balanced array doesn't decode as a whole, its
+    well-formed elements are salvaged.
+    """
+    position = 0
+    while True:
+        start = text.find('[', position)
+        if start == -1:
+            return None
+        following = _NON_WHITESPACE.search(text, start + 1)
+        if following is None:
+            return None
+        if following.group() != '{':
+            position = start + 1
+            continue
+
+        end = _find_closing_bracket(text, start)
+        candidate = text[start:end] if end is not None else text[start:]
+        try:
+            items = json.loads(candidate)
+            if isinstance(items, list):
+                return items
+        except json.JSONDecodeError:
+            pass
+
+        # Truncated or partly malformed array: keep the elements that do decode
+        items = JSONArrayStream().feed(candidate)
+        if items:
+            return items
+        position = start + 1
+
+
+def _find_closing_bracket(text, start):
+    """Return the index just past the bracket closing the one at ``start``, or None."""
+    depth = 0
+    position = start
+    in_string = False
+    while True:
+        if in_string:
+            match = _STRING_SPECIAL.search(text, position)
+            if match is None:
+                return None
+            if match.group() == '\\':
+                position = match.end() + 1
+                continue
+            in_string = False
+            position = match.end()
+            continue
+
+        match = _STRUCTURAL.search(text, position)
+        if match is None:
+            return None
+        char = match.group()
+        position = match.end()
+        if char == '"':
+            in_string = True
+        elif char in '[{':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return position
+
+
+def extract_theme_field(text):
+    """Return the lowercased value of a top-level ``"theme"`` field in the response, or None."""
+    match = _THEME_FIELD.search(text)
+    if match is None:
+        return None
+    return match.group(1).strip().lower() or None
+
+
+def validate_slides(items):
+    """Normalize decoded items to the slide schema, dropping anything unusable.
+
+    Each slide has a string ``title``, a list of ``content`` bullets and a
+    string ``visual_note``. Bullets are strings, except nested or emphasized
+    ones, which are dicts with ``text``, ``level`` and optional ``runs``.
+    """
+    if not isinstance(items, list):
+        return []
+
+    slides = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        title = item.get('title')
+        content = item.get('content', [])
+        if isinstance(content, str):
+            content = [content]
+        elif not isinstance(content, list):
+            content = []
+        content = [bullet for bullet in map(_normalize_bullet, content) if bullet]
+        title = str(title).strip() if title is not None else ''
+        if not title and not content:
+            continue
+        visual_note = item.get('visual_note') or ''
+        slides.append({
+            'title': title,
+            'content': content,
+            'visual_note': str(visual_note).strip()
+        })
+    return slides
+
+
+def _normalize_bullet(point):
+    """Return a bullet as a stripped string, a dict for nested/emphasized bullets, or None if empty."""
+    if point is None:
+        return None
+    if not isinstance(point, dict):
+        return str(point).strip() or None
+
+    try:
+        level = min(max(int(point.get('level') or 0), 0), 8)
+    except (TypeError, ValueError):
+        level = 0
+    runs = [
+        {'text': str(run.get('text', '')), 'bold': bool(run.get('bold')), 'italic': bool(run.get('italic'))}
+        for run in point.get('runs') or [] if isinstance(run, dict) and run.get('text')
+    ]
+    text = ''.join(run['text'] for run in runs) if runs else str(point.get('text') or '').strip()
+    if not text.strip():
+        return None
+    if point.get('bold') or point.get('italic'):
+        runs = [{'text': text, 'bold': bool(point.get('bold')), 'italic': bool(point.get('italic'))}]
+    if not level and not runs:
+        return text
+    bullet = {'text': text, 'level': level}
+    if runs:
+        bullet['runs'] = runs
+    return bullet
+
+
+def parse_markdown_slides(response):
+    """Recover slides from a markdown-style response (headings, bullets, visual notes)."""
+    slides = []
+    current_slide = None
+
+    for line in response.split('\n'):
+        line = line.strip()
+
+        # Skip empty lines
+        if not line:
+            continue
+
+        # Check for slide title
+        if _TITLE_LINE.match(line):
+            # Save the previous slide if it exists
+            if current_slide:
+                slides.append(current_slide)
+            title = _TITLE_PREFIX.sub('', line, count=1).strip('* ')
+            current_slide = {'title': title, 'content': [], 'visual_note': ''}
+            continue
+
+        if current_slide is None:
+            continue
+
+        # Check for bullet points
+        bullet = _BULLET_LINE.match(line)
+        if bullet:
+            current_slide['content'].append(line[bullet.end():])
+
+        # Check for visual notes
+        elif line.lower().startswith('visual') or 'image:' in line.lower():
+            current_slide['visual_note'] = _VISUAL_PREFIX.sub('', line, count=1).strip()
+
+    # Add the last slide
+    if current_slide:
+        slides.append(current_slide)
+
+    return slides
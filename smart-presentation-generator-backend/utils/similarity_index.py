@@ -0,0 +1,240 @@
+# utils/similarity_index.py
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from utils.metrics import registry
+from config import (SIMILAR_TOPIC_CACHE_ENABLED, SIMILAR_TOPIC_THRESHOLD, SIMILAR_TOPIC_MAX_ENTRIES,
+                    SIMILAR_TOPIC_DB_PATH)
+
+NUM_PERM = 64
+BANDS = 16  # 4 rows per band: pairs above ~0.5 similarity very likely share a bucket
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed, so signatures stored by an earlier process stay comparable
+_random = random.Random(20250301)
+_PERMUTATIONS = [(_random.randrange(1, _PRIME), _random.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_WORD = re.compile(r'\w+')
+_STOPWORDS = frozenset('a an and as at by for from in into of on or the to with about its our your how what why'.split())
+# Words are cut to this many characters, so "intro" matches "introduction" and "learn" matches "learning"
+_STEM_LENGTH = 5
+_MAX_TEXT = 2000
+
+
+def topic_tokens(topic, description=''):
+    """Return the set of word tokens a topic and description are compared on.
+
+    Words are lowercased, stopwords dropped and the rest cut to a short
+    prefix, so wording variants of the same topic share their tokens.
+    """
+    text = f"{topic} {description or ''}"[:_MAX_TEXT].lower()
+    # Words with digits ("q3", "2024") are kept whole, so they still tell requests apart
+    return {word if any(c.isdigit() for c in word) else word[:_STEM_LENGTH]
+            for word in _WORD.findall(text) if word not in _STOPWORDS}
+
+
+def minhash(tokens):
+    """Return the MinHash signature (NUM_PERM 32-bit values) of a token set."""
+    hashes = [int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+              for token in tokens] or [0]
+    return tuple(min(((a * value + b) % _PRIME) & _MAX_HASH for value in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(signature, other):
+    """Estimate the Jaccard similarity of two token sets from their signatures."""
+    return sum(1 for x, y in zip(signature, other) if x == y) / len(signature)
+
+
+class SimilarityIndex:
+    """Near-duplicate lookup of earlier (topic, description) requests and the slides generated for them.
+
+    Inputs are reduced to token sets and MinHash signatures, which are split
+    into LSH bands; a lookup only compares against entries sharing a band
+    bucket, so it stays well under a millisecond however many entries there
+    are. At most ``max_entries`` are kept, least recently used first out.
+    With a ``path`` the entries are kept in SQLite and loaded on first use.
+    """
+
+    def __init__(self, threshold=0.7, max_entries=5000, path=None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict()
+        self._buckets = [{} for _ in range(BANDS)]
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._connection = None
+        self._pid = None
+        self._hits = 0
+        self._misses = 0
+
+    def query(self, topic, description='', num_slides=None):
+        """Return ``(entry, similarity)`` for the closest earlier request at or above the threshold, or None.
+
+        An entry is a dict with the ``topic``, ``description``, ``theme`` and
+        ``slides`` of the earlier request. Only entries generated for the same
+        slide count are considered.
+        """
+        signature = minhash(topic_tokens(topic, description))
+        slide_count = str(num_slides or '')
+        with self._lock:
+            self._load()
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+
+            best, best_similarity = None, 0.0
+            for key in candidates:
+                entry = self._entries[key]
+                if entry['num_slides'] != slide_count:
+                    continue
+                score = similarity(signature, entry['signature'])
+                if score > best_similarity:
+                    best, best_similarity = key, score
+
+            if best is None or best_similarity < self.threshold:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(best)
+            entry = self._entries[best]
+            if self.path:
+                # Keep the stored order in step, so a reload keeps the entries still in use
+                with self._conn:
+                    self._conn.execute("UPDATE similar_topics SET used_at = ? WHERE key = ?", (time.time(), best))
+        return {name: entry[name] for name in ('topic', 'description', 'theme', 'slides')}, best_similarity
+
+    def add(self, topic, description, slides, theme=None, num_slides=None):
+        """Record the slides generated for a request."""
+        tokens = topic_tokens(topic, description)
+        slide_count = str(num_slides or '')
+        key = hashlib.sha256(f"{' '.join(sorted(tokens))}\n{slide_count}".encode('utf-8')).hexdigest()
+        entry = {
+            'topic': topic,
+            'description': description or '',
+            'theme': theme,
+            'slides': slides,
+            'num_slides': slide_count,
+            'signature': minhash(tokens)
+        }
+        with self._lock:
+            self._load()
+            self._insert(key, entry)
+            evicted = self._evict()
+            if self.path:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO similar_topics (key, topic, description, theme, num_slides, slides, "
+                        "signature, used_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, entry['topic'], entry['description'], theme, slide_count, json.dumps(slides),
+                         array('I', entry['signature']).tobytes(), time.time())
+                    )
+                    self._conn.executemany("DELETE FROM similar_topics WHERE key = ?", [(k,) for k in evicted])
+
+    def stats(self):
+        """Return lookup hits, misses, the hit rate and the number of entries."""
+        with self._lock:
+            self._load()
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': (self._hits / lookups) if lookups else 0.0
+            }
+
+    @property
+    def _conn(self):
+        # Each process opens its own connection, like the other SQLite stores
+        if self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._pid = os.getpid()
+        return self._connection
+
+    def _load(self):
+        # Entries are read from disk on first use rather than at import, to keep startup fast
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path:
+            return
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS similar_topics ("
+                "key TEXT PRIMARY KEY, topic TEXT NOT NULL, description TEXT NOT NULL, theme TEXT, "
+                "num_slides TEXT NOT NULL, slides TEXT NOT NULL, signature BLOB NOT NULL, used_at REAL NOT NULL)"
+            )
+            rows = self._conn.execute(
+                "SELECT key, topic, description, theme, num_slides, slides, signature FROM similar_topics "
+                "ORDER BY used_at DESC LIMIT ?", (self.max_entries,)
+            ).fetchall()
+        for key, topic, description, theme, num_slides, slides, signature in reversed(rows):
+            signature = tuple(array('I', signature))
+            if len(signature) != NUM_PERM:
+                signature = minhash(topic_tokens(topic, description))
+            self._insert(key, {'topic': topic, 'description': description, 'theme': theme,
+                               'slides': json.loads(slides), 'num_slides': num_slides, 'signature': signature})
+
+    def _insert(self, key, entry):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        for band, band_key in enumerate(self._band_keys(entry['signature'])):
+            self._buckets[band].setdefault(band_key, set()).add(key)
+
+    def _evict(self):
+        evicted = []
+        while len(self._entries) > self.max_entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            evicted.append(key)
+        return evicted
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        for band, band_key in enumerate(self._band_keys(entry['signature'])):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    @staticmethod
+    def _band_keys(signature):
+        rows = NUM_PERM // BANDS
+        return [signature[band * rows:(band + 1) * rows] for band in range(BANDS)]
+
+
+# Shared index of generated slide content, or None if disabled
+similar_topics = SimilarityIndex(
+    threshold=SIMILAR_TOPIC_THRESHOLD,
+    max_entries=SIMILAR_TOPIC_MAX_ENTRIES,
+    path=SIMILAR_TOPIC_DB_PATH or None
+) if SIMILAR_TOPIC_CACHE_ENABLED else None
+
+
+@registry.register_collector
+def _collect_similarity_metrics():
+    if similar_topics is None:
+        return []
+    stats = similar_topics.stats()
+    return [
+        ('similar_topic_lookups_total', 'counter', 'Near-duplicate topic lookups by result.',
+         [({'result': 'hit'}, stats['hits']), ({'result': 'miss'}, stats['misses'])]),
+        ('similar_topic_hit_ratio', 'gauge', 'Share of near-duplicate topic lookups that hit.',
+         [({}, stats['hit_rate'])]),
+        ('similar_topic_entries', 'gauge', 'Requests held in the near-duplicate topic index.',
+         [({}, stats['entries'])]),
+    ]
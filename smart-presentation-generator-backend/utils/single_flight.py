@@ -0,0 +1,64 @@
+# utils/single_flight.py
+import threading
+from utils.metrics import coalesced_requests, coalesce_timeouts
+
+
+class CoalesceTimeoutError(TimeoutError):
+    """Raised when a request waited too long on an identical request already in flight."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; identical concurrent calls share its outcome.
+
+    The first caller for a key (the leader) runs the function. Callers that
+    arrive with the same key while it runs wait up to ``timeout`` seconds and
+    get the leader's result, or its exception, instead of doing the work again.
+    ``name`` labels the coalesced-request counters.
+    """
+
+    def __init__(self, name, timeout=None):
+        self.name = name
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """Return ``(result, shared)``; ``shared`` is True if another caller's result was used."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            coalesced_requests.inc(kind=self.name)
+            if not call.done.wait(self.timeout):
+                coalesce_timeouts.inc(kind=self.name)
+                raise CoalesceTimeoutError(
+                    f"Timed out after {self.timeout}s waiting for an identical {self.name} request")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self):
+        """Return the number of keys currently being worked on."""
+        with self._lock:
+            return len(self._calls)
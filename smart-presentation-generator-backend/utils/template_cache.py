@@ -0,0 +1,222 @@
+# utils/template_cache.py
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.oxml.ns import qn
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.text.text import Font
+from pptx.util import Emu, Pt
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+import threading
+from utils.metrics import registry
+from utils.text_fit import TextBox
+from config import TEMPLATE_POOL_SIZE
+
+# Template package bytes: the default template under None, themed variants by theme key.
+# Parsing these costs about the same as parsing the package from disk; they are kept so
+# each themed master is built once, and the time saved per request comes from TemplatePool.
+_templates = {}
+_templates_lock = threading.Lock()
+
+_TITLE_PLACEHOLDERS = (PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE)
+_BODY_PLACEHOLDERS = (PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT, PP_PLACEHOLDER.SUBTITLE)
+
+def theme_key(theme_settings):
+    """Return a hashable key identifying a theme settings dict."""
+    return tuple(sorted(theme_settings.items()))
+
+def get_default_template():
+    """Return the python-pptx default template as .pptx bytes, read from disk once."""
+    template = _templates.get(None)
+    if template is None:
+        with _templates_lock:
+            template = _templates.get(None)
+            if template is None:
+                buffer = BytesIO()
+                Presentation().save(buffer)
+                template = _templates[None] = buffer.getvalue()
+    return template
+
+def get_themed_template(theme_settings):
+    """Return the default template as .pptx bytes with the theme baked into its slide master.
+    
+    The master background, title style and body style (and the layout placeholders
+    that override them) carry the theme's colors and fonts, so slides built on it
+    inherit the styling. Built once per theme and cached.
+    """
+    key = theme_key(theme_settings)
+    template = _templates.get(key)
+    if template is None:
+        with _templates_lock:
+            template = _templates.get(key)
+            if template is None:
+                prs = Presentation()
+                _apply_theme_to_master(prs, theme_settings)
+                buffer = BytesIO()
+                prs.save(buffer)
+                template = _templates[key] = buffer.getvalue()
+    return template
+
+def _apply_theme_to_master(prs, theme_settings):
+    """Bake theme settings into the slide master and its layouts."""
+    master = prs.slide_master
+    
+    # Background color inherited by every layout and slide
+    fill = master.background.fill
+    fill.solid()
+    fill.fore_color.rgb = RGBColor(*theme_settings['background_color'])
+    
+    title_style = (theme_settings['title_font_size'], theme_settings['title_font'], theme_settings['title_color'])
+    content_style = (theme_settings['content_font_size'], theme_settings['content_font'], theme_settings['content_color'])
+    
+    # Master text styles
+    tx_styles = master._element.find(qn('p:txStyles'))
+    for level in tx_styles.find(qn('p:titleStyle')):
+        _style_level(level, *title_style)
+    for level in tx_styles.find(qn('p:bodyStyle')):
+        _style_level(level, *content_style)
+    
+    # Layout placeholders that override the master styles
+    for layout in prs.slide_layouts:
+        for placeholder in layout.placeholders:
+            placeholder_type = placeholder.placeholder_format.type
+            if placeholder_type in _TITLE_PLACEHOLDERS:
+                style = title_style
+            elif placeholder_type in _BODY_PLACEHOLDERS:
+                style = content_style
+            else:
+                continue
+            list_style = placeholder._element.txBody.find(qn('a:lstStyle'))
+            if list_style is not None:
+                for level in list_style:
+                    _style_level(level, *style)
+
+def _style_level(level_properties, font_size, font_name, color):
+    """Set the default run properties of one list level (``a:lvlNpPr``)."""
+    def_rpr = level_properties.find(qn('a:defRPr'))
+    if def_rpr is None:
+        def_rpr = OxmlElement('a:defRPr')
+        level_properties.append(def_rpr)
+    font = Font(def_rpr)
+    font.size = Pt(font_size)
+    font.name = font_name
+    font.color.rgb = RGBColor(*color)
+
+class TemplatePool:
+    """Per-theme pool of pre-parsed, untouched Presentation objects.
+    
+    ``acquire`` hands out a ready presentation without unzipping or parsing a
+    template on the request path (the parse, ~6 ms, is what the pool saves);
+    a background thread parses a replacement from the cached template bytes.
+    When a pool is empty the presentation is parsed inline from those bytes,
+    which is no faster than parsing from disk.
+    """
+    
+    def __init__(self, size=TEMPLATE_POOL_SIZE):
+        self.size = size
+        self._pools = {}
+        self._lock = threading.Lock()
+        self._refilling = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='template-pool')
+    
+    def acquire(self, theme_settings=None):
+        """Return a fresh Presentation, themed if ``theme_settings`` is given."""
+        key = theme_key(theme_settings) if theme_settings else None
+        with self._lock:
+            pool = self._pools.get(key)
+            prs = pool.popleft() if pool else None
+        
+        self._schedule_refill(key, theme_settings)
+        if prs is None:
+            prs = _parse_template(theme_settings)
+        return prs
+    
+    def warm(self, theme_settings_list=(), include_default=True):
+        """Fill the pools for the given themes (and the unthemed default) synchronously."""
+        targets = [None] if include_default else []
+        targets.extend(theme_settings_list)
+        for theme_settings in targets:
+            key = theme_key(theme_settings) if theme_settings else None
+            self._refill(key, theme_settings)
+    
+    def stats(self):
+        """Return the number of ready presentations per pool."""
+        with self._lock:
+            return {('default' if key is None else dict(key).get('description', str(key))): len(pool)
+                    for key, pool in self._pools.items()}
+    
+    def _schedule_refill(self, key, theme_settings):
+        if self.size <= 0:
+            return
+        with self._lock:
+            if key in self._refilling or len(self._pools.get(key, ())) >= self.size:
+                return
+            self._refilling.add(key)
+        self._executor.submit(self._refill, key, theme_settings)
+    
+    def _refill(self, key, theme_settings):
+        try:
+            while True:
+                with self._lock:
+                    pool = self._pools.setdefault(key, deque())
+                    if len(pool) >= self.size:
+                        return
+                prs = _parse_template(theme_settings)
+                with self._lock:
+                    pool.append(prs)
+        finally:
+            with self._lock:
+                self._refilling.discard(key)
+
+def _parse_template(theme_settings=None):
+    """Parse a new Presentation from the cached template bytes."""
+    template = get_themed_template(theme_settings) if theme_settings else get_default_template()
+    return Presentation(BytesIO(template))
+
+@lru_cache(maxsize=32)
+def layout_text_box(layout_type, placeholder_index=1):
+    """Return the TextBox of a layout's text placeholder, read from the default template once.
+
+    The size is the placeholder's less its insets; level margins come from the
+    placeholder's own list style or the master's body style. Themed templates
+    share the default template's geometry. Returns None if the layout has no
+    such placeholder.
+    """
+    prs = _parse_template()
+    layout = prs.slide_layouts[layout_type]
+    placeholder = next((shape for shape in layout.placeholders
+                        if shape.placeholder_format.idx == placeholder_index), None)
+    if placeholder is None or placeholder.width is None:
+        return None
+    
+    body_pr = placeholder._element.txBody.find(qn('a:bodyPr'))
+    insets = {name: int(body_pr.get(name, default)) for name, default in
+              (('lIns', 91440), ('rIns', 91440), ('tIns', 45720), ('bIns', 45720))}
+    list_style = placeholder._element.txBody.find(qn('a:lstStyle'))
+    body_style = prs.slide_master._element.find(qn('p:txStyles')).find(qn('p:bodyStyle'))
+    margins = []
+    for level in range(1, 10):
+        properties = list_style.find(qn(f'a:lvl{level}pPr')) if list_style is not None else None
+        if properties is None or properties.get('marL') is None:
+            properties = body_style.find(qn(f'a:lvl{level}pPr'))
+        margins.append(Emu(int(properties.get('marL', 0))).pt if properties is not None else 0)
+    
+    return TextBox(
+        width=Emu(placeholder.width - insets['lIns'] - insets['rIns']).pt,
+        height=Emu(placeholder.height - insets['tIns'] - insets['bIns']).pt,
+        level_margins=margins
+    )
+
+# Shared pool used by PPTGenerator
+template_pool = TemplatePool()
+
+
+@registry.register_collector
+def _collect_template_metrics():
+    return [
+        ('template_pool_ready', 'gauge', 'Pre-parsed template presentations ready per theme.',
+         [({'theme': theme}, count) for theme, count in template_pool.stats().items()]),
+    ]
@@ -0,0 +1,191 @@
+# utils/text_fit.py
+import unicodedata
+from functools import lru_cache
+
+# Advance widths in 1/1000 em of the printable ASCII characters (space to tilde),
+# from the standard AFM metrics of Helvetica (which Arial matches) and Times
+_HELVETICA = (
+    "278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 556 556 "
+    "278 278 584 584 584 556 1015 667 667 722 722 667 611 778 722 278 500 667 556 833 722 778 667 778 722 667 "
+    "611 722 667 944 667 667 611 278 278 278 469 556 333 556 556 500 556 556 278 556 556 222 222 500 222 833 "
+    "556 556 556 556 333 500 278 556 500 722 500 500 500 334 260 334 584"
+)
+_TIMES = (
+    "250 333 408 500 500 833 778 180 333 333 500 564 250 333 250 278 500 500 500 500 500 500 500 500 500 500 "
+    "278 278 564 564 564 444 921 722 667 667 722 611 556 722 722 333 389 722 611 889 722 722 556 722 667 556 "
+    "611 722 722 944 722 722 611 333 278 333 469 500 333 444 500 444 500 444 333 500 500 278 278 500 278 778 "
+    "500 500 500 500 333 389 278 500 500 722 500 500 444 480 200 480 541"
+)
+
+# Fonts used by the themes, as (base table, scale); fonts without AFM metrics here
+# are approximated by the closest table scaled to their average character width.
+# None is a monospaced font with the given advance for every character.
+FONTS = {
+    'arial': (_HELVETICA, 1.0),
+    'helvetica': (_HELVETICA, 1.0),
+    'calibri': (_HELVETICA, 0.9),
+    'verdana': (_HELVETICA, 1.13),
+    'georgia': (_TIMES, 1.12),
+    'times new roman': (_TIMES, 1.0),
+    'consolas': (None, 550),
+}
+DEFAULT_FONT = 'arial'
+
+BOLD_FACTOR = 1.06  # Bold runs are about this much wider
+LINE_HEIGHT = 1.2  # Single-spaced line height, in font sizes
+PARAGRAPH_SPACING = 0.2  # Space before each paragraph after the first, in line heights
+
+_WIDTH_TABLES = {}
+
+
+class TextBox:
+    """Usable area of a text placeholder, in points, and the left margin of each bullet level."""
+
+    def __init__(self, width, height, level_margins=(0,)):
+        self.width = width
+        self.height = height
+        self.level_margins = tuple(level_margins) or (0,)
+        self._line_widths = tuple(width - margin for margin in self.level_margins)
+
+    def line_width(self, level):
+        return self._line_widths[min(level, len(self._line_widths) - 1)]
+
+
+def width_table(font_name):
+    """Return the advance widths (1/1000 em) of a font as a dict, built once per font."""
+    key = (font_name or DEFAULT_FONT).lower()
+    if key not in FONTS:
+        key = DEFAULT_FONT
+    table = _WIDTH_TABLES.get(key)
+    if table is None:
+        base, scale = FONTS[key]
+        if base is None:
+            table = {chr(code): scale for code in range(32, 127)}
+        else:
+            table = {chr(code): int(width) * scale for code, width in enumerate(base.split(), start=32)}
+        table = _WIDTH_TABLES[key] = table
+    return table
+
+
+@lru_cache(maxsize=65536)
+def word_width(font_name, word):
+    """Return the width of a word in 1/1000 em."""
+    table = width_table(font_name)
+    total = 0.0
+    for char in word:
+        width = table.get(char)
+        if width is None:
+            # Wide (CJK) characters take a full em, anything else an average letter
+            width = 1000 if unicodedata.east_asian_width(char) in 'WF' else table['n']
+        total += width
+    return total
+
+
+@lru_cache(maxsize=16384)
+def line_word_widths(font_name, text):
+    """Return the widths of the words of each line of ``text`` (split at explicit line breaks).
+
+    This is the size-independent part of wrapping, measured once per text.
+    """
+    return tuple(tuple(word_width(font_name, word) for word in segment.split(' ')) for segment in text.split('\n'))
+
+
+@lru_cache(maxsize=65536)
+def line_count(font_name, text, limit):
+    """Return how many lines ``text`` wraps to within ``limit`` (1/1000 em), breaking at spaces.
+
+    Explicit line breaks start new lines, and words longer than a line are
+    broken across lines, as PowerPoint does.
+    """
+    if limit <= 0:
+        return len(text) or 1
+    space = word_width(font_name, ' ')
+    lines = 0
+    for widths in line_word_widths(font_name, text):
+        lines += 1
+        used = 0.0
+        for width in widths:
+            if used and used + space + width <= limit:
+                used += space + width
+                continue
+            if used:
+                lines += 1
+            while width > limit:
+                lines += 1
+                width -= limit
+            used = width
+    return lines
+
+
+def paragraph_lines(paragraphs, font_name, font_size, box):
+    """Return the number of lines each of ``paragraphs`` ((level, text, bold) tuples) takes at ``font_size``."""
+    scale = 1000 / font_size
+    line_width = box.line_width
+    return [line_count(font_name, text, int(line_width(level) * scale / (BOLD_FACTOR if bold else 1)))
+            for level, text, bold in paragraphs]
+
+
+def text_height(lines, font_size):
+    """Return the height in points of paragraphs with the given line counts, set at ``font_size``."""
+    spacing = PARAGRAPH_SPACING * max(len(lines) - 1, 0)
+    return (sum(lines) + spacing) * LINE_HEIGHT * font_size
+
+
+def fits(paragraphs, font_name, font_size, box):
+    """Return True if ``paragraphs`` fit in ``box`` at ``font_size``."""
+    return text_height(paragraph_lines(paragraphs, font_name, font_size, box), font_size) <= box.height
+
+
+def fit_font_size(paragraphs, font_name, max_size, min_size, box):
+    """Return the largest whole font size from ``min_size`` to ``max_size`` at which the paragraphs fit.
+
+    Sizes are tried by binary search. Returns None if they don't fit even at
+    ``min_size``.
+    """
+    low, high = int(min_size), int(max_size)
+    if fits(paragraphs, font_name, max_size, box):
+        return max_size
+    if high <= low or not fits(paragraphs, font_name, low, box):
+        return None
+    best = low
+    while low <= high:
+        middle = (low + high) // 2
+        if fits(paragraphs, font_name, middle, box):
+            best, low = middle, middle + 1
+        else:
+            high = middle - 1
+    return best
+
+
+def paginate(paragraphs, font_name, font_size, box):
+    """Split paragraphs into as few consecutive pages as fit in ``box`` at ``font_size``.
+
+    The pages are then evened out, so the last one isn't left nearly empty
+    and all of them can be set larger than ``font_size``. Returns lists of
+    paragraph indexes; a paragraph too long for a page on its own gets a
+    page to itself.
+    """
+    lines = paragraph_lines(paragraphs, font_name, font_size, box)
+    pages = [[]]
+    for index in range(len(paragraphs)):
+        if pages[-1] and text_height([lines[i] for i in pages[-1]] + [lines[index]], font_size) > box.height:
+            pages.append([])
+        pages[-1].append(index)
+    if len(pages) < 2:
+        return pages
+
+    # Cut at about equal shares of the total height, keeping every page within the box
+    share = text_height(lines, font_size) / len(pages)
+    balanced = [[]]
+    used = 0.0
+    for index in range(len(paragraphs)):
+        height = text_height([lines[index]], font_size)
+        if (balanced[-1] and len(balanced) < len(pages)
+                and used + height / 2 > share * len(balanced)):
+            balanced.append([])
+        balanced[-1].append(index)
+        used += height + PARAGRAPH_SPACING * LINE_HEIGHT * font_size
+    if len(balanced) == len(pages) and all(
+            text_height([lines[i] for i in page], font_size) <= box.height for page in balanced):
+        return balanced
+    return pages
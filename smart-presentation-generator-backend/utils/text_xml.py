@@ -0,0 +1,81 @@
+# utils/text_xml.py
+import re
+from xml.sax.saxutils import escape, quoteattr
+from pptx.dml.color import RGBColor
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.util import Pt
+
+_CONTROL_CHARS = re.compile(r'([\x00-\x08\x0B-\x1F])')
+_LINE_BREAK = re.compile('\n|\v')
+MAX_LEVEL = 8
+
+def bullet_parts(point):
+    """Return ``(level, runs)`` for a bullet, where runs are ``(text, bold, italic)`` tuples.
+
+    A bullet is a plain string (level 0, one unformatted run) or a dict with
+    ``text`` or ``runs`` (each a dict with ``text`` and optional ``bold`` /
+    ``italic``) and an optional ``level`` (0-8) for nested bullets.
+    """
+    if not isinstance(point, dict):
+        return 0, [(str(point), False, False)]
+
+    try:
+        level = min(max(int(point.get('level') or 0), 0), MAX_LEVEL)
+    except (TypeError, ValueError):
+        level = 0
+    runs = point.get('runs')
+    if isinstance(runs, list) and runs:
+        parts = [(str(run.get('text', '')), bool(run.get('bold')), bool(run.get('italic')))
+                 for run in runs if isinstance(run, dict)]
+    else:
+        parts = [(str(point.get('text', '')), bool(point.get('bold')), bool(point.get('italic')))]
+    return level, parts
+
+def is_plain(runs):
+    """Return True if runs are a single unformatted run, written like ``paragraph.text``."""
+    return len(runs) == 1 and not runs[0][1] and not runs[0][2]
+
+def default_run_properties_xml(font_size, font_name, color):
+    """Return the ``<a:defRPr>`` that python-pptx writes for ``paragraph.font`` size, name and color."""
+    return (f'<a:defRPr sz="{Pt(font_size).centipoints}"><a:solidFill><a:srgbClr val="{RGBColor(*color)}"/>'
+            f'</a:solidFill><a:latin typeface={quoteattr(font_name)}/></a:defRPr>')
+
+def paragraph_xml(level=None, runs=(), default_run_properties='', font_size=None):
+    """Return the ``<a:p>`` for one paragraph.
+
+    ``level`` None means the paragraph has no ``<a:pPr>`` of its own (unless
+    it carries default run properties), like an untouched placeholder paragraph.
+    A ``font_size`` (points) is set on every run, like ``run.font.size``.
+    """
+    if level is None and not default_run_properties:
+        properties = ''
+    else:
+        level_attr = f' lvl="{level}"' if level else ''
+        properties = (f'<a:pPr{level_attr}>{default_run_properties}</a:pPr>' if default_run_properties
+                      else f'<a:pPr{level_attr}/>')
+
+    body = []
+    for text, bold, italic in runs:
+        for index, segment in enumerate(_LINE_BREAK.split(text)):
+            # Breaks only go between segments, and empty segments get no run
+            if index:
+                body.append('<a:br/>')
+            if segment:
+                emphasis = (' b="1"' if bold else '') + (' i="1"' if italic else '')
+                if font_size:
+                    emphasis += f' sz="{Pt(font_size).centipoints}"'
+                run_properties = f'<a:rPr{emphasis}/>' if emphasis else ''
+                text_xml = escape(_CONTROL_CHARS.sub(lambda match: "_x%04X_" % ord(match.group(1)), segment))
+                body.append(f'<a:r>{run_properties}<a:t>{text_xml}</a:t></a:r>')
+
+    if not properties and not body:
+        return '<a:p/>'
+    return f'<a:p>{properties}{"".join(body)}</a:p>'
+
+def append_paragraphs(tx_body, paragraphs):
+    """Parse the ``<a:p>`` strings in one pass and append them to a text body element."""
+    if not paragraphs:
+        return
+    container = parse_xml(f'<a:txBody {nsdecls("a")}>{"".join(paragraphs)}</a:txBody>')
+    tx_body.extend(list(container))
@@ -0,0 +1,133 @@
+# utils/tracing.py
+import contextvars
+import functools
+import json
+import threading
+import time
+import uuid
+from datetime import datetime
+from utils.metrics import stage_duration, stage_in_flight, stage_errors
+
+# Id and stage timings of the request (or job) the current code is working for
+_request_id = contextvars.ContextVar('request_id', default=None)
+_trace = contextvars.ContextVar('trace', default=None)
+
+
+class Trace:
+    """Accumulated time and call count per stage for one request."""
+
+    def __init__(self):
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, elapsed):
+        with self._lock:
+            total, calls = self.stages.get(stage, (0.0, 0))
+            self.stages[stage] = (total + elapsed, calls + 1)
+
+    def summary(self):
+        """Return ``{stage: {'seconds': ..., 'calls': ...}}``."""
+        with self._lock:
+            return {stage: {'seconds': round(total, 6), 'calls': calls}
+                    for stage, (total, calls) in self.stages.items()}
+
+
+def new_request_id():
+    return uuid.uuid4().hex
+
+
+def current_request_id():
+    """Return the id of the request being handled, or None outside a request."""
+    return _request_id.get()
+
+
+def current_trace():
+    return _trace.get()
+
+
+def start_request(request_id=None):
+    """Bind a request id and a fresh Trace to the current context; returns a token for end_request."""
+    return (_request_id.set(request_id or new_request_id()), _trace.set(Trace()))
+
+
+def end_request(token):
+    request_token, trace_token = token
+    _trace.reset(trace_token)
+    _request_id.reset(request_token)
+
+
+def bind_context(func):
+    """Wrap ``func`` to run in a copy of the current context, e.g. on a pool thread.
+
+    Stage timings recorded by the wrapped call land in the submitting request's trace.
+    """
+    context = contextvars.copy_context()
+    # A context can only be entered by one thread at a time, so each call runs in its own copy
+    return functools.wraps(func)(lambda *args, **kwargs: context.copy().run(func, *args, **kwargs))
+
+
+def traced(stage):
+    """Decorator that records a stage's latency, in-flight count and errors.
+
+    Durations go to the stage histogram on /api/metrics and to the current
+    request's trace, so per-request logs show where the time went.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stage_in_flight.inc(stage=stage)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                stage_errors.inc(stage=stage, error=type(e).__name__)
+                raise
+            finally:
+                _finish(stage, started)
+        return wrapper
+    return decorator
+
+
+def traced_stream(stage):
+    """Like ``traced``, for functions returning an iterator.
+
+    The stage runs from the first item being asked for until the iterator is
+    exhausted or closed, so it covers the whole streamed call.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stage_in_flight.inc(stage=stage)
+            started = time.perf_counter()
+            try:
+                yield from func(*args, **kwargs)
+            except Exception as e:
+                stage_errors.inc(stage=stage, error=type(e).__name__)
+                raise
+            finally:
+                _finish(stage, started)
+        return wrapper
+    return decorator
+
+
+def _finish(stage, started):
+    elapsed = time.perf_counter() - started
+    stage_in_flight.dec(stage=stage)
+    stage_duration.observe(elapsed, stage=stage)
+    trace = _trace.get()
+    if trace is not None:
+        trace.record(stage, elapsed)
+
+
+def log_event(event, **fields):
+    """Print one structured JSON log line tagged with the current request id."""
+    record = {'time': datetime.now().isoformat(), 'event': event, 'request_id': _request_id.get()}
+    record.update(fields)
+    print(json.dumps(record, default=str))
+
+
+def log(message):
+    """Print a timestamped log line, tagged with the current request id when there is one."""
+    request_id = _request_id.get()
+    prefix = f"[{datetime.now()}] [{request_id}] " if request_id else f"[{datetime.now()}] "
+    print(prefix + str(message))
@@ -104,6 +104,34 @@ export const PresentationProvider = ({ children }) => {
     }
   };
 
+  const generateFromTextStream = (topic, description, theme, onSlide) => {
+    const params = new URLSearchParams({ topic, description, theme });
+    const source = new EventSource(`http://127.0.0.1:5000/api/generate/stream?${params}`);
+
+    return new Promise((resolve, reject) => {
+      source.addEventListener('slide', (event) => {
+        if (onSlide) onSlide(JSON.parse(event.data));
+      });
+
+      source.addEventListener('done', (event) => {
+        const data = JSON.parse(event.data);
+        source.close();
+        setPresentationData({
+          downloadUrl: data.download_url,
+          filePath: data.file_path
+        });
+        resolve(data);
+      });
+
+      source.addEventListener('error', (event) => {
+        source.close();
+        const message = event.data ? JSON.parse(event.data).error : 'Connection lost';
+        console.error('Failed to generate presentation:', message);
+        reject(new Error(message));
+      });
+    });
+  };
+
   return (
     <PresentationContext.Provider
       value={{
@@ -116,6 +144,7 @@ export const PresentationProvider = ({ children }) => {
         deleteSlide,
         changeTheme,
         generateFromText,
+        generateFromTextStream,
         presentationData,
         setPresentationData
       }}